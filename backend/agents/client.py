@@ -265,6 +265,34 @@ def _get_cached_client(role: Literal["agent", "orchestrator"]) -> AzureOpenAICha
     return client
 
 
+def cached_clients_fresh(*roles: Literal["agent", "orchestrator"]) -> bool:
+    """Whether every given role has a cached, unexpired client.
+
+    When true, fetching those clients is a dict lookup and cannot block on
+    credential probing.
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        for role in roles:
+            entry = _client_cache.get(role)
+            if entry is None or now - entry[1] >= _CLIENT_TTL_SECONDS:
+                return False
+    return True
+
+
+def warm_chat_clients() -> None:
+    """Populate the agent and orchestrator client cache, ignoring failures.
+
+    Blocking (credential probing); run it in a worker thread. Errors are left
+    for the caller that actually needs a client to surface.
+    """
+    for role in ("agent", "orchestrator"):
+        try:
+            _get_cached_client(role)
+        except Exception as e:
+            logger.warning("chat_client_warmup_failed", role=role, error=str(e))
+
+
 def clear_client_cache() -> None:
     """Force-clear cached clients so the next call creates fresh credentials.
 
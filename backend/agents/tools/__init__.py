@@ -83,6 +83,7 @@ def _is_explicit_error_title(title: str) -> bool:
     known_error_titles = {
         "no database connection",
         "schema insufficient for query",
+        "no entities in query",
         "kql schema insufficient",
         "kql endpoint not configured",
         "no fabric token available",
@@ -94,6 +95,7 @@ def _is_explicit_error_title(title: str) -> bool:
         "cosmos endpoint not configured",
         "could not generate t-sql",
         "pyodbc not installed",
+        "aioodbc not installed",
         "no fabric sql connection string",
     }
     return lowered in known_error_titles
@@ -0,0 +1,109 @@
+"""
+Persistent embedding cache backed by SQLite.
+Keeps text embeddings across process restarts so warmed queries don't
+re-pay Azure OpenAI embedding calls after a pod recycle.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from hashlib import blake2b
+from typing import Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embed_cache (
+    hash BLOB PRIMARY KEY,
+    model TEXT NOT NULL,
+    vec BLOB NOT NULL,
+    ts INTEGER NOT NULL
+)
+"""
+
+
+def _cache_key(model: str, text: str) -> bytes:
+    return blake2b(f"{model}\x00{text}".encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingDiskCache:
+    """Exact-match embedding cache in a local SQLite file.
+
+    Vectors are stored as packed float32. All database work runs in a worker
+    thread so lookups and writes never block the event loop.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 30 * 86400):
+        self._path = path
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._prune_locked()
+            self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["EmbeddingDiskCache"]:
+        """Open the cache at EMBED_CACHE_DB, or return None when unset/unusable."""
+        path = os.getenv("EMBED_CACHE_DB", "").strip()
+        if not path:
+            return None
+        try:
+            ttl_days = int(os.getenv("EMBED_CACHE_TTL_DAYS", "30"))
+        except ValueError:
+            ttl_days = 30
+        try:
+            return cls(path, ttl_seconds=max(1, ttl_days) * 86400)
+        except Exception as e:
+            logger.warning("Embedding disk cache unavailable at %s: %s", path, e)
+            return None
+
+    def _prune_locked(self) -> None:
+        self._conn.execute("DELETE FROM embed_cache WHERE ts < ?", (int(time.time()) - self._ttl_seconds,))
+
+    def _get_sync(self, model: str, text: str) -> Optional[array]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vec FROM embed_cache WHERE hash = ? AND model = ?",
+                (_cache_key(model, text), model),
+            ).fetchone()
+        if not row:
+            return None
+        vec = array("f")
+        vec.frombytes(row[0])
+        return vec
+
+    def _put_sync(self, model: str, text: str, embedding: Sequence[float]) -> None:
+        packed = embedding if isinstance(embedding, array) and embedding.typecode == "f" else array("f", embedding)
+        blob = packed.tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embed_cache (hash, model, vec, ts) VALUES (?, ?, ?, ?)",
+                (_cache_key(model, text), model, blob, int(time.time())),
+            )
+            self._conn.commit()
+
+    async def get(self, model: str, text: str) -> Optional[array]:
+        try:
+            return await asyncio.to_thread(self._get_sync, model, text)
+        except Exception as e:
+            logger.warning("Embedding disk cache read failed: %s", e)
+            return None
+
+    async def put(self, model: str, text: str, embedding: Sequence[float]) -> None:
+        try:
+            await asyncio.to_thread(self._put_sync, model, text, embedding)
+        except Exception as e:
+            logger.warning("Embedding disk cache write failed: %s", e)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -8,10 +8,45 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from data_sources.azure_client import get_shared_async_client
-from data_sources.shared_utils import OPENAI_API_VERSION, supports_explicit_temperature
+from data_sources.shared_utils import OPENAI_API_VERSION, env_int, supports_explicit_temperature
+
+
+SQL_WRITER_SYSTEM_PROMPT = """You are SQL_WRITER. Output SQL ONLY.
+
+Rules:
+- Use only tables/columns provided in sql_schema.
+- If hint_tables is provided in constraints, PREFER those tables for the query.
+- Prefer simple SELECTs with WHERE filters and LIMIT.
+- If a requested column is not present in sql_schema, do not guess.
+- If needed columns are missing, output exactly:
+-- NEED_SCHEMA: <what is missing>
+- Never generate INSERT/UPDATE/DELETE/DDL.
+- IMPORTANT: Airport codes, flight IDs, and other identifiers MUST come ONLY from the entities object.
+- If entities.airports AND entities.flight_ids are both empty, write a general aggregate query.
+- Many ops_* tables store ALL columns as TEXT. Cast appropriately:
+  * Cast timestamp columns via column::timestamptz
+  * Cast numeric columns via column::numeric or column::integer
+- ops_flight_legs contains carrier_code, flight_no, tailnum, distance_nm directly.
+- Alias conventions: l = ops_flight_legs, m = ops_turnaround_milestones, c = ops_crew_rosters, t = ops_mel_techlog_events, b = ops_baggage_events.
+"""
+
+KQL_WRITER_SYSTEM_PROMPT = """You are KQL_WRITER. Output KQL ONLY.
+
+Rules:
+- Use only tables/columns provided in kql_schema.
+- Always include a time filter using the horizon.
+- Start with a valid table reference (or let-binding followed by a table).
+- Do not emit semicolons except required let-binding terminators.
+- Do not use unsupported functions (for example: time_now()).
+- If needed columns are missing, output exactly:
+// NEED_SCHEMA: <what is missing>
+- Never invent table names.
+- IMPORTANT: Airport codes, flight IDs, and other identifiers MUST come ONLY from the entities object.
+"""
 
 
 def _strip_fences(text: str) -> str:
@@ -20,8 +55,17 @@ def _strip_fences(text: str) -> str:
     return out.strip()
 
 
-class AsyncSQLWriter:
-    """Async LLM-based Text-to-SQL writer."""
+class _AsyncQueryWriter:
+    """Shared request assembly and short-lived result cache for the query writers.
+
+    The user message is laid out static-first (schema, evidence type,
+    constraints) and request-specific last (entities, time window, query) so
+    the model endpoint's automatic prompt-prefix caching can reuse the schema
+    tokens across calls. Identical requests within the TTL skip the LLM.
+    """
+
+    system_prompt = ""
+    schema_field = ""
 
     def __init__(self, model: Optional[str] = None):
         self.model = (
@@ -29,109 +73,108 @@ class AsyncSQLWriter:
             or os.getenv("AZURE_OPENAI_WORKER_DEPLOYMENT_NAME")
             or os.getenv("AZURE_OPENAI_ORCHESTRATOR_DEPLOYMENT", "gpt-5-mini")
         )
-
-    async def generate(
+        self._result_ttl_seconds = env_int("QUERY_WRITER_CACHE_TTL_SECONDS", 300)
+        self._result_cache: Dict[str, Tuple[float, str]] = {}
+        self._result_cache_max = 256
+        # Schema objects are long-lived (provider cache / module constants);
+        # serialize each one once.
+        self._schema_json: Tuple[Any, str] = (None, "")
+
+    def _serialize_schema(self, schema: Dict[str, Any]) -> str:
+        cached_schema, cached_json = self._schema_json
+        if cached_schema is schema:
+            return cached_json
+        rendered = json.dumps(schema, ensure_ascii=True)
+        self._schema_json = (schema, rendered)
+        return rendered
+
+    def _user_content(
         self,
         user_query: str,
         evidence_type: str,
-        sql_schema: Dict[str, Any],
+        schema: Dict[str, Any],
         entities: Dict[str, Any],
         time_window: Dict[str, Any],
-        constraints: Optional[Dict[str, Any]] = None,
+        constraints: Optional[Dict[str, Any]],
     ) -> str:
-        client, _ = await get_shared_async_client(api_version=OPENAI_API_VERSION)
+        dynamic = json.dumps(
+            {
+                "evidence_type": evidence_type,
+                "constraints": constraints or {},
+                "entities": entities,
+                "time_window": time_window,
+                "user_query": user_query,
+            },
+            ensure_ascii=True,
+        )
+        return f'{{"{self.schema_field}": {self._serialize_schema(schema)}, {dynamic[1:]}'
 
-        prompt = """You are SQL_WRITER. Output SQL ONLY.
+    async def _generate(
+        self,
+        user_query: str,
+        evidence_type: str,
+        schema: Dict[str, Any],
+        entities: Dict[str, Any],
+        time_window: Dict[str, Any],
+        constraints: Optional[Dict[str, Any]],
+    ) -> str:
+        content = self._user_content(user_query, evidence_type, schema, entities, time_window, constraints)
+        now = time.monotonic()
+        cached = self._result_cache.get(content)
+        if cached and now - cached[0] < self._result_ttl_seconds:
+            return cached[1]
 
-Rules:
-- Use only tables/columns provided in sql_schema.
-- If hint_tables is provided in constraints, PREFER those tables for the query.
-- Prefer simple SELECTs with WHERE filters and LIMIT.
-- If a requested column is not present in sql_schema, do not guess.
-- If needed columns are missing, output exactly:
--- NEED_SCHEMA: <what is missing>
-- Never generate INSERT/UPDATE/DELETE/DDL.
-- IMPORTANT: Airport codes, flight IDs, and other identifiers MUST come ONLY from the entities object.
-- If entities.airports AND entities.flight_ids are both empty, write a general aggregate query.
-- Many ops_* tables store ALL columns as TEXT. Cast appropriately:
-  * Cast timestamp columns via column::timestamptz
-  * Cast numeric columns via column::numeric or column::integer
-- ops_flight_legs contains carrier_code, flight_no, tailnum, distance_nm directly.
-- Alias conventions: l = ops_flight_legs, m = ops_turnaround_milestones, c = ops_crew_rosters, t = ops_mel_techlog_events, b = ops_baggage_events.
-"""
-        payload = {
-            "user_query": user_query,
-            "evidence_type": evidence_type,
-            "sql_schema": sql_schema,
-            "entities": entities,
-            "time_window": time_window,
-            "constraints": constraints or {},
-        }
+        client, _ = await get_shared_async_client(api_version=OPENAI_API_VERSION)
         request_kwargs: Dict[str, Any] = {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": json.dumps(payload, ensure_ascii=True)},
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": content},
             ],
         }
         if supports_explicit_temperature(self.model):
             request_kwargs["temperature"] = 0
 
         response = await client.chat.completions.create(**request_kwargs)
-        return _strip_fences(response.choices[0].message.content or "")
+        result = _strip_fences(response.choices[0].message.content or "")
+        if self._result_ttl_seconds > 0:
+            if content not in self._result_cache and len(self._result_cache) >= self._result_cache_max:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            self._result_cache[content] = (now, result)
+        return result
 
 
-class AsyncKQLWriter:
-    """Async LLM-based Text-to-KQL writer."""
+class AsyncSQLWriter(_AsyncQueryWriter):
+    """Async LLM-based Text-to-SQL writer."""
 
-    def __init__(self, model: Optional[str] = None):
-        self.model = (
-            model
-            or os.getenv("AZURE_OPENAI_WORKER_DEPLOYMENT_NAME")
-            or os.getenv("AZURE_OPENAI_ORCHESTRATOR_DEPLOYMENT", "gpt-5-mini")
-        )
+    system_prompt = SQL_WRITER_SYSTEM_PROMPT
+    schema_field = "sql_schema"
 
     async def generate(
         self,
         user_query: str,
         evidence_type: str,
-        kql_schema: Dict[str, Any],
+        sql_schema: Dict[str, Any],
         entities: Dict[str, Any],
         time_window: Dict[str, Any],
         constraints: Optional[Dict[str, Any]] = None,
     ) -> str:
-        client, _ = await get_shared_async_client(api_version=OPENAI_API_VERSION)
+        return await self._generate(user_query, evidence_type, sql_schema, entities, time_window, constraints)
 
-        prompt = """You are KQL_WRITER. Output KQL ONLY.
 
-Rules:
-- Use only tables/columns provided in kql_schema.
-- Always include a time filter using the horizon.
-- Start with a valid table reference (or let-binding followed by a table).
-- Do not emit semicolons except required let-binding terminators.
-- Do not use unsupported functions (for example: time_now()).
-- If needed columns are missing, output exactly:
-// NEED_SCHEMA: <what is missing>
-- Never invent table names.
-- IMPORTANT: Airport codes, flight IDs, and other identifiers MUST come ONLY from the entities object.
-"""
-        payload = {
-            "user_query": user_query,
-            "evidence_type": evidence_type,
-            "kql_schema": kql_schema,
-            "entities": entities,
-            "time_window": time_window,
-            "constraints": constraints or {},
-        }
-        request_kwargs: Dict[str, Any] = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": json.dumps(payload, ensure_ascii=True)},
-            ],
-        }
-        if supports_explicit_temperature(self.model):
-            request_kwargs["temperature"] = 0
+class AsyncKQLWriter(_AsyncQueryWriter):
+    """Async LLM-based Text-to-KQL writer."""
 
-        response = await client.chat.completions.create(**request_kwargs)
-        return _strip_fences(response.choices[0].message.content or "")
+    system_prompt = KQL_WRITER_SYSTEM_PROMPT
+    schema_field = "kql_schema"
+
+    async def generate(
+        self,
+        user_query: str,
+        evidence_type: str,
+        kql_schema: Dict[str, Any],
+        entities: Dict[str, Any],
+        time_window: Dict[str, Any],
+        constraints: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        return await self._generate(user_query, evidence_type, kql_schema, entities, time_window, constraints)
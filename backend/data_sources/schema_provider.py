@@ -5,6 +5,7 @@ Async-adapted from demos-01 schema_provider.py.
 
 from __future__ import annotations
 
+import asyncio
 import os
 import json
 import time
@@ -108,13 +109,30 @@ class AsyncSchemaProvider:
         self._cache_ttl = cache_ttl
         self._cache: Optional[Dict[str, Any]] = None
         self._cache_ts: float = 0.0
+        self._refresh_lock = asyncio.Lock()
 
-    async def snapshot(self) -> Dict[str, Any]:
-        """Return cached or freshly-fetched schema snapshot."""
-        now = time.monotonic()
-        if self._cache and (now - self._cache_ts) < self._cache_ttl:
+    def _cached(self) -> Optional[Dict[str, Any]]:
+        if self._cache and (time.monotonic() - self._cache_ts) < self._cache_ttl:
             return self._cache
+        return None
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """Return cached or freshly-fetched schema snapshot.
+
+        Concurrent callers that miss the cache share a single refresh, so a
+        fan-out across SQL/KQL/FABRIC_SQL only introspects once.
+        """
+        cached = self._cached()
+        if cached is not None:
+            return cached
+
+        async with self._refresh_lock:
+            cached = self._cached()
+            if cached is not None:
+                return cached
+            return await self._refresh()
 
+    async def _refresh(self) -> Dict[str, Any]:
         sql_schema = DEFAULT_SQL_SCHEMA
         kql_schema = DEFAULT_KQL_SCHEMA
         graph_schema = DEFAULT_GRAPH_SCHEMA
@@ -140,7 +158,7 @@ class AsyncSchemaProvider:
             "kql_schema": kql_schema,
             "graph_schema": graph_schema,
         }
-        self._cache_ts = now
+        self._cache_ts = time.monotonic()
         return self._cache
 
     async def _introspect_sql_schema(self) -> Dict[str, Any]:
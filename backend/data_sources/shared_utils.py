@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import re
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import lru_cache
@@ -263,6 +264,13 @@ IATA_TO_ICAO_MAP: Dict[str, str] = {
     "CDG": "LFPG", "FRA": "EDDF", "AMS": "EHAM",
 }
 
+# Airport codes flow into query parameters and repeat across many result rows;
+# intern them so every occurrence shares one string object.
+IATA_TO_ICAO_MAP = {sys.intern(k): sys.intern(v) for k, v in IATA_TO_ICAO_MAP.items()}
+CITY_AIRPORT_MAP = {
+    city: [sys.intern(code) for code in codes] for city, codes in CITY_AIRPORT_MAP.items()
+}
+
 
 # ---------------------------------------------------------------------------
 # Tool name canonicalization
@@ -20,10 +20,15 @@ import json
 import logging
 import os
 import re
+import sys
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 
 from data_sources.shared_utils import (
     Citation,
@@ -36,6 +41,7 @@ from data_sources.shared_utils import (
     env_csv,
     env_int,
 )
+from data_sources.embedding_cache import EmbeddingDiskCache
 from data_sources.schema_provider import AsyncSchemaProvider
 from data_sources.query_writers import AsyncSQLWriter, AsyncKQLWriter
 
@@ -44,11 +50,13 @@ logger = logging.getLogger(__name__)
 # Sentinel for optional imports
 _HAS_SEARCH = False
 _HAS_COSMOS = False
+_HAS_HTTP2 = False
 
 try:
     from azure.search.documents.aio import SearchClient
     from azure.search.documents.models import VectorizedQuery
     from azure.core.credentials import AzureKeyCredential
+    from azure.core.pipeline.transport import AioHttpTransport
     _HAS_SEARCH = True
 except ImportError:
     logger.info("azure-search-documents not installed, vector search disabled")
@@ -59,6 +67,24 @@ try:
 except ImportError:
     logger.info("azure-cosmos not installed, Cosmos DB disabled")
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    _HAS_HTTP2 = True
+except ImportError:
+    logger.info("h2 not installed, Fabric REST calls use HTTP/1.1")
+
+
+def _search_index_names() -> Dict[str, str]:
+    """Azure AI Search index name per vector source."""
+    return {
+        "VECTOR_OPS": os.getenv("AZURE_SEARCH_INDEX_OPS_NAME", "idx_ops_narratives"),
+        "VECTOR_REG": os.getenv("AZURE_SEARCH_INDEX_REGULATORY_NAME", "idx_regulatory"),
+        "VECTOR_AIRPORT": os.getenv("AZURE_SEARCH_INDEX_AIRPORT_NAME", "idx_airport_ops_docs"),
+    }
+
+
+# Refresh cached Fabric tokens this long before they expire.
+_FABRIC_TOKEN_REFRESH_MARGIN_SECONDS = 60.0
 
 READ_ONLY_SQL_DENYLIST = {
     "INSERT",
@@ -131,33 +157,271 @@ def _is_safe_read_only_sql(sql: str) -> tuple[bool, str]:
     return True, "SQL_OK"
 
 
+@lru_cache(maxsize=256)
+def _stable_query_id(text: str) -> str:
+    """Process-independent short digest for citation identifiers (unlike salted ``hash()``)."""
+    return blake2b(text.encode("utf-8"), digest_size=6).hexdigest()
+
+
+# Above this many cells (rows x columns), Record -> dict conversion runs in a
+# worker thread so wide result sets don't stall the event loop.
+_ROW_CONVERSION_OFFLOAD_CELLS = env_int("RETRIEVER_ROW_OFFLOAD_CELLS", 5000)
+
+
+async def _records_to_dicts(records: List[Any]) -> List[Dict[str, Any]]:
+    """Materialize asyncpg Records as dicts, off the event loop for large result sets."""
+    if not records:
+        return []
+    if len(records) * len(records[0]) > _ROW_CONVERSION_OFFLOAD_CELLS:
+        return await asyncio.to_thread(lambda: [dict(r) for r in records])
+    return [dict(r) for r in records]
+
+
+_IATA_CODE_RE = re.compile(r"\b([A-Z]{3})\b")
+_ICAO_CODE_RE = re.compile(r"\b(K[A-Z]{3}|LT[A-Z]{2}|EG[A-Z]{2}|LF[A-Z]{2}|ED[A-Z]{2}|EH[A-Z]{2})\b")
+_CITY_NAME_RE = re.compile(
+    "|".join(re.escape(city) for city in sorted(CITY_AIRPORT_MAP, key=len, reverse=True))
+)
+
+
 def _extract_airports_from_query(query: str) -> List[str]:
     """Extract IATA/ICAO airport codes from query text."""
     codes: List[str] = []
+    seen: set[str] = set()
+
+    def _add(code: str) -> None:
+        if code not in seen:
+            seen.add(code)
+            codes.append(sys.intern(code))
+
+    upper = query.upper()
     # Check IATA codes (3-letter)
-    for match in re.finditer(r'\b([A-Z]{3})\b', query.upper()):
+    for match in _IATA_CODE_RE.finditer(upper):
         code = match.group(1)
-        if code in IATA_TO_ICAO_MAP:
-            icao = IATA_TO_ICAO_MAP[code]
-            if icao not in codes:
-                codes.append(icao)
-            if code not in codes:
-                codes.append(code)
+        icao = IATA_TO_ICAO_MAP.get(code)
+        if icao:
+            _add(icao)
+            _add(code)
     # Check ICAO codes (4-letter starting with K/L/E)
-    for match in re.finditer(r'\b(K[A-Z]{3}|LT[A-Z]{2}|EG[A-Z]{2}|LF[A-Z]{2}|ED[A-Z]{2}|EH[A-Z]{2})\b', query.upper()):
+    for match in _ICAO_CODE_RE.finditer(upper):
         code = match.group(1)
-        if code not in ENGLISH_4LETTER_BLOCKLIST and code not in codes:
-            codes.append(code)
-    # Check city names
-    lower = query.lower()
-    for city, airport_codes in CITY_AIRPORT_MAP.items():
-        if city in lower:
-            for ac in airport_codes:
-                if ac not in codes:
-                    codes.append(ac)
+        if code not in ENGLISH_4LETTER_BLOCKLIST:
+            _add(code)
+    # Check city names (single scan; emit in CITY_AIRPORT_MAP order)
+    matched_cities = {m.group(0) for m in _CITY_NAME_RE.finditer(query.lower())}
+    if matched_cities:
+        for city, airport_codes in CITY_AIRPORT_MAP.items():
+            if city in matched_cities:
+                for ac in airport_codes:
+                    _add(ac)
     return codes
 
 
+# Evidence types whose writers cannot produce a useful query without an
+# airport, flight, route or time anchor in the question.
+_EVIDENCE_REQUIRES_ENTITY = frozenset({"FlightSchedule", "LivePositions", "HistoricalDelays"})
+
+_TIME_OR_ROUTE_RE = re.compile(
+    r"\b[A-Z]{2}\d{2,4}\b"                        # flight ids (UA123, TK1)
+    r"|\b\d{4}-\d{2}-\d{2}\b"                     # ISO dates
+    r"|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b"          # 3/14, 3/14/2026
+    r"|\b\d{1,2}:\d{2}\b"                         # clock times
+    r"|\b(?:19|20)\d{2}\b"                         # years
+    r"|\b(?:today|tonight|yesterday|tomorrow|now|current(?:ly)?|recent(?:ly)?|latest"
+    r"|last|past|next|upcoming|morning|afternoon|evening"
+    r"|hours?|minutes?|days?|weeks?|months?|years?|quarter"
+    r"|january|february|march|april|june|july|august|september|october|november|december)\b"
+    r"|\broutes?\b|\bfrom\s+\w+\s+to\s+\w+|\bbetween\s+\w+\s+and\s+\w+|->",
+    re.IGNORECASE,
+)
+
+# The SQL writer turns entity-free questions into aggregate queries, so keep
+# those on the LLM path.
+_AGGREGATE_INTENT_RE = re.compile(
+    r"\b(?:how many|count|total|average|avg|mean|median|sum|most|least|top|worst|best"
+    r"|overall|rank(?:ing)?|compare|trend|distribution|breakdown|per|by)\b",
+    re.IGNORECASE,
+)
+
+
+def _has_time_or_route(query: str) -> bool:
+    """True when the query names a flight, date/time window or route."""
+    return bool(_TIME_OR_ROUTE_RE.search(query))
+
+
+def _lacks_required_entities(query: str, airports: List[str], evidence_type: str) -> bool:
+    """True when an LLM writer call for ``evidence_type`` would have nothing to anchor on."""
+    return (
+        not airports
+        and evidence_type in _EVIDENCE_REQUIRES_ENTITY
+        and not _has_time_or_route(query)
+        and not _AGGREGATE_INTENT_RE.search(query)
+    )
+
+
+# Fixed Fabric warehouse schema for BTS on-time performance (HistoricalDelays).
+FABRIC_BTS_SCHEMA: Dict[str, Any] = {
+    "tables": {
+        "bts_ontime_reporting": {
+            "columns": {
+                "year": "int", "month": "int", "carrier": "varchar",
+                "origin": "varchar", "dest": "varchar",
+                "dep_delay": "float", "arr_delay": "float",
+                "cancelled": "float", "diverted": "float",
+                "carrier_delay": "float", "weather_delay": "float",
+                "nas_delay": "float", "security_delay": "float",
+                "late_aircraft_delay": "float",
+            }
+        }
+    }
+}
+
+
+# Origins sampled by the Fabric SQL TDS fallback (bound as query parameters).
+_FABRIC_TDS_DEFAULT_ORIGINS: Tuple[str, ...] = ("ORD", "ATL", "DFW")
+
+
+_ICAO_TO_IATA: Dict[str, str] = {icao: iata for iata, icao in IATA_TO_ICAO_MAP.items()}
+
+
+def _airport_agnostic_signature(query: str) -> str:
+    """Normalize a query with airport codes/cities masked, for template reuse.
+
+    IATA codes, ICAO codes and city names get distinct mask tokens, so a
+    query naming ``ORD`` never shares a signature with one naming ``KORD``
+    or ``chicago``.
+    """
+    masked = _IATA_CODE_RE.sub(
+        lambda m: "<IATA>" if m.group(1) in IATA_TO_ICAO_MAP else m.group(0), query.upper()
+    )
+    masked = _ICAO_CODE_RE.sub(
+        lambda m: m.group(0) if m.group(1) in ENGLISH_4LETTER_BLOCKLIST else "<ICAO>", masked
+    )
+    masked = _CITY_NAME_RE.sub("<city>", masked.lower())
+    return " ".join(masked.split())
+
+
+def _airport_code_mentions(query: str) -> Tuple[Tuple[str, str], ...]:
+    """Explicit airport codes as (kind, code) pairs in the order they appear in the text."""
+    upper = query.upper()
+    mentions = [
+        (m.start(), "iata", m.group(1))
+        for m in _IATA_CODE_RE.finditer(upper)
+        if m.group(1) in IATA_TO_ICAO_MAP
+    ]
+    mentions.extend(
+        (m.start(), "icao", m.group(1))
+        for m in _ICAO_CODE_RE.finditer(upper)
+        if m.group(1) not in ENGLISH_4LETTER_BLOCKLIST
+    )
+    mentions.sort()
+    return tuple((kind, code) for _, kind, code in mentions)
+
+
+class _SQLTemplateCache:
+    """Generated SQL keyed by airport-agnostic query signature.
+
+    A hit with the same airports returns the stored SQL verbatim. A hit with
+    different airports re-binds the quoted airport literals, pairing codes
+    mention by mention in text order. Re-binding is only attempted when both
+    queries name their airports by explicit codes (city names resolve to
+    several airports and carry no position), and only when every previous
+    code appears in the SQL solely as a quoted literal; otherwise the entry
+    is treated as a miss and the LLM is asked.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 256):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Tuple[str, ...], Tuple[Tuple[str, str], ...], str]] = {}
+
+    def lookup(self, query: str, airports: List[str]) -> Optional[str]:
+        signature = _airport_agnostic_signature(query)
+        entry = self._entries.get(signature)
+        if entry is None:
+            return None
+        stored_at, stored_airports, stored_mentions, sql = entry
+        if time.monotonic() - stored_at > self._ttl_seconds:
+            del self._entries[signature]
+            return None
+        if tuple(airports) == stored_airports:
+            return sql
+        if "<city>" in signature:
+            return None
+        mentions = _airport_code_mentions(query)
+        if len(mentions) != len(stored_mentions):
+            return None
+        return self._rebind(sql, stored_mentions, mentions)
+
+    def store(self, query: str, airports: List[str], sql: str) -> None:
+        signature = _airport_agnostic_signature(query)
+        if signature not in self._entries and len(self._entries) >= self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[signature] = (
+            time.monotonic(), tuple(airports), _airport_code_mentions(query), sql,
+        )
+
+    @staticmethod
+    def _rebind(
+        sql: str,
+        old: Tuple[Tuple[str, str], ...],
+        new: Tuple[Tuple[str, str], ...],
+    ) -> Optional[str]:
+        # Each mention maps its code and the code's other form (IATA <-> ICAO),
+        # so the writer may have used either; kinds never cross.
+        mapping: Dict[str, Optional[str]] = {}
+        for (old_kind, old_code), (new_kind, new_code) in zip(old, new):
+            if old_kind != new_kind:
+                return None
+            if old_kind == "iata":
+                pairs = ((old_code, new_code), (IATA_TO_ICAO_MAP[old_code], IATA_TO_ICAO_MAP[new_code]))
+            else:
+                pairs = ((old_code, new_code), (_ICAO_TO_IATA.get(old_code), _ICAO_TO_IATA.get(new_code)))
+            for old_literal, new_literal in pairs:
+                if old_literal is None:
+                    continue
+                if mapping.setdefault(old_literal, new_literal) != new_literal:
+                    return None
+        targets = [code for code in mapping.values() if code is not None]
+        if len(set(targets)) != len(targets):
+            return None
+        for code, target in mapping.items():
+            bare = len(re.findall(rf"\b{re.escape(code)}\b", sql))
+            if target is None:
+                if bare:
+                    return None
+                continue
+            if bare != sql.count(f"'{code}'"):
+                return None
+        literals = {f"'{o}'": f"'{n}'" for o, n in mapping.items() if n is not None}
+        if not literals:
+            return None
+        pattern = re.compile("|".join(re.escape(lit) for lit in literals))
+        return pattern.sub(lambda m: literals[m.group(0)], sql)
+
+
+def _build_graph_bfs_sql(relation: str, source_col: str, target_col: str, edge_type_col: str) -> str:
+    """Render the recursive-CTE BFS over a resolved graph edges relation."""
+    edge_type_seed = edge_type_col if edge_type_col else "'link'"
+    edge_type_recursive = f"e.{edge_type_col}" if edge_type_col else "'link'"
+    return f"""
+        WITH RECURSIVE graph_walk AS (
+            SELECT {source_col} AS source_id, {target_col} AS target_id, {edge_type_seed} AS edge_type, 1 AS depth
+            FROM {relation}
+            WHERE {source_col} = $1
+            UNION ALL
+            SELECT e.{source_col} AS source_id, e.{target_col} AS target_id, {edge_type_recursive} AS edge_type, gw.depth + 1
+            FROM {relation} e
+            JOIN graph_walk gw ON e.{source_col} = gw.target_id
+            WHERE gw.depth < $2
+        )
+        SELECT DISTINCT source_id, target_id, edge_type, depth
+        FROM graph_walk
+        ORDER BY depth
+        LIMIT 100
+    """
+
+
 class AsyncUnifiedRetriever:
     """
     Async unified retrieval interface for all 8 aviation data sources.
@@ -171,16 +435,20 @@ class AsyncUnifiedRetriever:
         self._sql_writer = AsyncSQLWriter()
         self._kql_writer = AsyncKQLWriter()
 
-        # Search clients (lazy-init)
+        # Search clients (lazy-init) and learned per-index select lists
         self._search_clients: Dict[str, Any] = {}
+        self._search_select_fields: Dict[str, List[str]] = {}
+        self._search_session: Any = None
 
         # Cosmos client + container (lazy-init)
         self._cosmos_client: Any = None
         self._cosmos_credential: Any = None
         self._cosmos_container: Any = None
 
-        # Embedding cache
-        self._embedding_cache: Dict[str, List[float]] = {}
+        # Embedding cache (in-process, optionally backed by SQLite via EMBED_CACHE_DB)
+        self._embedding_cache: Dict[str, array] = {}
+        self._embedding_disk_cache = EmbeddingDiskCache.from_env()
+        self._embedding_inflight: Dict[str, asyncio.Future] = {}
 
         # Config
         self._fabric_kql_endpoint = os.getenv("FABRIC_KQL_ENDPOINT", "")
@@ -189,11 +457,37 @@ class AsyncUnifiedRetriever:
         self._fabric_sql_endpoint = os.getenv("FABRIC_SQL_ENDPOINT", "")
         self._embedding_deployment = os.getenv("AZURE_TEXT_EMBEDDING_DEPLOYMENT_NAME", "text-embedding-3-small")
         self._query_timeout_seconds = int(os.getenv("UNIFIED_RETRIEVER_QUERY_TIMEOUT_SECONDS", "45"))
+        # Cosmos NOTAM container partition key path (without leading "/")
+        self._cosmos_partition_key = os.getenv("AZURE_COSMOS_PARTITION_KEY", "").strip().lstrip("/")
         self._sql_visible_schemas = env_csv("SQL_VISIBLE_SCHEMAS", "public,demo") or ["public", "demo"]
+        # Fabric bearer token cache: (token, expires_at epoch seconds)
+        self._fabric_token: Optional[Tuple[str, float]] = None
+        self._fabric_token_lock = asyncio.Lock()
+
+        # Pooled ODBC connections for the Fabric SQL TDS fallback (lazy-init)
+        self._fabric_odbc_pool: Any = None
+        self._fabric_odbc_pool_lock = asyncio.Lock()
+
+        # Fabric T-SQL reuse across queries that differ only by airport
+        self._fabric_sql_templates = _SQLTemplateCache()
+
+        # Resolved graph BFS statement (relation/columns looked up once per process)
+        self._graph_bfs_sql: Optional[str] = None
 
     async def _get_http(self) -> httpx.AsyncClient:
         if self._http is None or self._http.is_closed:
-            self._http = httpx.AsyncClient(timeout=self._query_timeout_seconds)
+            # Fabric KQL/Graph/SQL and the token endpoint are a handful of hosts;
+            # keep connections warm and multiplex concurrent calls over HTTP/2.
+            transport = httpx.AsyncHTTPTransport(
+                http2=_HAS_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=env_int("RETRIEVER_HTTP_MAX_CONNECTIONS", 200),
+                    max_keepalive_connections=env_int("RETRIEVER_HTTP_MAX_KEEPALIVE", 100),
+                    keepalive_expiry=60.0,
+                ),
+                retries=1,
+            )
+            self._http = httpx.AsyncClient(timeout=self._query_timeout_seconds, transport=transport)
         return self._http
 
     async def close(self):
@@ -205,6 +499,12 @@ class AsyncUnifiedRetriever:
             except Exception as e:
                 logger.warning("Failed to close search client %s: %s", key, e)
         self._search_clients.clear()
+        if self._search_session is not None and not self._search_session.closed:
+            try:
+                await self._search_session.close()
+            except Exception as e:
+                logger.warning("Failed to close search session: %s", e)
+        self._search_session = None
         if self._cosmos_client:
             try:
                 await self._cosmos_client.close()
@@ -218,6 +518,19 @@ class AsyncUnifiedRetriever:
             except Exception as e:
                 logger.warning("Failed to close Cosmos credential: %s", e)
             self._cosmos_credential = None
+        if self._fabric_odbc_pool is not None:
+            try:
+                self._fabric_odbc_pool.close()
+                await self._fabric_odbc_pool.wait_closed()
+            except Exception as e:
+                logger.warning("Failed to close Fabric SQL ODBC pool: %s", e)
+            self._fabric_odbc_pool = None
+        if self._embedding_disk_cache is not None:
+            try:
+                self._embedding_disk_cache.close()
+            except Exception as e:
+                logger.warning("Failed to close embedding disk cache: %s", e)
+            self._embedding_disk_cache = None
 
     async def _with_timeout(self, operation: str, awaitable):
         """Run an awaitable with a bounded timeout and normalize timeout exceptions."""
@@ -231,11 +544,32 @@ class AsyncUnifiedRetriever:
     # Fabric token acquisition
     # ------------------------------------------------------------------
     async def _get_fabric_token(self) -> str:
-        """Get Fabric/Azure token for REST API calls."""
+        """Get Fabric/Azure token for REST API calls (cached until shortly before expiry)."""
         static_token = os.getenv("FABRIC_BEARER_TOKEN", "").strip()
         if static_token and env_bool("ALLOW_STATIC_FABRIC_BEARER", False):
             return static_token
 
+        cached = self._cached_fabric_token()
+        if cached:
+            return cached
+
+        # Single-flight: concurrent KQL/Graph/SQL calls share one token request.
+        async with self._fabric_token_lock:
+            cached = self._cached_fabric_token()
+            if cached:
+                return cached
+            token, expires_at = await self._acquire_fabric_token()
+            if token:
+                self._fabric_token = (token, expires_at)
+            return token
+
+    def _cached_fabric_token(self) -> str:
+        if self._fabric_token and self._fabric_token[1] - time.time() > _FABRIC_TOKEN_REFRESH_MARGIN_SECONDS:
+            return self._fabric_token[0]
+        return ""
+
+    async def _acquire_fabric_token(self) -> Tuple[str, float]:
+        """Request a new Fabric token. Returns (token, expires_at_epoch_seconds)."""
         # Use service principal if configured
         client_id = os.getenv("FABRIC_CLIENT_ID", "")
         client_secret = os.getenv("FABRIC_CLIENT_SECRET", "")
@@ -256,7 +590,12 @@ class AsyncUnifiedRetriever:
                 ),
             )
             resp.raise_for_status()
-            return resp.json()["access_token"]
+            body = resp.json()
+            try:
+                expires_in = float(body.get("expires_in", 0))
+            except (TypeError, ValueError):
+                expires_in = 0.0
+            return body["access_token"], time.time() + expires_in
 
         # Fallback to Azure CLI credential
         try:
@@ -275,10 +614,12 @@ class AsyncUnifiedRetriever:
                 except Exception as close_error:
                     logger.warning("Failed to close Azure CLI credential: %s", close_error)
 
-            return token.token if token else ""
+            if not token:
+                return "", 0.0
+            return token.token, float(token.expires_on)
         except Exception as e:
             logger.warning("Fabric token acquisition failed: %s", e)
-            return ""
+            return "", 0.0
 
     # ------------------------------------------------------------------
     # 1. SQL (PostgreSQL via asyncpg)
@@ -292,11 +633,14 @@ class AsyncUnifiedRetriever:
         if not self._pg_pool:
             return [], [Citation(source_type="SQL", title="No database connection")]
 
+        airports = _extract_airports_from_query(query)
+        if _lacks_required_entities(query, airports, "FlightSchedule"):
+            return [], [Citation(source_type="SQL", title="No entities in query")]
+
         try:
             schemas = schema or (
                 await self._with_timeout("sql schema snapshot", self._schema_provider.snapshot())
             ).get("sql_schema", {})
-            airports = _extract_airports_from_query(query)
 
             sql = await self._with_timeout(
                 "sql generation",
@@ -320,11 +664,11 @@ class AsyncUnifiedRetriever:
             async with self._pg_pool.acquire() as conn:
                 records = await self._with_timeout("sql execution", conn.fetch(sql))
 
-            rows = [dict(r) for r in records]
+            rows = await _records_to_dicts(records)
             citations = [
                 Citation(
                     source_type="SQL",
-                    identifier=f"sql-{hash(sql) % 10000}",
+                    identifier=f"sql-{_stable_query_id(sql)}",
                     title=f"SQL query: {sql[:80]}",
                     content_preview=str(rows[:2]) if rows else "No results",
                     score=1.0,
@@ -352,11 +696,14 @@ class AsyncUnifiedRetriever:
         if not self._fabric_kql_endpoint:
             return [], [Citation(source_type="KQL", title="KQL endpoint not configured")]
 
+        airports = _extract_airports_from_query(query)
+        if _lacks_required_entities(query, airports, "LivePositions"):
+            return [], [Citation(source_type="KQL", title="No entities in query")]
+
         try:
             schemas = (
                 await self._with_timeout("kql schema snapshot", self._schema_provider.snapshot())
             ).get("kql_schema", {})
-            airports = _extract_airports_from_query(query)
 
             kql = await self._with_timeout(
                 "kql generation",
@@ -386,13 +733,13 @@ class AsyncUnifiedRetriever:
                 ),
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
             rows = self._parse_kusto_response(data)
             citations = [
                 Citation(
                     source_type="KQL",
-                    identifier=f"kql-{hash(kql) % 10000}",
+                    identifier=f"kql-{_stable_query_id(kql)}",
                     title=f"KQL query: {kql[:80]}",
                     content_preview=str(rows[:2]) if rows else "No results",
                     score=1.0,
@@ -418,13 +765,15 @@ class AsyncUnifiedRetriever:
 
             for frame in frames:
                 columns = frame.get("Columns") or frame.get("columns") or []
-                col_names = [c.get("ColumnName") or c.get("columnName") or f"col_{i}" for i, c in enumerate(columns)]
+                col_names = tuple(
+                    c.get("ColumnName") or c.get("columnName") or f"col_{i}" for i, c in enumerate(columns)
+                )
                 raw_rows = frame.get("Rows") or frame.get("rows") or []
-                for raw_row in raw_rows:
-                    if isinstance(raw_row, list):
-                        rows.append(dict(zip(col_names, raw_row)))
-                    elif isinstance(raw_row, dict):
-                        rows.append(raw_row)
+                rows = [
+                    dict(zip(col_names, raw_row)) if isinstance(raw_row, list) else raw_row
+                    for raw_row in raw_rows
+                    if isinstance(raw_row, (list, dict))
+                ]
                 if rows:
                     break
         except Exception as e:
@@ -492,52 +841,40 @@ class AsyncUnifiedRetriever:
         start = airports[0] if airports else "KORD"
         try:
             async with self._pg_pool.acquire() as conn:
-                relation = await self._with_timeout(
-                    "graph relation resolution",
-                    self._resolve_graph_edges_relation(conn),
-                )
-                if not relation:
-                    return [], [
-                        Citation(
-                            source_type="GRAPH",
-                            title=(
-                                "GRAPH_TABLE_MISSING: ops_graph_edges not found in visible schemas "
-                                f"({', '.join(self._sql_visible_schemas)})"
-                            ),
-                        )
-                    ]
-                source_col, target_col, edge_type_col = await self._with_timeout(
-                    "graph column resolution",
-                    self._resolve_graph_columns(conn, relation),
-                )
-                if not source_col or not target_col:
-                    return [], [
-                        Citation(
-                            source_type="GRAPH",
-                            title=(
-                                "GRAPH_SCHEMA_MISMATCH: could not resolve source/target columns in "
-                                f"{relation}"
-                            ),
-                        )
-                    ]
-                edge_type_seed = edge_type_col if edge_type_col else "'link'"
-                edge_type_recursive = f"e.{edge_type_col}" if edge_type_col else "'link'"
-                sql = f"""
-                    WITH RECURSIVE graph_walk AS (
-                        SELECT {source_col} AS source_id, {target_col} AS target_id, {edge_type_seed} AS edge_type, 1 AS depth
-                        FROM {relation}
-                        WHERE {source_col} = $1
-                        UNION ALL
-                        SELECT e.{source_col} AS source_id, e.{target_col} AS target_id, {edge_type_recursive} AS edge_type, gw.depth + 1
-                        FROM {relation} e
-                        JOIN graph_walk gw ON e.{source_col} = gw.target_id
-                        WHERE gw.depth < $2
+                sql = self._graph_bfs_sql
+                if sql is None:
+                    relation = await self._with_timeout(
+                        "graph relation resolution",
+                        self._resolve_graph_edges_relation(conn),
                     )
-                    SELECT DISTINCT source_id, target_id, edge_type, depth
-                    FROM graph_walk
-                    ORDER BY depth
-                    LIMIT 100
-                """
+                    if not relation:
+                        return [], [
+                            Citation(
+                                source_type="GRAPH",
+                                title=(
+                                    "GRAPH_TABLE_MISSING: ops_graph_edges not found in visible schemas "
+                                    f"({', '.join(self._sql_visible_schemas)})"
+                                ),
+                            )
+                        ]
+                    source_col, target_col, edge_type_col = await self._with_timeout(
+                        "graph column resolution",
+                        self._resolve_graph_columns(conn, relation),
+                    )
+                    if not source_col or not target_col:
+                        return [], [
+                            Citation(
+                                source_type="GRAPH",
+                                title=(
+                                    "GRAPH_SCHEMA_MISMATCH: could not resolve source/target columns in "
+                                    f"{relation}"
+                                ),
+                            )
+                        ]
+                    sql = _build_graph_bfs_sql(relation, source_col, target_col, edge_type_col)
+                    # Identical SQL text on every call lets asyncpg's per-connection
+                    # statement cache reuse the prepared plan.
+                    self._graph_bfs_sql = sql
                 records = await self._with_timeout(
                     "graph pg fallback execution",
                     conn.fetch(sql, start, hops),
@@ -558,6 +895,8 @@ class AsyncUnifiedRetriever:
             logger.error("Graph PG fallback timed out: %s", e)
             return [], [Citation(source_type="GRAPH", title=f"Graph error: {str(e)[:100]}")]
         except Exception as e:
+            # Re-resolve relation/columns next time in case the table changed.
+            self._graph_bfs_sql = None
             logger.error("Graph PG fallback failed: %s", e)
             return [], [Citation(source_type="GRAPH", title=f"Graph error: {str(e)[:100]}")]
 
@@ -616,17 +955,17 @@ class AsyncUnifiedRetriever:
         query: str,
         top: int = 5,
         source: str = "VECTOR_OPS",
+        include_vector: bool = False,
     ) -> Tuple[List[Dict[str, Any]], List[Citation]]:
-        """Search Azure AI Search index (vector + BM25 hybrid)."""
+        """Search Azure AI Search index (vector + BM25 hybrid).
+
+        ``content_vector`` is projected out server-side once the index's
+        retrievable fields are known; pass ``include_vector=True`` to keep it.
+        """
         if not _HAS_SEARCH:
             return [], [Citation(source_type=source, title="azure-search-documents not installed")]
 
-        index_map = {
-            "VECTOR_OPS": os.getenv("AZURE_SEARCH_INDEX_OPS_NAME", "idx_ops_narratives"),
-            "VECTOR_REG": os.getenv("AZURE_SEARCH_INDEX_REGULATORY_NAME", "idx_regulatory"),
-            "VECTOR_AIRPORT": os.getenv("AZURE_SEARCH_INDEX_AIRPORT_NAME", "idx_airport_ops_docs"),
-        }
-        index_name = index_map.get(source)
+        index_name = _search_index_names().get(source)
         if not index_name:
             return [], [Citation(source_type=source, title=f"Unknown search source: {source}")]
 
@@ -645,17 +984,35 @@ class AsyncUnifiedRetriever:
                 fields="content_vector",
             ) if embedding else None
 
+            fields_key = f"{search_endpoint}/{index_name}"
+            select_fields = None if include_vector else self._search_select_fields.get(fields_key)
+
             async def _execute_search():
                 results = await client.search(
                     search_text=query,
                     vector_queries=[vector_query] if vector_query else None,
                     top=top,
+                    select=select_fields,
                 )
 
                 rows: List[Dict[str, Any]] = []
                 citations: List[Citation] = []
                 async for result in results:
-                    row = {k: v for k, v in result.items() if k != "content_vector"}
+                    if select_fields is None:
+                        if not include_vector and fields_key not in self._search_select_fields:
+                            # Learn the index's document fields from the first full
+                            # response so later searches skip the vector payload.
+                            self._search_select_fields[fields_key] = [
+                                k for k in result.keys()
+                                if k != "content_vector" and not k.startswith("@")
+                            ]
+                        row = (
+                            dict(result)
+                            if include_vector
+                            else {k: v for k, v in result.items() if k != "content_vector"}
+                        )
+                    else:
+                        row = dict(result)
                     rows.append(row)
                     citations.append(Citation(
                         source_type=source,
@@ -680,61 +1037,60 @@ class AsyncUnifiedRetriever:
     async def _get_search_client(self, endpoint: str, key: str, index_name: str):
         cache_key = f"{endpoint}/{index_name}"
         if cache_key not in self._search_clients:
+            # All indexes share one aiohttp session, so indexes on the same
+            # endpoint reuse pooled TCP/TLS connections.
+            if self._search_session is None or self._search_session.closed:
+                import aiohttp
+                self._search_session = aiohttp.ClientSession()
             self._search_clients[cache_key] = SearchClient(
                 endpoint=endpoint,
                 index_name=index_name,
                 credential=AzureKeyCredential(key),
+                transport=AioHttpTransport(session=self._search_session, session_owner=False),
             )
         return self._search_clients[cache_key]
 
+    async def warmup_search_clients(self) -> Dict[str, bool]:
+        """Pre-create search clients and open their connections with a cheap count call.
+
+        Returns {source: warmed} for each configured index; failures are logged, not raised.
+        """
+        search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT", "")
+        search_key = os.getenv("AZURE_SEARCH_ADMIN_KEY", "")
+        if not _HAS_SEARCH or not search_endpoint or not search_key:
+            return {}
+
+        async def _warm(source: str, index_name: str) -> bool:
+            try:
+                client = await self._get_search_client(search_endpoint, search_key, index_name)
+                await self._with_timeout(f"search warmup {source}", client.get_document_count())
+                return True
+            except Exception as e:
+                logger.warning("Search warmup failed for %s (%s): %s", source, index_name, e)
+                return False
+
+        index_names = _search_index_names()
+        warmed = await asyncio.gather(*(_warm(src, idx) for src, idx in index_names.items()))
+        return dict(zip(index_names, warmed))
+
     # ------------------------------------------------------------------
     # 7. NOSQL (Cosmos DB — NOTAMs)
     # ------------------------------------------------------------------
     async def query_nosql(
         self,
         query: str,
+        limit: int = 20,
     ) -> Tuple[List[Dict[str, Any]], List[Citation]]:
         """Query Cosmos DB for NOTAMs."""
         if not _HAS_COSMOS:
             return [], [Citation(source_type="NOSQL", title="azure-cosmos not installed")]
 
-        cosmos_endpoint = os.getenv("AZURE_COSMOS_ENDPOINT", "")
-        cosmos_key = os.getenv("AZURE_COSMOS_KEY", "")
-        cosmos_db_name = os.getenv("AZURE_COSMOS_DATABASE", "aviationrag")
-        cosmos_container_name = os.getenv("AZURE_COSMOS_CONTAINER", "notams")
-
-        if not cosmos_endpoint:
+        if not os.getenv("AZURE_COSMOS_ENDPOINT", ""):
             return [], [Citation(source_type="NOSQL", title="Cosmos endpoint not configured")]
 
         try:
-            container = await self._get_cosmos_container(
-                cosmos_endpoint, cosmos_key, cosmos_db_name, cosmos_container_name,
-            )
-
-            airports = _extract_airports_from_query(query)
-            if airports:
-                # Use parameterized query to prevent injection
-                sanitized = [re.sub(r'[^A-Z0-9]', '', a.upper())[:6] for a in airports[:5]]
-                params: List[Dict[str, str]] = []
-                conditions = []
-                for i, code in enumerate(sanitized):
-                    param_name = f"@airport{i}"
-                    conditions.append(f"CONTAINS(c.location, {param_name})")
-                    params.append({"name": param_name, "value": code})
-                cosmos_query = f"SELECT * FROM c WHERE ({' OR '.join(conditions)}) OFFSET 0 LIMIT 20"
-            else:
-                cosmos_query = "SELECT * FROM c OFFSET 0 LIMIT 20"
-                params = []
-
             async def _execute_nosql_query():
-                rows: List[Dict[str, Any]] = []
-                async for item in container.query_items(
-                    query=cosmos_query,
-                    parameters=params if params else None,
-                    enable_cross_partition_query=True,
-                ):
-                    rows.append(item)
-                return rows
+                return [item async for item in self.iter_nosql(query, limit=limit)]
 
             rows = await self._with_timeout("cosmos query", _execute_nosql_query())
 
@@ -757,6 +1113,79 @@ class AsyncUnifiedRetriever:
             logger.error("Cosmos query failed: %s", e)
             return [], [Citation(source_type="NOSQL", title=f"Cosmos error: {str(e)[:100]}")]
 
+    async def iter_nosql(self, query: str, limit: int = 20) -> AsyncIterator[Dict[str, Any]]:
+        """Yield NOTAM documents for the query, at most ``limit``, one Cosmos page at a time.
+
+        Callers that stop iterating early stop paging, so no further pages are
+        fetched (or charged) from Cosmos.
+        """
+        container = await self._get_cosmos_container(
+            os.getenv("AZURE_COSMOS_ENDPOINT", ""),
+            os.getenv("AZURE_COSMOS_KEY", ""),
+            os.getenv("AZURE_COSMOS_DATABASE", "aviationrag"),
+            os.getenv("AZURE_COSMOS_CONTAINER", "notams"),
+        )
+        limit = max(1, int(limit))
+
+        airports = _extract_airports_from_query(query)
+        sanitized = [re.sub(r'[^A-Z0-9]', '', a.upper())[:6] for a in airports[:5]]
+        sanitized = [code for code in sanitized if code]
+
+        if sanitized and self._cosmos_partition_key == "location":
+            # Container is partitioned by location: one single-partition query
+            # per airport, issued in parallel, instead of a cross-partition OR.
+            async def _query_partition(code: str) -> List[Dict[str, Any]]:
+                items: List[Dict[str, Any]] = []
+                async for item in container.query_items(
+                    query=f"SELECT * FROM c WHERE STARTSWITH(c.location, @airport) OFFSET 0 LIMIT {limit}",
+                    parameters=[{"name": "@airport", "value": code}],
+                    partition_key=code,
+                    max_item_count=limit,
+                ):
+                    items.append(item)
+                return items
+
+            per_partition = await asyncio.gather(*(_query_partition(code) for code in sanitized))
+            seen_ids: set[str] = set()
+            emitted = 0
+            for items in per_partition:
+                for item in items:
+                    item_id = item.get("id")
+                    if item_id is not None:
+                        if item_id in seen_ids:
+                            continue
+                        seen_ids.add(item_id)
+                    yield item
+                    emitted += 1
+                    if emitted >= limit:
+                        return
+            return
+
+        if sanitized:
+            # Use parameterized query to prevent injection
+            params: List[Dict[str, str]] = []
+            conditions = []
+            for i, code in enumerate(sanitized):
+                param_name = f"@airport{i}"
+                conditions.append(f"CONTAINS(c.location, {param_name})")
+                params.append({"name": param_name, "value": code})
+            cosmos_query = f"SELECT * FROM c WHERE ({' OR '.join(conditions)}) OFFSET 0 LIMIT {limit}"
+        else:
+            cosmos_query = f"SELECT * FROM c OFFSET 0 LIMIT {limit}"
+            params = []
+
+        emitted = 0
+        async for item in container.query_items(
+            query=cosmos_query,
+            parameters=params if params else None,
+            enable_cross_partition_query=True,
+            max_item_count=limit,
+        ):
+            yield item
+            emitted += 1
+            if emitted >= limit:
+                return
+
     async def _get_cosmos_container(self, endpoint, key, db_name, container_name):
         if self._cosmos_container is None:
             if key:
@@ -781,36 +1210,31 @@ class AsyncUnifiedRetriever:
             # Try pyodbc TDS fallback
             return await self._query_fabric_sql_tds(query)
 
+        airports = _extract_airports_from_query(query)
+        if _lacks_required_entities(query, airports, "HistoricalDelays"):
+            return [], [Citation(source_type="FABRIC_SQL", title="No entities in query")]
+
         try:
             token = await self._get_fabric_token()
             if not token:
                 return [], [Citation(source_type="FABRIC_SQL", title="No Fabric token")]
 
-            # Generate T-SQL via LLM
-            tsql = await self._with_timeout(
-                "fabric sql generation",
-                self._sql_writer.generate(
-                    user_query=query,
-                    evidence_type="HistoricalDelays",
-                    sql_schema={"tables": {
-                        "bts_ontime_reporting": {
-                            "columns": {
-                                "year": "int", "month": "int", "carrier": "varchar",
-                                "origin": "varchar", "dest": "varchar",
-                                "dep_delay": "float", "arr_delay": "float",
-                                "cancelled": "float", "diverted": "float",
-                                "carrier_delay": "float", "weather_delay": "float",
-                                "nas_delay": "float", "security_delay": "float",
-                                "late_aircraft_delay": "float",
-                            }
-                        }
-                    }
-                    },
-                    entities={"airports": _extract_airports_from_query(query), "flight_ids": []},
-                    time_window={"horizon_min": 0},
-                    constraints={"dialect": "tsql"},
-                ),
-            )
+            tsql = self._fabric_sql_templates.lookup(query, airports)
+            if tsql is None:
+                # Generate T-SQL via LLM
+                tsql = await self._with_timeout(
+                    "fabric sql generation",
+                    self._sql_writer.generate(
+                        user_query=query,
+                        evidence_type="HistoricalDelays",
+                        sql_schema=FABRIC_BTS_SCHEMA,
+                        entities={"airports": airports, "flight_ids": []},
+                        time_window={"horizon_min": 0},
+                        constraints={"dialect": "tsql"},
+                    ),
+                )
+                if tsql and "NEED_SCHEMA" not in tsql:
+                    self._fabric_sql_templates.store(query, airports, tsql)
 
             if not tsql or "NEED_SCHEMA" in tsql:
                 return [], [Citation(source_type="FABRIC_SQL", title="Could not generate T-SQL")]
@@ -831,7 +1255,7 @@ class AsyncUnifiedRetriever:
             citations = [
                 Citation(
                     source_type="FABRIC_SQL",
-                    identifier=f"fabric-sql-{hash(tsql) % 10000}",
+                    identifier=f"fabric-sql-{_stable_query_id(tsql)}",
                     title=f"Fabric SQL: {tsql[:80]}",
                     content_preview=f"{len(rows)} rows",
                     score=1.0,
@@ -847,29 +1271,45 @@ class AsyncUnifiedRetriever:
             logger.error("Fabric SQL query failed: %s", e)
             return [], [Citation(source_type="FABRIC_SQL", title=f"Fabric SQL error: {str(e)[:100]}")]
 
+    async def _get_fabric_odbc_pool(self, conn_str: str):
+        """Lazily create the pooled aioodbc connection pool for the TDS fallback."""
+        if self._fabric_odbc_pool is None:
+            async with self._fabric_odbc_pool_lock:
+                if self._fabric_odbc_pool is None:
+                    import aioodbc
+                    self._fabric_odbc_pool = await aioodbc.create_pool(
+                        dsn=conn_str,
+                        minsize=env_int("FABRIC_SQL_POOL_MIN", 2),
+                        maxsize=env_int("FABRIC_SQL_POOL_MAX", 10),
+                        echo=False,
+                    )
+        return self._fabric_odbc_pool
+
     async def _query_fabric_sql_tds(self, query: str) -> Tuple[List[Dict[str, Any]], List[Citation]]:
-        """Fallback: pyodbc TDS connection wrapped in asyncio.to_thread."""
+        """Fallback: TDS query over a pooled aioodbc connection."""
         try:
-            import pyodbc
+            import aioodbc  # noqa: F401
         except ImportError:
-            return [], [Citation(source_type="FABRIC_SQL", title="pyodbc not installed")]
+            return [], [Citation(source_type="FABRIC_SQL", title="aioodbc not installed")]
 
         fabric_conn_str = os.getenv("FABRIC_SQL_CONNECTION_STRING", "")
         if not fabric_conn_str:
             return [], [Citation(source_type="FABRIC_SQL", title="No Fabric SQL connection string")]
 
-        def _sync_query():
-            conn = pyodbc.connect(fabric_conn_str)
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT TOP 50 * FROM bts_ontime_reporting WHERE origin IN ('ORD','ATL','DFW')")
-            columns = [desc[0] for desc in cursor.description]
-            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            cursor.close()
-            conn.close()
-            return rows
+        async def _pooled_query():
+            pool = await self._get_fabric_odbc_pool(fabric_conn_str)
+            placeholders = ", ".join("?" for _ in _FABRIC_TDS_DEFAULT_ORIGINS)
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        f"SELECT TOP 50 * FROM bts_ontime_reporting WHERE origin IN ({placeholders})",
+                        *_FABRIC_TDS_DEFAULT_ORIGINS,
+                    )
+                    columns = [desc[0] for desc in cursor.description]
+                    return [dict(zip(columns, row)) for row in await cursor.fetchall()]
 
         try:
-            rows = await self._with_timeout("fabric sql tds", asyncio.to_thread(_sync_query))
+            rows = await self._with_timeout("fabric sql tds", _pooled_query())
             citations = [
                 Citation(
                     source_type="FABRIC_SQL",
@@ -891,9 +1331,32 @@ class AsyncUnifiedRetriever:
     # Embedding helper
     # ------------------------------------------------------------------
     async def get_embedding(self, text: str) -> List[float]:
-        """Get text embedding from Azure OpenAI."""
-        if text in self._embedding_cache:
-            return self._embedding_cache[text]
+        """Get text embedding from Azure OpenAI.
+
+        Cached vectors are held as packed float32 (``array('f')``) and only
+        expanded to a float list for the caller. Concurrent misses for the
+        same text share one in-flight lookup.
+        """
+        cached = self._embedding_cache.get(text)
+        if cached is not None:
+            return cached.tolist()
+
+        task = self._embedding_inflight.get(text)
+        if task is None:
+            task = asyncio.ensure_future(self._load_embedding(text))
+            self._embedding_inflight[text] = task
+            task.add_done_callback(lambda _t: self._embedding_inflight.pop(text, None))
+        # Shield so one caller's cancellation doesn't cancel the shared lookup.
+        packed = await asyncio.shield(task)
+        return packed.tolist() if packed is not None else []
+
+    async def _load_embedding(self, text: str) -> Optional[array]:
+        """Resolve an embedding from the disk cache or Azure OpenAI, caching the result."""
+        if self._embedding_disk_cache is not None:
+            cached = await self._embedding_disk_cache.get(self._embedding_deployment, text)
+            if cached:
+                self._embedding_cache[text] = cached
+                return cached
 
         try:
             from data_sources.azure_client import get_shared_async_client
@@ -907,13 +1370,15 @@ class AsyncUnifiedRetriever:
             )
             if not response.data:
                 logger.warning("Empty embedding response for text: %s", text[:50])
-                return []
-            embedding = response.data[0].embedding
-            self._embedding_cache[text] = embedding
-            return embedding
+                return None
+            packed = array("f", response.data[0].embedding)
+            self._embedding_cache[text] = packed
+            if self._embedding_disk_cache is not None:
+                await self._embedding_disk_cache.put(self._embedding_deployment, text, packed)
+            return packed
         except Exception as e:
             logger.warning("Embedding generation failed: %s", e)
-            return []
+            return None
 
     # ------------------------------------------------------------------
     # Multi-source parallel query
@@ -942,13 +1407,18 @@ class AsyncUnifiedRetriever:
             if method:
                 tasks[source] = asyncio.create_task(method(query, **kwargs))
 
+        outcomes = await asyncio.gather(
+            *(self._with_timeout(f"source {source}", task) for source, task in tasks.items()),
+            return_exceptions=True,
+        )
+
         results = {}
-        for source, task in tasks.items():
-            try:
-                results[source] = await self._with_timeout(f"source {source}", task)
-            except Exception as e:
-                logger.error("Source %s failed: %s", source, e)
-                results[source] = ([], [Citation(source_type=source, title=f"Error: {str(e)[:80]}")])
+        for source, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Source %s failed: %s", source, outcome)
+                results[source] = ([], [Citation(source_type=source, title=f"Error: {str(outcome)[:80]}")])
+            else:
+                results[source] = outcome
 
         return results
 
@@ -1011,13 +1481,15 @@ _retriever_lock = asyncio.Lock()
 async def get_retriever(pg_pool=None) -> AsyncUnifiedRetriever:
     """Get or create the singleton retriever instance (async-safe)."""
     global _retriever
-    if _retriever is not None:
-        if pg_pool is not None and _retriever._pg_pool is None:
-            logger.warning("Retriever singleton already exists without pg_pool; updating pool")
-            _retriever._pg_pool = pg_pool
-            _retriever._schema_provider = AsyncSchemaProvider(pg_pool=pg_pool)
-        return _retriever
+    retriever = _retriever
+    if retriever is not None and (pg_pool is None or retriever._pg_pool is not None):
+        return retriever
+    # Slow path: first construction, or attaching a pool to a pool-less singleton.
     async with _retriever_lock:
         if _retriever is None:
             _retriever = AsyncUnifiedRetriever(pg_pool=pg_pool)
+        elif pg_pool is not None and _retriever._pg_pool is None:
+            logger.warning("Retriever singleton already exists without pg_pool; updating pool")
+            _retriever._pg_pool = pg_pool
+            _retriever._schema_provider = AsyncSchemaProvider(pg_pool=pg_pool)
         return _retriever
@@ -5,24 +5,30 @@ Main entry point for the backend API.
 
 import os
 import asyncio
-from contextlib import asynccontextmanager
+import functools
+import time
+import json
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 import logging
+import orjson
 import structlog
 
 # Load .env from project root (parent of backend/)
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sse_starlette.sse import EventSourceResponse
-from pydantic import BaseModel
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from schemas import WorkflowEvent, EventKind, EventLevel, RunStatus
 from schemas.runs import RunMetadata
-from services.event_bus import get_event_bus, close_event_bus
+from services.event_bus import RunEventPublisher, get_event_bus, close_event_bus
+from services.stream_hub import SSE_BATCH_MAX_EVENTS, get_stream_hub, close_stream_hub
 from services.run_store import get_run_store
 
 # Configure Python stdlib logging so structlog filter_by_level works
@@ -47,6 +53,15 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+# Max events replayed from history in one XRANGE before handing off to the
+# shared live tail.
+SSE_REPLAY_MAX_EVENTS = int(os.getenv("SSE_REPLAY_MAX_EVENTS", "1000"))
+
+# Dependency health is probed in the background and /ready serves the cached
+# result, so frequent kubelet probes don't each take a Redis/PG connection.
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "30"))
+_health: Dict[str, Any] = {"redis": False, "postgres": False, "checked_at": None, "checked_monotonic": 0.0}
+
 
 def _env_enabled(name: str, default: bool = False) -> bool:
     raw = os.getenv(name, "")
@@ -125,6 +140,39 @@ def _normalize_workflow_event_payload(payload: Any) -> Dict[str, Any]:
     }
 
 
+# Orchestrator callback event type -> public SSE event kind. Enum values map to
+# themselves; aliases cover the orchestrator's dotted callback names.
+_EVENT_KIND_ALIASES: Dict[str, EventKind] = {
+    "agent.completed": EventKind.AGENT_COMPLETED_DOT,
+    "agent.started": EventKind.AGENT_STARTED_DOT,
+    "agent.streaming": EventKind.AGENT_STREAMING,
+    "agent.objective": EventKind.AGENT_OBJECTIVE,
+    "agent.progress": EventKind.AGENT_PROGRESS,
+    "tool.called": EventKind.TOOL_CALLED_DOT,
+    "tool.completed": EventKind.TOOL_COMPLETED_DOT,
+    "tool.failed": EventKind.TOOL_FAILED_DOT,
+    "workflow.started": EventKind.WORKFLOW_STATUS,
+    "workflow.output": EventKind.WORKFLOW_STATUS,
+    "workflow.failed": EventKind.RUN_FAILED,
+    "executor.invoked": EventKind.EXECUTOR_INVOKED,
+    "executor.completed": EventKind.EXECUTOR_COMPLETED,
+    "orchestrator.workflow_created": EventKind.WORKFLOW_STATUS,
+    # execute_workflow publishes the run lifecycle (RUN_STARTED/COMPLETED/FAILED)
+    # itself; the orchestrator's own lifecycle callbacks are status updates so
+    # each run emits exactly one of each.
+    "orchestrator.run_started": EventKind.WORKFLOW_STATUS,
+    "orchestrator.run_completed": EventKind.WORKFLOW_STATUS,
+    "orchestrator.run_failed": EventKind.WORKFLOW_STATUS,
+    "coordinator.scoring": EventKind.COORDINATOR_SCORING,
+    "coordinator.plan": EventKind.COORDINATOR_PLAN,
+    "recovery.option": EventKind.RECOVERY_OPTION,
+    # Explicit agent/executor failure channels are progress, not terminal run failure.
+    "agent.failed": EventKind.PROGRESS_UPDATE,
+    "executor.failed": EventKind.PROGRESS_UPDATE,
+}
+_EVENT_KIND_MAP: Dict[str, EventKind] = {**_EVENT_KIND_ALIASES, **{kind.value: kind for kind in EventKind}}
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - initialize and cleanup resources."""
@@ -142,6 +190,7 @@ async def lifespan(app: FastAPI):
     retriever = None
     try:
         run_store = await asyncio.wait_for(get_run_store(), timeout=30)
+        app.state.run_store = run_store
         from data_sources.unified_retriever import get_retriever
         retriever = await asyncio.wait_for(get_retriever(pg_pool=run_store.pool), timeout=15)
         from agents.tools import RETRIEVER_MODULES
@@ -158,15 +207,42 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("retriever_wiring_failed", error=str(e))
 
+    # Open Azure AI Search connections in the background so the first
+    # vector query doesn't pay TLS setup; startup does not wait on it.
+    search_warmup_task = None
+    if retriever:
+        async def _warm_search_clients():
+            try:
+                warmed = await retriever.warmup_search_clients()
+                if warmed:
+                    logger.info("search_clients_warmed", indexes=warmed)
+            except Exception as warm_err:
+                logger.warning("search_client_warmup_failed", error=str(warm_err))
+
+        search_warmup_task = asyncio.create_task(_warm_search_clients())
+
+    try:
+        app.state.event_bus = await asyncio.wait_for(get_event_bus(), timeout=15)
+    except Exception as e:
+        logger.warning("event_bus_startup_failed", error=str(e))
+
+    health_probe_task = asyncio.create_task(_periodic_health_probe())
+
     yield
 
     logger.info("shutting_down_aviation_solver_api")
+    health_probe_task.cancel()
+    if search_warmup_task and not search_warmup_task.done():
+        search_warmup_task.cancel()
     if retriever:
         try:
             await retriever.close()
             logger.info("retriever_closed")
         except Exception as e:
             logger.warning("retriever_close_failed", error=str(e))
+    app.state.run_store = None
+    app.state.event_bus = None
+    await close_stream_hub()
     await close_event_bus()
 
 
@@ -178,8 +254,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+async def _app_run_store():
+    """Run store bound at startup; falls back to the singleton if startup could not connect."""
+    run_store = getattr(app.state, "run_store", None)
+    return run_store if run_store is not None else await get_run_store()
+
+
+async def _app_event_bus():
+    """Event bus bound at startup; falls back to the singleton if startup could not connect."""
+    event_bus = getattr(app.state, "event_bus", None)
+    return event_bus if event_bus is not None else await get_event_bus()
+
 # Configure telemetry
-from telemetry import configure_telemetry, get_current_trace_context
+from telemetry import configure_telemetry, get_cached_trace_context
 configure_telemetry(app)
 
 # CORS configuration
@@ -208,6 +296,95 @@ class SolveRequest(BaseModel):
     config: Optional[dict] = None
 
 
+_INT_ADAPTER = TypeAdapter(int)
+
+
+def _lax_int(value: Any) -> Optional[int]:
+    """Coerce like a pydantic ``int`` field in lax mode; None when it would reject."""
+    if type(value) is int:
+        return value
+    try:
+        return _INT_ADAPTER.validate_python(value)
+    except ValidationError:
+        return None
+
+
+def _solve_request_error(body: bytes) -> RequestValidationError:
+    """Rebuild the 422 FastAPI would have sent had SolveRequest validated ``body``."""
+    try:
+        data = json.loads(body) if body else None
+    except json.JSONDecodeError as e:
+        return RequestValidationError(
+            [{
+                "type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error",
+                "input": {}, "ctx": {"error": e.msg},
+            }],
+            body=body,
+        )
+    if data is None:
+        return RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}], body=body,
+        )
+    try:
+        SolveRequest.model_validate(data, from_attributes=True)
+    except ValidationError as e:
+        return RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+            body=body,
+        )
+    return RequestValidationError(
+        [{"type": "value_error", "loc": ("body",), "msg": "Invalid request body", "input": None}],
+        body=body,
+    )
+
+
+def _parse_solve_request(body: bytes) -> SolveRequest:
+    """
+    Parse a /api/av/solve body without a full pydantic validation pass.
+    Accepts exactly what SolveRequest accepts (integers coerce as in
+    pydantic's lax mode: "5", 3.0, true). Anything else is re-validated
+    against the model, so rejections carry FastAPI's usual 422 error list.
+    """
+    try:
+        data = orjson.loads(body or b"{}")
+    except orjson.JSONDecodeError:
+        raise _solve_request_error(body)
+    if not isinstance(data, dict) or not isinstance(data.get("problem"), str):
+        raise _solve_request_error(body)
+    problem = data["problem"]
+
+    def _optional(name: str, expected: type):
+        value = data.get(name)
+        if value is not None and not isinstance(value, expected):
+            raise _solve_request_error(body)
+        return value
+
+    max_invocations = data.get("max_executor_invocations")
+    if max_invocations is not None:
+        max_invocations = _lax_int(max_invocations)
+        if max_invocations is None:
+            raise _solve_request_error(body)
+
+    turn_limits = _optional("autonomous_turn_limits", dict)
+    if turn_limits is not None:
+        coerced_limits = {}
+        for key, value in turn_limits.items():
+            limit = _lax_int(value)
+            if not isinstance(key, str) or limit is None:
+                raise _solve_request_error(body)
+            coerced_limits[key] = limit
+        turn_limits = coerced_limits
+
+    return SolveRequest.model_construct(
+        problem=problem,
+        workflow_type=_optional("workflow_type", str) if "workflow_type" in data else "sequential",
+        orchestration_mode=_optional("orchestration_mode", str),
+        max_executor_invocations=max_invocations,
+        autonomous_turn_limits=turn_limits,
+        config=_optional("config", dict),
+    )
+
+
 WORKFLOW_SMOKE_CASES = [
     {
         "id": "ui-handoff-llm-directed",
@@ -243,12 +420,14 @@ WORKFLOW_SMOKE_CASES = [
 ]
 
 
-def _get_workflow_catalog():
-    """Return workflow IDs and sample payloads used by UI and validation tooling."""
-    return [
-        case.copy()
-        for case in WORKFLOW_SMOKE_CASES
-    ]
+_RUN_LIST_ADAPTER = TypeAdapter(list[RunMetadata])
+
+
+# The catalog is static; serialize the /api/av/workflows body once at import.
+_WORKFLOW_CATALOG_BYTES = orjson.dumps({
+    "workflows": WORKFLOW_SMOKE_CASES,
+    "count": len(WORKFLOW_SMOKE_CASES),
+})
 
 
 class AgentInfo(BaseModel):
@@ -265,6 +444,9 @@ class AgentInfo(BaseModel):
     category: str = "specialist"
 
 
+_AGENT_INFO_LIST_ADAPTER = TypeAdapter(list[AgentInfo])
+
+
 class SolveResponse(BaseModel):
     """Response after starting a solver run."""
     run_id: str
@@ -296,28 +478,57 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
-@app.get("/ready")
-async def readiness_check():
-    """Readiness check - verifies dependencies."""
-    checks = {"api": True}
-
+async def _probe_dependencies() -> None:
+    """Ping Redis and PostgreSQL once and cache the result for /ready."""
     try:
-        event_bus = await get_event_bus()
-        await event_bus.redis.ping()
-        checks["redis"] = True
+        event_bus = await _app_event_bus()
+        await event_bus.general.ping()
+        redis_ok = True
     except Exception as e:
-        checks["redis"] = False
+        redis_ok = False
         logger.error("redis_health_check_failed", error=str(e))
 
     try:
-        run_store = await get_run_store()
+        run_store = await _app_run_store()
         async with run_store.pool.acquire() as conn:
             await conn.fetchval("SELECT 1")
-        checks["postgres"] = True
+        postgres_ok = True
     except Exception as e:
-        checks["postgres"] = False
+        postgres_ok = False
         logger.error("postgres_health_check_failed", error=str(e))
 
+    _health.update(
+        redis=redis_ok,
+        postgres=postgres_ok,
+        checked_at=datetime.now(timezone.utc).isoformat(),
+        checked_monotonic=time.monotonic(),
+    )
+
+
+async def _periodic_health_probe() -> None:
+    while True:
+        await _probe_dependencies()
+        await asyncio.sleep(HEALTH_PROBE_INTERVAL_SECONDS)
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check - reports cached dependency health from the background probe."""
+    stale = (
+        _health["checked_at"] is None
+        or time.monotonic() - _health["checked_monotonic"] > 3 * HEALTH_PROBE_INTERVAL_SECONDS
+    )
+    if stale:
+        # No probe yet, or the background probe has stopped: check inline.
+        await _probe_dependencies()
+
+    checks = {
+        "api": True,
+        "redis": _health["redis"],
+        "postgres": _health["postgres"],
+        "checked_at": _health["checked_at"],
+    }
+
     data_source_checks = _build_data_source_checks(postgres_ready=bool(checks.get("postgres")))
     checks["data_sources"] = data_source_checks
 
@@ -346,39 +557,59 @@ async def readiness_check():
 # Solver Endpoints
 # ============================================================================
 
-@app.post("/api/av/solve", response_model=SolveResponse)
-async def start_solve(request: SolveRequest, background_tasks: BackgroundTasks):
+@functools.lru_cache(maxsize=32)
+def _agent_roster_json(scenario: str) -> bytes:
+    """Pre-rendered AgentInfo JSON list for a scenario's /api/av/solve roster."""
+    from orchestrator.agent_registry import select_agents_for_problem
+
+    selected, excluded = select_agents_for_problem(scenario=scenario)
+    agent_infos = [
+        AgentInfo(
+            id=a.agent_id, name=a.agent_name, icon=a.icon,
+            color=a.color, dataSources=a.data_sources,
+            included=included, reason=a.reason,
+            description=a.description, outputs=a.outputs,
+            category=a.category,
+        )
+        for included, group in ((True, selected), (False, excluded))
+        for a in group
+    ]
+    return _AGENT_INFO_LIST_ADAPTER.dump_json(agent_infos)
+
+
+def _select_run_agents(problem: str) -> tuple[str, list, bytes]:
+    """Detect the scenario and return its selected agents and roster JSON."""
+    from orchestrator.agent_registry import select_agents_for_problem, detect_scenario
+
+    scenario = detect_scenario(problem)
+    selected, _ = select_agents_for_problem(scenario=scenario, include_excluded=False)
+    return scenario, selected, _agent_roster_json(scenario)
+
+
+@app.post(
+    "/api/av/solve",
+    response_model=SolveResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": SolveRequest.model_json_schema()}},
+        },
+    },
+)
+async def start_solve(http_request: Request, background_tasks: BackgroundTasks):
     """
     Start a new aviation problem solver run.
 
     Creates the run record, initializes stages, and starts the workflow.
     Returns immediately with run_id and agent metadata for the canvas UI.
     """
+    request = _parse_solve_request(await http_request.body())
     try:
-        from orchestrator.agent_registry import select_agents_for_problem, detect_scenario
-
-        run_store = await get_run_store()
-
-        # Detect scenario and select agents upfront for the response
-        scenario = detect_scenario(request.problem)
-        selected, excluded = select_agents_for_problem(request.problem)
-        agent_infos = []
-        for a in selected:
-            agent_infos.append(AgentInfo(
-                id=a.agent_id, name=a.agent_name, icon=a.icon,
-                color=a.color, dataSources=a.data_sources,
-                included=True, reason=a.reason,
-                description=a.description, outputs=a.outputs,
-                category=a.category,
-            ))
-        for a in excluded:
-            agent_infos.append(AgentInfo(
-                id=a.agent_id, name=a.agent_name, icon=a.icon,
-                color=a.color, dataSources=a.data_sources,
-                included=False, reason=a.reason,
-                description=a.description, outputs=a.outputs,
-                category=a.category,
-            ))
+        run_store = await _app_run_store()
+
+        # Detect scenario and select agents upfront for the response; both
+        # are cached lookups, as is the rendered agent roster.
+        scenario, selected, agent_roster = _select_run_agents(request.problem)
 
         workflow_type = request.workflow_type or "handoff"
         config = request.config or {}
@@ -446,13 +677,16 @@ async def start_solve(request: SolveRequest, background_tasks: BackgroundTasks):
             scenario=scenario,
         )
 
-        return SolveResponse(
-            run_id=run.run_id,
-            status="started",
-            message=f"Solver run started. Subscribe to /api/av/runs/{run.run_id}/events for progress.",
-            scenario=scenario,
-            agents=agent_infos,
-        )
+        # SolveResponse shape, with the cached roster spliced in as-is.
+        body = b"".join((
+            b'{"run_id":', orjson.dumps(run.run_id),
+            b',"status":"started","message":',
+            orjson.dumps(f"Solver run started. Subscribe to /api/av/runs/{run.run_id}/events for progress."),
+            b',"scenario":', orjson.dumps(scenario),
+            b',"agents":', agent_roster,
+            b"}",
+        ))
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error("solve_start_failed", error=str(e))
@@ -462,7 +696,7 @@ async def start_solve(request: SolveRequest, background_tasks: BackgroundTasks):
 @app.get("/api/av/runs/{run_id}")
 async def get_run(run_id: str):
     """Get run status and metadata."""
-    run_store = await get_run_store()
+    run_store = await _app_run_store()
     run = await run_store.get_run(run_id)
 
     if not run:
@@ -471,6 +705,23 @@ async def get_run(run_id: str):
     return run.model_dump()
 
 
+_SSE_SEP = "\r\n"
+
+
+def _sse_frame(events: List[WorkflowEvent]) -> bytes:
+    """Encode events as one SSE chunk; EventSource still dispatches each one."""
+    return b"".join(
+        ServerSentEvent(
+            event.to_sse_data(),
+            id=event.stream_id or event.event_id,
+            event=event.kind.value,
+            retry=5000,
+            sep=_SSE_SEP,
+        ).encode()
+        for event in events
+    )
+
+
 @app.get("/api/av/runs/{run_id}/events")
 async def stream_events(request: Request, run_id: str, since: Optional[str] = None):
     """
@@ -484,28 +735,39 @@ async def stream_events(request: Request, run_id: str, since: Optional[str] = No
     logger.info("sse_connection_started", run_id=run_id, last_event_id=last_event_id)
 
     async def event_generator():
-        """Generate SSE events from Redis stream."""
-        event_bus = await get_event_bus()
+        """Replay history with one bounded XRANGE, then tail via the shared stream reader."""
+        event_bus = await _app_event_bus()
 
         try:
-            async for event in event_bus.subscribe(run_id, last_event_id):
-                if await request.is_disconnected():
-                    logger.info("sse_client_disconnected", run_id=run_id)
-                    break
-
-                yield {
-                    "id": event.stream_id or event.event_id,
-                    "event": event.kind.value,
-                    "data": event.to_sse_data(),
-                    "retry": 5000,
-                }
+            cursor = await event_bus.resolve_start_id(run_id, last_event_id)
+            replay = await event_bus.get_events_after(run_id, cursor, count=SSE_REPLAY_MAX_EVENTS)
+            for start in range(0, len(replay), SSE_BATCH_MAX_EVENTS):
+                batch = replay[start:start + SSE_BATCH_MAX_EVENTS]
+                for index, event in enumerate(batch):
+                    if event.kind in (EventKind.RUN_COMPLETED, EventKind.RUN_FAILED):
+                        yield _sse_frame(batch[:index + 1])
+                        return
+                cursor = batch[-1].stream_id or cursor
+                yield _sse_frame(batch)
+
+            if await request.is_disconnected():
+                logger.info("sse_client_disconnected", run_id=run_id)
+                return
+
+            async with aclosing(get_stream_hub().subscribe_batches(run_id, cursor)) as batches:
+                async for batch in batches:
+                    if await request.is_disconnected():
+                        logger.info("sse_client_disconnected", run_id=run_id)
+                        break
+
+                    yield _sse_frame(batch)
 
         except asyncio.CancelledError:
             logger.info("sse_stream_cancelled", run_id=run_id)
         except Exception as e:
             logger.error("sse_stream_error", run_id=run_id, error=str(e))
 
-    return EventSourceResponse(event_generator())
+    return EventSourceResponse(event_generator(), sep=_SSE_SEP)
 
 
 @app.get("/api/av/runs")
@@ -515,17 +777,21 @@ async def list_runs(
     offset: int = 0,
 ):
     """List solver runs with optional filters."""
-    run_store = await get_run_store()
+    run_store = await _app_run_store()
 
     status_enum = RunStatus(status) if status else None
     runs = await run_store.list_runs(status_enum, limit, offset)
 
-    return {
-        "runs": [r.model_dump() for r in runs],
-        "count": len(runs),
-        "limit": limit,
-        "offset": offset,
-    }
+    # Serialize all rows in one native pydantic pass and splice in the envelope.
+    body = b"".join((
+        b'{"runs":',
+        _RUN_LIST_ADAPTER.dump_json(runs),
+        b',"count":', str(len(runs)).encode(),
+        b',"limit":', str(limit).encode(),
+        b',"offset":', str(offset).encode(),
+        b"}",
+    ))
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/api/av/inventory")
@@ -538,10 +804,7 @@ async def get_agent_inventory():
 @app.get("/api/av/workflows")
 async def list_workflows():
     """List canonical workflow variants used by smoke tests and UI-driven runs."""
-    return {
-        "workflows": _get_workflow_catalog(),
-        "count": len(WORKFLOW_SMOKE_CASES),
-    }
+    return Response(content=_WORKFLOW_CATALOG_BYTES, media_type="application/json")
 
 
 @app.post("/api/av/chat", response_model=ChatResponse)
@@ -560,7 +823,7 @@ async def chat(request: ChatRequest):
         # Build context from run if provided
         context_parts: list[str] = []
         if request.run_id:
-            run_store = await get_run_store()
+            run_store = await _app_run_store()
             run = await run_store.get_run(request.run_id)
             if run:
                 context_parts.append(
@@ -594,6 +857,92 @@ async def chat(request: ChatRequest):
 # Workflow Execution (Background Task)
 # ============================================================================
 
+# Shared fallback actor for orchestrator callback events. Treat as read-only:
+# it is attached by reference (pydantic cannot serialize a MappingProxyType).
+_DEFAULT_ACTOR: Dict[str, Any] = {"kind": "orchestrator", "id": "orchestrator", "name": "Orchestrator"}
+
+
+def resolve_event_kind(event_type: str) -> EventKind:
+    """Resolve orchestrator callback event types into public SSE event kinds."""
+    kind = _EVENT_KIND_MAP.get(event_type)
+    if kind is not None:
+        return kind
+    if event_type.startswith("workflow."):
+        return EventKind.WORKFLOW_STATUS
+    return EventKind.PROGRESS_UPDATE
+
+
+async def _emit_event(
+    publisher: RunEventPublisher,
+    run_id: str,
+    workflow_type: str,
+    orchestration_mode: Optional[str],
+    event_type: str,
+    payload: Any,
+):
+    """Publish an orchestrator callback event; bound per run via functools.partial."""
+    payload = _normalize_workflow_event_payload(payload)
+    event_kind = resolve_event_kind(event_type)
+    event_level = (
+        EventLevel.ERROR
+        if event_kind == EventKind.RUN_FAILED or event_type == "orchestrator.run_failed"
+        else EventLevel.INFO
+    )
+    message = (
+        payload.get("message")
+        or payload.get("reasoning")
+        or payload.get("summary")
+        or payload.get("resultSummary")
+        or str(event_type)
+    )
+
+    otel_context = get_cached_trace_context() or {}
+    trace_id = (
+        payload.get("trace_id")
+        or payload.get("traceId")
+        or otel_context.get("trace_id")
+    )
+    span_id = (
+        payload.get("span_id")
+        or payload.get("spanId")
+        or otel_context.get("span_id")
+    )
+    parent_span_id = (
+        payload.get("parent_span_id")
+        or payload.get("parentSpanId")
+        or otel_context.get("parent_span_id")
+    )
+
+    actor = payload.get("actor")
+    if not isinstance(actor, dict):
+        actor = _DEFAULT_ACTOR
+
+    # Inputs are produced in-process, so skip pydantic validation.
+    event = WorkflowEvent.model_construct(
+        run_id=run_id,
+        kind=event_kind,
+        level=event_level,
+        message=str(message),
+        stage_id=payload.get("stage_id"),
+        stage_name=payload.get("stage_name"),
+        agent_name=payload.get("agentName") or payload.get("agent_name"),
+        executor_name=payload.get("executor_name") or payload.get("executor_id"),
+        tool_name=payload.get("toolName") or payload.get("tool_name"),
+        actor=actor,
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_span_id=parent_span_id,
+        payload={
+            "event_type": event_type,
+            "workflow_type": workflow_type,
+            "orchestration_mode": orchestration_mode,
+            **payload,
+        },
+    )
+    # Token-level floods may be shed under backpressure; everything else waits.
+    await publisher.submit(event, droppable=event_kind is EventKind.AGENT_STREAMING)
+
+
 async def execute_workflow(
     run_id: str,
     problem: str,
@@ -617,10 +966,12 @@ async def execute_workflow(
 
     run_store = None
     event_bus = None
+    publisher = None
+    problem_preview = problem[:200]
 
     try:
-        run_store = await get_run_store()
-        event_bus = await get_event_bus()
+        run_store = await _app_run_store()
+        event_bus = await _app_event_bus()
 
         await run_store.update_run_status(run_id, RunStatus.RUNNING)
 
@@ -632,110 +983,17 @@ async def execute_workflow(
             payload={
                 "workflow_type": workflow_type,
                 "orchestration_mode": orchestration_mode,
-                "problem": problem[:200],
+                "problem": problem_preview,
             },
         ))
 
-        def resolve_event_kind(event_type: str) -> EventKind:
-            """Resolve orchestrator callback event types into public SSE event kinds."""
-            try:
-                return EventKind(event_type)
-            except ValueError:
-                pass
-
-            aliases = {
-                "agent.completed": EventKind.AGENT_COMPLETED_DOT,
-                "agent.started": EventKind.AGENT_STARTED_DOT,
-                "agent.streaming": EventKind.AGENT_STREAMING,
-                "agent.objective": EventKind.AGENT_OBJECTIVE,
-                "agent.progress": EventKind.AGENT_PROGRESS,
-                "tool.called": EventKind.TOOL_CALLED_DOT,
-                "tool.completed": EventKind.TOOL_COMPLETED_DOT,
-                "tool.failed": EventKind.TOOL_FAILED_DOT,
-                "workflow.started": EventKind.WORKFLOW_STATUS,
-                "workflow.output": EventKind.WORKFLOW_STATUS,
-                "workflow.failed": EventKind.RUN_FAILED,
-                "executor.invoked": EventKind.EXECUTOR_INVOKED,
-                "executor.completed": EventKind.EXECUTOR_COMPLETED,
-                "orchestrator.workflow_created": EventKind.WORKFLOW_STATUS,
-                "orchestrator.run_started": EventKind.RUN_STARTED,
-                "orchestrator.run_completed": EventKind.WORKFLOW_STATUS,
-                "orchestrator.run_failed": EventKind.RUN_FAILED,
-                "coordinator.scoring": EventKind.COORDINATOR_SCORING,
-                "coordinator.plan": EventKind.COORDINATOR_PLAN,
-                "recovery.option": EventKind.RECOVERY_OPTION,
-            }
-            if event_type in aliases:
-                return aliases[event_type]
-
-            if event_type in {"agent.failed", "executor.failed"}:
-                # Keep explicit handling of explicit failure channels aligned with known workflow contracts.
-                # Unknown suffix-matching failures should not be promoted to terminal run failure.
-                return EventKind.WORKFLOW_STATUS if event_type.startswith("workflow.") else EventKind.PROGRESS_UPDATE
-            if event_type.startswith("workflow."):
-                return EventKind.WORKFLOW_STATUS
-            return EventKind.PROGRESS_UPDATE
-
-        # Create event emitter callback
-        async def emit_event(event_type: str, payload: Any):
-            payload = _normalize_workflow_event_payload(payload)
-            event_kind = resolve_event_kind(event_type)
-            event_level = EventLevel.ERROR if event_kind == EventKind.RUN_FAILED else EventLevel.INFO
-            message = (
-                payload.get("message")
-                or payload.get("reasoning")
-                or payload.get("summary")
-                or payload.get("resultSummary")
-                or str(event_type)
-            )
-
-            otel_context = get_current_trace_context() or {}
-            trace_id = (
-                payload.get("trace_id")
-                or payload.get("traceId")
-                or otel_context.get("trace_id")
-            )
-            span_id = (
-                payload.get("span_id")
-                or payload.get("spanId")
-                or otel_context.get("span_id")
-            )
-            parent_span_id = (
-                payload.get("parent_span_id")
-                or payload.get("parentSpanId")
-                or otel_context.get("parent_span_id")
-            )
-
-            actor = payload.get("actor")
-            if not isinstance(actor, dict):
-                actor = {"kind": "orchestrator", "id": "orchestrator", "name": "Orchestrator"}
-
-            await event_bus.publish(WorkflowEvent(
-                run_id=run_id,
-                kind=event_kind,
-                level=event_level,
-                message=message,
-                stage_id=payload.get("stage_id"),
-                stage_name=payload.get("stage_name"),
-                agent_name=payload.get("agentName") or payload.get("agent_name"),
-                executor_name=payload.get("executor_name") or payload.get("executor_id"),
-                tool_name=payload.get("toolName") or payload.get("tool_name"),
-                actor=actor,
-                trace_id=trace_id,
-                span_id=span_id,
-                parent_span_id=parent_span_id,
-                payload={
-                    "event_type": event_type,
-                    "workflow_type": workflow_type,
-                    "orchestration_mode": orchestration_mode,
-                    **payload,
-                },
-            ))
-
         # Create and run orchestrator
+        publisher = RunEventPublisher(event_bus, run_id)
         orchestrator = OrchestratorEngine(
             run_id=run_id,
-            event_emitter=emit_event,
+            event_emitter=functools.partial(
+                _emit_event, publisher, run_id, workflow_type, orchestration_mode,
+            ),
             workflow_type=workflow_type,
             orchestration_mode=orchestration_mode,
             max_executor_invocations=max_executor_invocations,
@@ -743,6 +1001,8 @@ async def execute_workflow(
         )
 
         result = await orchestrator.run(problem)
+        # Orchestrator events must be in the stream before the terminal event.
+        await publisher.close()
 
         # Update run status
         await run_store.update_run_status(run_id, RunStatus.COMPLETED)
@@ -779,6 +1039,8 @@ async def execute_workflow(
         logger.error("workflow_execution_failed", run_id=run_id, error=str(e))
 
         try:
+            if publisher:
+                await publisher.close()
             if run_store:
                 await run_store.update_run_status(run_id, RunStatus.FAILED, error_message=str(e))
             if event_bus:
@@ -810,4 +1072,15 @@ if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", "5001"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    # uvloop/httptools ship with uvicorn[standard]; logging stays on the
+    # structlog configuration above.
+    uvicorn.run(
+        "main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        log_config=None,
+    )
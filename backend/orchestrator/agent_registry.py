@@ -3,11 +3,16 @@ Agent Registry — 20-agent pool with scenario-based selection.
 Each agent has icon, color, data_sources, and scenario mappings for the canvas UI.
 """
 
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Optional
-from pydantic import BaseModel
 
 
-class AgentDefinition(BaseModel):
+# Plain slotted dataclasses: these are in-process data carriers with no
+# validation or serialization needs, so pydantic's machinery is pure overhead.
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AgentDefinition:
     """Definition of an agent in the registry."""
     id: str
     name: str
@@ -18,27 +23,29 @@ class AgentDefinition(BaseModel):
     priority: int = 50
     icon: str = ""
     color: str = ""
-    data_sources: List[str] = []
-    scenarios: List[str] = []
-    outputs: List[str] = []
+    # Tuples: shared, immutable and hashable; the source literals are interned.
+    data_sources: tuple[str, ...] = ()
+    scenarios: tuple[str, ...] = ()
+    outputs: List[str] = field(default_factory=list)
     phase: int = 1  # implementation phase
 
 
-class AgentSelectionResult(BaseModel):
-    """Result of agent selection process."""
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AgentSelectionResult:
+    """Result of agent selection process. Use dataclasses.replace to derive a changed copy."""
     agent_id: str
     agent_name: str
     short_name: str
     category: str
     description: str = ""
-    outputs: List[str] = []
+    outputs: List[str] = field(default_factory=list)
     included: bool
     reason: str
-    conditions_evaluated: List[str]
+    conditions_evaluated: tuple[str, ...]
     priority: int
     icon: str = ""
     color: str = ""
-    data_sources: List[str] = []
+    data_sources: tuple[str, ...] = ()
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -50,56 +57,56 @@ AGENT_REGISTRY: List[AgentDefinition] = [
     AgentDefinition(
         id="situation_assessment", name="Situation Assessment", short_name="Situation",
         category="specialist", description="Maps disruption scope via GRAPH + SQL + KQL",
-        icon="Radar", color="#3b82f6", data_sources=["GRAPH", "SQL", "KQL"],
-        scenarios=["hub_disruption", "diversion", "crew_fatigue", "safety_incident"],
+        icon="Radar", color="#3b82f6", data_sources=("GRAPH", "SQL", "KQL"),
+        scenarios=("hub_disruption", "diversion", "crew_fatigue", "safety_incident"),
         outputs=["Disruption scope map with affected flights/gates/connections", "Quantified impact metrics"],
         priority=10, phase=1,
     ),
     AgentDefinition(
         id="fleet_recovery", name="Fleet Recovery", short_name="Fleet",
         category="specialist", description="Finds available tails, evaluates swaps via SQL + GRAPH",
-        icon="PlaneTakeoff", color="#22c55e", data_sources=["SQL", "GRAPH"],
-        scenarios=["hub_disruption", "predictive_maintenance"],
+        icon="PlaneTakeoff", color="#22c55e", data_sources=("SQL", "GRAPH"),
+        scenarios=("hub_disruption", "predictive_maintenance"),
         outputs=["Available tail list with MEL status", "Swap feasibility assessments"],
         priority=20, phase=1,
     ),
     AgentDefinition(
         id="crew_recovery", name="Crew Recovery", short_name="Crew",
         category="specialist", description="Crew availability and duty limit checks via SQL + AI Search",
-        icon="Users", color="#06b6d4", data_sources=["SQL", "VECTOR_REG"],
-        scenarios=["hub_disruption", "crew_fatigue"],
+        icon="Users", color="#06b6d4", data_sources=("SQL", "VECTOR_REG"),
+        scenarios=("hub_disruption", "crew_fatigue"),
         outputs=["Crew availability by base with remaining duty hours", "Proposed crew pairings"],
         priority=30, phase=1,
     ),
     AgentDefinition(
         id="network_impact", name="Network Impact", short_name="Network",
         category="specialist", description="Delay propagation modeling via Fabric SQL + GRAPH",
-        icon="Network", color="#8b5cf6", data_sources=["FABRIC_SQL", "GRAPH"],
-        scenarios=["hub_disruption", "predictive_maintenance", "delay_analysis"],
+        icon="Network", color="#8b5cf6", data_sources=("FABRIC_SQL", "GRAPH"),
+        scenarios=("hub_disruption", "predictive_maintenance", "delay_analysis"),
         outputs=["Delay propagation simulation", "Historical delay pattern comparison"],
         priority=40, phase=1,
     ),
     AgentDefinition(
         id="weather_safety", name="Weather & Safety", short_name="Weather",
         category="specialist", description="SIGMETs/PIREPs, NOTAMs, ASRS search via KQL + Cosmos + AI Search",
-        icon="CloudLightning", color="#f59e0b", data_sources=["KQL", "NOSQL", "VECTOR_OPS"],
-        scenarios=["hub_disruption", "diversion", "weather_brief", "safety_incident"],
+        icon="CloudLightning", color="#f59e0b", data_sources=("KQL", "NOSQL", "VECTOR_OPS"),
+        scenarios=("hub_disruption", "diversion", "weather_brief", "safety_incident"),
         outputs=["Weather threat assessment with severity levels", "ASRS precedent incidents"],
         priority=50, phase=1,
     ),
     AgentDefinition(
         id="passenger_impact", name="Passenger Impact", short_name="Passenger",
         category="specialist", description="Connection risks and rebooking load via SQL + GRAPH",
-        icon="UserCheck", color="#ec4899", data_sources=["SQL", "GRAPH"],
-        scenarios=["hub_disruption", "gate_reassignment", "turnaround"],
+        icon="UserCheck", color="#ec4899", data_sources=("SQL", "GRAPH"),
+        scenarios=("hub_disruption", "gate_reassignment", "turnaround"),
         outputs=["Connection risk assessment", "Passenger prioritization by severity"],
         priority=60, phase=1,
     ),
     AgentDefinition(
         id="recovery_coordinator", name="Recovery Coordinator", short_name="Coordinator",
         category="coordinator", description="Multi-objective scoring and recovery plan synthesis",
-        icon="Brain", color="#6366f1", data_sources=[],
-        scenarios=["hub_disruption"],
+        icon="Brain", color="#6366f1", data_sources=(),
+        scenarios=("hub_disruption",),
         outputs=["Ranked recovery options with multi-criteria scores", "Implementation timeline"],
         priority=100, phase=1,
     ),
@@ -108,56 +115,56 @@ AGENT_REGISTRY: List[AgentDefinition] = [
     AgentDefinition(
         id="maintenance_predictor", name="Maintenance Predictor", short_name="Maintenance",
         category="specialist", description="MEL trend analysis, similar incident search via SQL + AI Search",
-        icon="Wrench", color="#f97316", data_sources=["SQL", "VECTOR_OPS"],
-        scenarios=["predictive_maintenance"],
+        icon="Wrench", color="#f97316", data_sources=("SQL", "VECTOR_OPS"),
+        scenarios=("predictive_maintenance",),
         outputs=["MEL trend risk assessment", "Recommended inspections with precedent data"],
         priority=25, phase=1,
     ),
     AgentDefinition(
         id="crew_fatigue_assessor", name="Crew Fatigue Assessor", short_name="Fatigue",
         category="specialist", description="FAR 117 compliance, fatigue risk scoring via SQL + AI Search",
-        icon="Moon", color="#0ea5e9", data_sources=["SQL", "VECTOR_REG"],
-        scenarios=["crew_fatigue"],
+        icon="Moon", color="#0ea5e9", data_sources=("SQL", "VECTOR_REG"),
+        scenarios=("crew_fatigue",),
         outputs=["Fatigue risk scores per crew member", "FAR 117 compliance status"],
         priority=35, phase=1,
     ),
     AgentDefinition(
         id="diversion_advisor", name="Diversion Advisor", short_name="Diversion",
         category="specialist", description="Alternate airport evaluation via KQL + SQL + Cosmos",
-        icon="Navigation", color="#ef4444", data_sources=["KQL", "SQL", "NOSQL"],
-        scenarios=["diversion"],
+        icon="Navigation", color="#ef4444", data_sources=("KQL", "SQL", "NOSQL"),
+        scenarios=("diversion",),
         outputs=["Ranked alternate airports", "Recommended diversion with fuel/weather assessment"],
         priority=15, phase=1,
     ),
     AgentDefinition(
         id="regulatory_compliance", name="Regulatory Compliance", short_name="Regulatory",
         category="specialist", description="Safety gate — regulation search via AI Search",
-        icon="Shield", color="#64748b", data_sources=["VECTOR_REG", "VECTOR_OPS"],
-        scenarios=["predictive_maintenance", "crew_fatigue", "safety_incident"],
+        icon="Shield", color="#64748b", data_sources=("VECTOR_REG", "VECTOR_OPS"),
+        scenarios=("predictive_maintenance", "crew_fatigue", "safety_incident"),
         outputs=["Compliance status per action (PASS/CAUTION/FAIL)", "Applicable regulation citations"],
         priority=90, phase=1,
     ),
     AgentDefinition(
         id="route_planner", name="Route Planner", short_name="Route",
         category="specialist", description="Route alternatives via GRAPH + SQL + KQL",
-        icon="Route", color="#2dd4bf", data_sources=["GRAPH", "SQL", "KQL"],
-        scenarios=["diversion", "fuel_optimization", "atc_flow"],
+        icon="Route", color="#2dd4bf", data_sources=("GRAPH", "SQL", "KQL"),
+        scenarios=("diversion", "fuel_optimization", "atc_flow"),
         outputs=["Ranked route alternatives", "Connection details and seat availability"],
         priority=45, phase=1,
     ),
     AgentDefinition(
         id="real_time_monitor", name="Real-Time Monitor", short_name="Monitor",
         category="specialist", description="Live ADS-B positions + active NOTAMs via KQL + Cosmos",
-        icon="Satellite", color="#fb923c", data_sources=["KQL", "NOSQL"],
-        scenarios=["diversion", "atc_flow"],
+        icon="Satellite", color="#fb923c", data_sources=("KQL", "NOSQL"),
+        scenarios=("diversion", "atc_flow"),
         outputs=["Current aircraft positions", "Real-time operational status snapshot"],
         priority=55, phase=1,
     ),
     AgentDefinition(
         id="decision_coordinator", name="Decision Coordinator", short_name="Decision",
         category="coordinator", description="General decision synthesis for non-hub scenarios",
-        icon="Cpu", color="#818cf8", data_sources=[],
-        scenarios=["predictive_maintenance", "diversion", "crew_fatigue", "safety_incident"],
+        icon="Cpu", color="#818cf8", data_sources=(),
+        scenarios=("predictive_maintenance", "diversion", "crew_fatigue", "safety_incident"),
         outputs=["Ranked decision options with scores", "Recommended course of action"],
         priority=100, phase=1,
     ),
@@ -166,53 +173,69 @@ AGENT_REGISTRY: List[AgentDefinition] = [
     AgentDefinition(
         id="fuel_optimizer", name="Fuel Optimizer", short_name="Fuel",
         category="placeholder", description="Fuel optimization analysis (placeholder)",
-        icon="Fuel", color="#14b8a6", data_sources=["KQL", "SQL", "FABRIC_SQL"],
-        scenarios=["fuel_optimization"],
+        icon="Fuel", color="#14b8a6", data_sources=("KQL", "SQL", "FABRIC_SQL"),
+        scenarios=("fuel_optimization",),
         outputs=["Fuel burn optimization recommendations"],
         priority=65, phase=2,
     ),
     AgentDefinition(
         id="gate_optimizer", name="Gate Optimizer", short_name="Gate",
         category="placeholder", description="Gate/stand reassignment optimization (placeholder)",
-        icon="DoorOpen", color="#a855f7", data_sources=["SQL", "GRAPH"],
-        scenarios=["gate_reassignment"],
+        icon="DoorOpen", color="#a855f7", data_sources=("SQL", "GRAPH"),
+        scenarios=("gate_reassignment",),
         outputs=["Gate reassignment plan"],
         priority=66, phase=2,
     ),
     AgentDefinition(
         id="atc_flow_advisor", name="ATC Flow Advisor", short_name="ATC",
         category="placeholder", description="ATC flow management advisory (placeholder)",
-        icon="Radio", color="#84cc16", data_sources=["KQL", "FABRIC_SQL"],
-        scenarios=["atc_flow"],
+        icon="Radio", color="#84cc16", data_sources=("KQL", "FABRIC_SQL"),
+        scenarios=("atc_flow",),
         outputs=["ATC flow management recommendations"],
         priority=67, phase=2,
     ),
     AgentDefinition(
         id="historical_analyst", name="Historical Analyst", short_name="Historical",
         category="placeholder", description="BTS historical delay analysis (placeholder)",
-        icon="History", color="#d946ef", data_sources=["FABRIC_SQL", "VECTOR_OPS"],
-        scenarios=["delay_analysis"],
+        icon="History", color="#d946ef", data_sources=("FABRIC_SQL", "VECTOR_OPS"),
+        scenarios=("delay_analysis",),
         outputs=["Historical delay pattern analysis"],
         priority=68, phase=2,
     ),
     AgentDefinition(
         id="airport_ops_advisor", name="Airport Ops Advisor", short_name="Airport",
         category="placeholder", description="Airport operations advisory (placeholder)",
-        icon="Building", color="#78716c", data_sources=["SQL", "VECTOR_AIRPORT"],
-        scenarios=["turnaround", "gate_reassignment"],
+        icon="Building", color="#78716c", data_sources=("SQL", "VECTOR_AIRPORT"),
+        scenarios=("turnaround", "gate_reassignment"),
         outputs=["Airport operations advisory report"],
         priority=69, phase=2,
     ),
     AgentDefinition(
         id="cost_analyst", name="Cost Analyst", short_name="Cost",
         category="placeholder", description="Cost impact analysis (placeholder)",
-        icon="DollarSign", color="#fbbf24", data_sources=["FABRIC_SQL", "SQL"],
-        scenarios=["turnaround", "fuel_optimization"],
+        icon="DollarSign", color="#fbbf24", data_sources=("FABRIC_SQL", "SQL"),
+        scenarios=("turnaround", "fuel_optimization"),
         outputs=["Cost impact analysis report"],
         priority=70, phase=2,
     ),
 ]
 
+# Column (struct-of-arrays) view of the registry for the selection build loop,
+# which zips the columns instead of reading attributes off each definition.
+_IDS = tuple(agent.id for agent in AGENT_REGISTRY)
+_NAMES = tuple(agent.name for agent in AGENT_REGISTRY)
+_SHORT_NAMES = tuple(agent.short_name for agent in AGENT_REGISTRY)
+_CATEGORIES = tuple(agent.category for agent in AGENT_REGISTRY)
+_DESCRIPTIONS = tuple(agent.description for agent in AGENT_REGISTRY)
+_OUTPUTS = tuple(agent.outputs for agent in AGENT_REGISTRY)
+_PRIORITIES = tuple(agent.priority for agent in AGENT_REGISTRY)
+_ICONS = tuple(agent.icon for agent in AGENT_REGISTRY)
+_COLORS = tuple(agent.color for agent in AGENT_REGISTRY)
+_DATA_SOURCES = tuple(agent.data_sources for agent in AGENT_REGISTRY)
+# Registry indices in priority order (stable argsort), so a selection build
+# reads included agents off in order instead of sorting them.
+_PRIORITY_ORDER = tuple(sorted(range(len(AGENT_REGISTRY)), key=_PRIORITIES.__getitem__))
+
 
 # ═══════════════════════════════════════════════════════════════════
 # SCENARIO → AGENT MAPPING
@@ -240,6 +263,11 @@ SCENARIO_AGENTS = {
     },
 }
 
+_ACTIVE_IDS_BY_SCENARIO: Dict[str, frozenset[str]] = {
+    scenario: frozenset(config["agents"]) | {config["coordinator"]}
+    for scenario, config in SCENARIO_AGENTS.items()
+}
+
 SCENARIO_DESCRIPTIONS = {
     "hub_disruption": "Hub Disruption Recovery",
     "predictive_maintenance": "Predictive Maintenance Analysis",
@@ -269,17 +297,44 @@ SCENARIO_KEYWORDS = {
 }
 
 
+def _compile_scenario_scorer():
+    """Generate a straight-line scorer specialized to SCENARIO_KEYWORDS.
+
+    Each scenario's score is a sum of ``kw in text`` tests with no loops or
+    container lookups; strict ``>`` comparisons in SCENARIO_KEYWORDS order
+    give ties to the scenario listed first, and no hits keep the default.
+    """
+    lines = ["def _score_scenarios(problem_lower):"]
+    for index, keywords in enumerate(SCENARIO_KEYWORDS.values()):
+        terms = " + ".join(f"({kw!r} in problem_lower)" for kw in keywords)
+        lines.append(f"    s{index} = {terms or '0'}")
+    lines.append("    best = 0")
+    lines.append("    result = 'hub_disruption'")
+    for index, scenario in enumerate(SCENARIO_KEYWORDS):
+        lines.append(f"    if s{index} > best:")
+        lines.append(f"        best = s{index}")
+        lines.append(f"        result = {scenario!r}")
+    lines.append("    return result")
+    namespace: Dict[str, object] = {}
+    exec(compile("\n".join(lines), "<scenario_scorer>", "exec"), namespace)
+    return namespace["_score_scenarios"]
+
+
+_score_scenarios = _compile_scenario_scorer()
+_MIN_KEYWORD_LEN = min(len(kw) for keywords in SCENARIO_KEYWORDS.values() for kw in keywords)
+
+
 def detect_scenario(problem: str) -> str:
     """Detect which scenario a problem maps to based on keywords."""
-    problem_lower = problem.lower()
-    scores: Dict[str, int] = {}
-    for scenario, keywords in SCENARIO_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in problem_lower)
-        if score > 0:
-            scores[scenario] = score
-    if scores:
-        return max(scores, key=lambda k: scores[k])
-    return "hub_disruption"  # default
+    return _detect_scenario_normalized(problem.lower().strip())
+
+
+# Pure function of the text; retries and re-submits hit the cache.
+@lru_cache(maxsize=1024)
+def _detect_scenario_normalized(problem_lower: str) -> str:
+    if len(problem_lower) < _MIN_KEYWORD_LEN:
+        return "hub_disruption"  # too short to contain any keyword
+    return _score_scenarios(problem_lower)
 
 
 def get_agent_registry() -> List[AgentDefinition]:
@@ -287,47 +342,70 @@ def get_agent_registry() -> List[AgentDefinition]:
 
 
 def get_agent_by_id(agent_id: str) -> Optional[AgentDefinition]:
-    for agent in AGENT_REGISTRY:
-        if agent.id == agent_id:
-            return agent
-    return None
+    return _AGENT_BY_ID.get(agent_id)
+
+
+def _build_selection(
+    scenario: str,
+) -> tuple[tuple[AgentSelectionResult, ...], tuple[AgentSelectionResult, ...]]:
+    active_ids = _ACTIVE_IDS_BY_SCENARIO.get(scenario) or _ACTIVE_IDS_BY_SCENARIO["hub_disruption"]
+
+    # One interned reason pair and conditions tuple shared by every result.
+    reason_included = sys.intern(f"Required for {scenario} scenario")
+    reason_excluded = sys.intern(f"Not needed for {scenario}")
+    conditions_evaluated = (scenario, "keyword_match")
+
+    results: List[AgentSelectionResult] = []
+    for agent_id, name, short_name, category, description, outputs, priority, icon, color, data_sources in zip(
+        _IDS, _NAMES, _SHORT_NAMES, _CATEGORIES, _DESCRIPTIONS,
+        _OUTPUTS, _PRIORITIES, _ICONS, _COLORS, _DATA_SOURCES,
+    ):
+        is_included = agent_id in active_ids
+        results.append(AgentSelectionResult(
+            agent_id=agent_id,
+            agent_name=name,
+            short_name=short_name,
+            category=category,
+            description=description,
+            outputs=outputs,
+            included=is_included,
+            reason=reason_included if is_included else reason_excluded,
+            conditions_evaluated=conditions_evaluated,
+            priority=priority,
+            icon=icon,
+            color=color,
+            data_sources=data_sources,
+        ))
+
+    included = tuple(results[i] for i in _PRIORITY_ORDER if results[i].included)
+    excluded = tuple(result for result in results if not result.included)
+    return included, excluded
 
 
 def select_agents_for_problem(
     problem: str = "",
+    scenario: Optional[str] = None,
+    include_excluded: bool = True,
 ) -> tuple[List[AgentSelectionResult], List[AgentSelectionResult]]:
     """
     Select agents for a problem. Returns (included, excluded) with full metadata.
     All 20 agents are returned — the coordinator's LLM makes final handoff decisions.
+    Pass ``scenario`` when the caller already ran detect_scenario(), and
+    ``include_excluded=False`` when only the included agents are needed.
+
+    Results for known scenarios are shared across calls: treat them as
+    read-only (use dataclasses.replace to change a profile).
     """
-    scenario = detect_scenario(problem)
-    scenario_config = SCENARIO_AGENTS.get(scenario, SCENARIO_AGENTS["hub_disruption"])
-    active_ids = set(scenario_config["agents"] + [scenario_config["coordinator"]])
-
-    included: List[AgentSelectionResult] = []
-    excluded: List[AgentSelectionResult] = []
-
-    for agent in AGENT_REGISTRY:
-        is_included = agent.id in active_ids
-        result = AgentSelectionResult(
-            agent_id=agent.id,
-            agent_name=agent.name,
-            short_name=agent.short_name,
-            category=agent.category,
-            description=agent.description,
-            outputs=agent.outputs,
-            included=is_included,
-            reason=f"Required for {scenario} scenario" if is_included else f"Not needed for {scenario}",
-            conditions_evaluated=[scenario, "keyword_match"],
-            priority=agent.priority,
-            icon=agent.icon,
-            color=agent.color,
-            data_sources=agent.data_sources,
-        )
-        if is_included:
-            included.append(result)
-        else:
-            excluded.append(result)
-
-    included.sort(key=lambda x: x.priority)
-    return included, excluded
+    if scenario is None:
+        scenario = detect_scenario(problem)
+    partition = _PARTITION_BY_SCENARIO.get(scenario)
+    included, excluded = partition if partition is not None else _build_selection(scenario)
+    return list(included), list(excluded) if include_excluded else []
+
+
+# Registry and scenario mappings are immutable, so index them once at import.
+_AGENT_BY_ID: Dict[str, AgentDefinition] = {agent.id: agent for agent in AGENT_REGISTRY}
+# Included agents are sorted by priority once here, not per request.
+_PARTITION_BY_SCENARIO: Dict[str, tuple[tuple[AgentSelectionResult, ...], tuple[AgentSelectionResult, ...]]] = {
+    scenario: _build_selection(scenario) for scenario in SCENARIO_AGENTS
+}
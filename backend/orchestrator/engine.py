@@ -9,18 +9,24 @@ Supports:
 
 import asyncio
 import ast
+import copy
+import dataclasses
+import functools
 import json
+import logging
 import os
+import random
 import re
-import uuid
+import time
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from types import SimpleNamespace
+from types import MappingProxyType, SimpleNamespace
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import orjson
 from openai import APIStatusError, RateLimitError, AuthenticationError
 
-from agents.client import clear_client_cache
+from agents.client import cached_clients_fresh, clear_client_cache, warm_chat_clients
 from agent_framework import (
     Workflow,
     WorkflowEvent,
@@ -53,15 +59,19 @@ from data_sources.azure_client import get_shared_async_client
 from data_sources.shared_utils import OPENAI_API_VERSION, supports_explicit_temperature
 
 logger = structlog.get_logger()
+# The stdlib logger structlog.stdlib.LoggerFactory binds for this module.
+_stdlib_logger = logging.getLogger(__name__)
 
 _tracer = get_tracer("orchestrator")
-DEFAULT_RECOVERY_CRITERIA = [
+DEFAULT_RECOVERY_CRITERIA = (
     "delay_reduction",
     "crew_margin",
     "safety_score",
     "cost_impact",
     "passenger_impact",
-]
+)
+# Template for heuristic options' unscored criteria; copy before use.
+_EMPTY_CRITERIA_SCORES = dict.fromkeys(DEFAULT_RECOVERY_CRITERIA, 0.0)
 
 
 class _LoopCappedSignal(Exception):
@@ -83,9 +93,88 @@ SPECIALIST_FINDINGS_REQUIRED_KEYS = {
     "confidence",
 }
 
+# Run progress weights; execute_workflow scales with agent completion.
+_EXECUTE_PHASE = "execute_workflow"
+_EXECUTE_PHASE_WEIGHT = 0.56
+_BASE_PHASE_WEIGHTS = {
+    "select_agents": 0.10,
+    "activate_agents": 0.12,
+    "create_workflow": 0.12,
+    "synthesize_output": 0.10,
+}
+# Default executor invocation cap per (workflow_type, orchestration_mode), as
+# (floor, invocations per selected agent).
+_EXECUTOR_INVOCATION_LIMITS = {
+    # One pass through all specialists + coordinator synthesis
+    (WorkflowType.HANDOFF, OrchestrationMode.DETERMINISTIC): (20, 2),
+    # Coordinator may cycle through specialists multiple times
+    (WorkflowType.HANDOFF, OrchestrationMode.LLM_DIRECTED): (40, 5),
+}
+_DEFAULT_EXECUTOR_INVOCATION_LIMIT = (30, 4)
+_MISSING = object()
+_JSON_DECODER = json.JSONDecoder()
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.IGNORECASE | re.DOTALL)
+# Text parsing patterns used on coordinator/specialist output.
+_LIST_MARKER_RE = re.compile(r"^\s*[-*•\d\.\)]\s*")
+_FINAL_ANSWER_RES = (
+    re.compile(r"(?ims)^final\s*answer\s*[:\-]\s*(.+?)(?:\n\s*\n|```|$)"),
+    re.compile(r"(?ims)^answer\s*[:\-]\s*(.+?)(?:\n\s*\n|```|$)"),
+    re.compile(r"(?ims)^recommendation\s*[:\-]\s*(.+?)(?:\n\s*\n|```|$)"),
+)
+_RECOMMEND_RE = re.compile(r"(?im)^(?:recommend(?:ation)?|selected option)\s*[:\-]\s*(.+)$")
+# One artifact line: "Option N: ..." | "N) ..." | "T+X: ...", tried in that order.
+_ARTIFACT_LINE_RE = re.compile(
+    r"(?i)^(?:option\s*(\d+)\s*[:\-)\.]\s*(.+)"
+    r"|(\d+)[\).:\-]\s*(.+)"
+    r"|(?:[-*]\s*)?(T\+\S+)\s*[:\-]\s*(.+))$"
+)
+_OPT_ID_RE = re.compile(r"(?i)(opt[-_ ]?\d+)")
+_SUMMARY_RE = re.compile(r"(?im)^summary\s*[:\-]\s*(.+)$")
+_SEGMENT_SPLIT_RE = re.compile(r"\n\n+|\n\s*[-*]\s|\n\s*\d+[.)]\s")
+_LABEL_PREFIX_RE = re.compile(r"^\s*([A-Z0-9_]{3,})\s*:\s*")
+
+PLANNER_SYSTEM_PROMPT = (
+    "You are an orchestration planner. Choose the best subset of agents and execution order for the query. "
+    "Return strict JSON only with keys: selectedAgentIds, excludedAgentIds, executionOrder, "
+    "coordinatorAgentId, confidence, reasoning, agentReasons. "
+    "Rules: include exactly one coordinator agent and put coordinator last in executionOrder. "
+    "IMPORTANT: Only select agents from the provided candidateAgents list. "
+    "These have been pre-filtered for the detected scenario."
+)
+
+
+# Parsed planner results keyed by (normalized problem, scenario, candidates,
+# default coordinator); identical queries skip the planner round-trip.
+_PLAN_CACHE: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+_PLAN_CACHE_MAX = 512
+
+
+@functools.lru_cache(maxsize=64)
+def _planner_catalog_message(candidates: Tuple[tuple, ...], default_coordinator_id: Optional[str]) -> str:
+    """Serialize the planner's candidate catalog once per distinct candidate set.
+
+    Reusing the identical string keeps the prompt prefix byte-stable across
+    runs, so provider-side prompt caching can apply to it.
+    """
+    candidate_payload = [
+        {
+            "agentId": agent_id,
+            "agentName": agent_name,
+            "category": category,
+            "priority": priority,
+            "dataSources": data_sources,
+            "defaultIncluded": included,
+            "defaultReason": reason,
+        }
+        for agent_id, agent_name, category, priority, data_sources, included, reason in candidates
+    ]
+    return orjson.dumps(
+        {"candidateAgents": candidate_payload, "defaultCoordinatorId": default_coordinator_id},
+    ).decode()
+
 
 class OrchestratorDecision(BaseModel):
-    decision_id: str = Field(default_factory=lambda: f"dec-{uuid.uuid4().hex[:8]}")
+    decision_id: str = Field(default_factory=lambda: f"dec-{os.urandom(4).hex()}")
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     decision_type: str
     reasoning: str
@@ -129,11 +218,16 @@ class OrchestratorEngine:
         self.scenario: str = "hub_disruption"
         self._agent_lookup: Dict[str, AgentSelectionResult] = {}
         self._active_query_contexts: Dict[str, Dict[str, Any]] = {}
+        # The run span is always recorded; per-phase child spans are kept for
+        # a TRACE_PHASE_SAMPLE_RATE fraction of runs.
+        self._phase_tracer = _tracer if random.random() < float(os.getenv("TRACE_PHASE_SAMPLE_RATE", "1.0")) else None
         self._data_source_trace_mode = os.getenv("DATA_SOURCE_TRACE_MODE", "actual").strip().lower() or "actual"
         self._last_executor_id: Optional[str] = None
         self._run_started_at = datetime.now(timezone.utc)
         self._current_step = "initializing"
         self._completed_phases: set[str] = set()
+        self._completed_phase_weight = 0.0
+        self._last_progress_payload: Optional[Dict[str, Any]] = None
         self._agent_started_at: Dict[str, datetime] = {}
         self._agent_progress_pct: Dict[str, float] = {}
         self._active_agent_ids: set[str] = set()
@@ -143,11 +237,16 @@ class OrchestratorEngine:
         self._agent_invocation_counts: Dict[str, int] = {}
         self._invocation_should_respond: Dict[str, bool] = {}
         self._agent_execution_counts: Dict[str, int] = {}
+        # Specialists not yet really invoked; seeded from selected_agents on the
+        # first real invocation so the loop guard's "all heard" check is O(1).
+        self._specialist_ids_remaining: Optional[set[str]] = None
         self._executor_invocations_total: int = 0
         self._max_executor_invocations_override = max_executor_invocations
         self._max_executor_invocations_effective: int = 0
         self._loop_guard_reason: Optional[str] = None
-        self._autonomous_turn_limits = autonomous_turn_limits or {}
+        # Read-only snapshot: the caller's dict can't change limits mid-run, and
+        # workflow rebuilds see the same values as the first build.
+        self._autonomous_turn_limits = MappingProxyType(dict(autonomous_turn_limits or {}))
         self._deterministic_execution_timeout_seconds = int(
             os.getenv("DETERMINISTIC_EXECUTION_TIMEOUT_SECONDS", "600")
         )
@@ -292,7 +391,7 @@ class OrchestratorEngine:
         return self._invocation_should_respond.get(guard_key, True) is False
 
     def _is_orchestration_noise_text(self, text: str) -> bool:
-        normalized = re.sub(r"\s+", " ", str(text or "")).strip().lower()
+        normalized = " ".join(str(text or "").split()).lower()
         if not normalized:
             return True
         if normalized.startswith("## aviation problem analysis task"):
@@ -347,7 +446,7 @@ class OrchestratorEngine:
             return payload
         if payload is None:
             return {}
-        payload_preview = re.sub(r"\s+", " ", str(payload)).strip()[:300]
+        payload_preview = " ".join(str(payload).split())[:300]
         return {
             "message": payload_preview,
             "raw_payload_preview": payload_preview,
@@ -355,23 +454,27 @@ class OrchestratorEngine:
         }
 
     async def emit_event(self, event_type: str, payload: Any):
-        if self.event_emitter:
-            payload_dict = self._normalize_event_payload(payload)
-            actor = payload_dict.get("actor")
-            if not isinstance(actor, dict):
-                agent_id = payload_dict.get("agentId") or payload_dict.get("agent_id") or payload_dict.get("executor_id")
-                agent_name = payload_dict.get("agentName") or payload_dict.get("agent_name") or payload_dict.get("executor_name")
-                if agent_id:
-                    actor = {"kind": "agent", "id": agent_id, "name": agent_name or agent_id}
-                else:
-                    actor = {"kind": "orchestrator", "id": "orchestrator", "name": "Orchestrator"}
-            full_payload = {
-                "run_id": self.run_id,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "actor": actor,
-                **payload_dict,
-            }
-            await self.event_emitter(event_type=event_type, payload=full_payload)
+        if not self.event_emitter:
+            return
+        payload_dict = self._normalize_event_payload(payload)
+        actor = payload_dict.get("actor")
+        if not isinstance(actor, dict):
+            agent_id = payload_dict.get("agentId") or payload_dict.get("agent_id") or payload_dict.get("executor_id")
+            agent_name = payload_dict.get("agentName") or payload_dict.get("agent_name") or payload_dict.get("executor_name")
+            if agent_id:
+                actor = {"kind": "agent", "id": agent_id, "name": agent_name or agent_id}
+            else:
+                actor = {"kind": "orchestrator", "id": "orchestrator", "name": "Orchestrator"}
+        # Workflow-event handlers stamp their payloads already; the payload's
+        # value would override this one, so only read the clock when missing.
+        timestamp = payload_dict.get("timestamp") or datetime.now(timezone.utc).isoformat()
+        full_payload = {
+            "run_id": self.run_id,
+            "timestamp": timestamp,
+            "actor": actor,
+            **payload_dict,
+        }
+        await self.event_emitter(event_type=event_type, payload=full_payload)
 
     def _record_decision(self, decision_type: str, reasoning: str, confidence: float = 0.9, action: Dict[str, Any] = None) -> OrchestratorDecision:
         self._decision_counter += 1
@@ -380,7 +483,10 @@ class OrchestratorEngine:
             confidence=confidence, action=action or {},
         )
         self.decisions.append(decision)
-        logger.info("orchestrator_decision", decision_id=decision.decision_id, decision_type=decision_type, reasoning=reasoning[:100])
+        # Same level check structlog's filter_by_level applies, done up front
+        # so a disabled level skips building the event dict and slice.
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info("orchestrator_decision", decision_id=decision.decision_id, decision_type=decision_type, reasoning=reasoning[:100])
         return decision
 
     def _progress_payload(self, current_step: str) -> Dict[str, Any]:
@@ -390,24 +496,11 @@ class OrchestratorEngine:
             if agent_total > 0
             else 0.0
         )
-        phase_weights = {
-            "select_agents": 0.10,
-            "activate_agents": 0.12,
-            "create_workflow": 0.12,
-            "execute_workflow": 0.56,
-            "synthesize_output": 0.10,
-        }
-
-        base_without_execute = 0.0
-        for phase, weight in phase_weights.items():
-            if phase == "execute_workflow":
-                continue
-            if phase in self._completed_phases:
-                base_without_execute += weight
-        if "execute_workflow" in self._completed_phases:
-            execute_component = phase_weights["execute_workflow"]
+        base_without_execute = self._completed_phase_weight
+        if _EXECUTE_PHASE in self._completed_phases:
+            execute_component = _EXECUTE_PHASE_WEIGHT
         else:
-            execute_component = phase_weights["execute_workflow"] * completion_ratio
+            execute_component = _EXECUTE_PHASE_WEIGHT * completion_ratio
 
         run_progress_pct = round(min(base_without_execute + execute_component, 1.0) * 100, 2)
 
@@ -426,12 +519,23 @@ class OrchestratorEngine:
 
     async def _emit_progress(self, current_step: str):
         self._current_step = current_step
-        await self.emit_event(
-            "progress_update",
-            self._progress_payload(current_step=current_step),
-        )
+        if not self.event_emitter:
+            return
+        payload = self._progress_payload(current_step=current_step)
+        previous = self._last_progress_payload
+        self._last_progress_payload = payload
+        if previous is not None:
+            # Send only what changed since the last progress_update; clients
+            # keep prior values for omitted keys. currentStep is always sent.
+            payload = {
+                key: value for key, value in payload.items()
+                if key == "currentStep" or previous.get(key, _MISSING) != value
+            }
+        await self.emit_event("progress_update", payload)
 
     async def _emit_stage_started(self, stage_id: str, stage_name: str):
+        if not self.event_emitter:
+            return
         await self.emit_event(
             "stage_started",
             {
@@ -441,9 +545,19 @@ class OrchestratorEngine:
             },
         )
 
-    async def _emit_stage_completed(self, stage_id: str, stage_name: str, started_at: datetime):
-        duration_ms = int((datetime.now(timezone.utc) - started_at).total_seconds() * 1000)
-        self._completed_phases.add(stage_id)
+    def _mark_phase_completed(self, phase: str) -> None:
+        # Keep the completed base-phase weight as a running sum so progress
+        # payloads don't rescan the phase table on every event.
+        if phase not in self._completed_phases:
+            self._completed_phases.add(phase)
+            self._completed_phase_weight += _BASE_PHASE_WEIGHTS.get(phase, 0.0)
+
+    async def _emit_stage_completed(self, stage_id: str, stage_name: str, started_at: float):
+        """Emit stage_completed; ``started_at`` is a ``time.monotonic()`` reading."""
+        self._mark_phase_completed(stage_id)
+        if not self.event_emitter:
+            return
+        duration_ms = int((time.monotonic() - started_at) * 1000)
         await self.emit_event(
             "stage_completed",
             {
@@ -491,25 +605,31 @@ class OrchestratorEngine:
 
         try:
             # Phase 1: Detect scenario and select agents
-            select_started_at = datetime.now(timezone.utc)
+            select_started_at = time.monotonic()
             await self._emit_stage_started("select_agents", "Select Agents")
-            with traced_span(_tracer, "orchestrator.select_agents"):
+            # Workflow construction only blocks when chat clients must be created
+            # (credential probing), so warm them while the planner runs.
+            client_warmup = None
+            if not cached_clients_fresh("agent", "orchestrator"):
+                client_warmup = asyncio.create_task(asyncio.to_thread(warm_chat_clients))
+            with traced_span(self._phase_tracer, "orchestrator.select_agents"):
                 self.scenario = detect_scenario(problem)
                 await self._select_agents(problem)
             await self._emit_stage_completed("select_agents", "Select Agents", select_started_at)
 
             # Phase 2: Emit activation events for canvas
-            activate_started_at = datetime.now(timezone.utc)
+            activate_started_at = time.monotonic()
             await self._emit_stage_started("activate_agents", "Activate Agents")
             await self._emit_agent_activations()
             await self._emit_stage_completed("activate_agents", "Activate Agents", activate_started_at)
 
             # Phase 3: Create workflow
-            workflow_create_started_at = datetime.now(timezone.utc)
+            workflow_create_started_at = time.monotonic()
             await self._emit_stage_started("create_workflow", "Create Workflow")
-            with traced_span(_tracer, "orchestrator.create_workflow"):
-                self.workflow = await asyncio.to_thread(
-                    create_workflow,
+            if client_warmup is not None:
+                await client_warmup
+            with traced_span(self._phase_tracer, "orchestrator.create_workflow"):
+                workflow_kwargs = dict(
                     workflow_type=self.workflow_type,
                     name=f"{self.workflow_type}_{self.run_id}",
                     problem=problem,
@@ -518,6 +638,12 @@ class OrchestratorEngine:
                     autonomous_turn_limits=self._autonomous_turn_limits,
                     orchestration_mode=self.orchestration_mode,
                 )
+                # Graph construction is cheap; only a cold client cache can block
+                # (credential probing), so skip the thread hop when it's warm.
+                if cached_clients_fresh("agent", "orchestrator"):
+                    self.workflow = create_workflow(**workflow_kwargs)
+                else:
+                    self.workflow = await asyncio.to_thread(create_workflow, **workflow_kwargs)
                 await self.emit_event("orchestrator.workflow_created", {
                     "workflow_type": self.workflow_type,
                     "orchestration_mode": self.orchestration_mode,
@@ -526,29 +652,23 @@ class OrchestratorEngine:
             await self._emit_stage_completed("create_workflow", "Create Workflow", workflow_create_started_at)
 
             # Phase 4: Execute
-            execute_started_at = datetime.now(timezone.utc)
+            execute_started_at = time.monotonic()
             await self._emit_stage_started("execute_workflow", "Execute Workflow")
-            n_agents = len(self.selected_agents)
-            if self._is_deterministic_mode():
-                # One pass through all specialists + coordinator synthesis
-                default_limit = max(20, n_agents * 2)
-            elif self._is_llm_directed_mode():
-                # Coordinator may cycle through specialists multiple times
-                default_limit = max(40, n_agents * 5)
-            else:
-                default_limit = max(30, n_agents * 4)
             if self._max_executor_invocations_override is not None:
                 self._max_executor_invocations_effective = max(1, int(self._max_executor_invocations_override))
             else:
-                self._max_executor_invocations_effective = default_limit
+                floor, per_agent = _EXECUTOR_INVOCATION_LIMITS.get(
+                    (self.workflow_type, self.orchestration_mode), _DEFAULT_EXECUTOR_INVOCATION_LIMIT
+                )
+                self._max_executor_invocations_effective = max(floor, len(self.selected_agents) * per_agent)
             input_message = self._build_workflow_input(problem)
-            with traced_span(_tracer, "workflow.execute"):
+            with traced_span(self._phase_tracer, "workflow.execute"):
                 result = await self._execute_workflow_with_events(input_message)
-            self._completed_phases.add("execute_workflow")
+            self._mark_phase_completed("execute_workflow")
             await self._emit_stage_completed("execute_workflow", "Execute Workflow", execute_started_at)
 
             # Phase 5: Record completion
-            synth_started_at = datetime.now(timezone.utc)
+            synth_started_at = time.monotonic()
             await self._emit_stage_started("synthesize_output", "Synthesize Output")
             self._record_decision(
                 decision_type="commit", reasoning="All agents completed, solution validated", confidence=0.98,
@@ -585,7 +705,7 @@ class OrchestratorEngine:
             raise
 
     async def _select_agents(self, problem: str):
-        self.selected_agents, self.excluded_agents = select_agents_for_problem(problem)
+        self.selected_agents, self.excluded_agents = select_agents_for_problem(problem, scenario=self.scenario)
         scenario_config = SCENARIO_AGENTS.get(self.scenario, SCENARIO_AGENTS["hub_disruption"])
         self._coordinator_agent_id = scenario_config.get("coordinator")
 
@@ -618,12 +738,15 @@ class OrchestratorEngine:
                 excluded_agents=self.excluded_agents,
             )
 
-        for agent in self.selected_agents:
-            if self.trace_emitter:
-                await self.trace_emitter.emit_include_agent(
+        if self.trace_emitter:
+            await asyncio.gather(*(
+                self.trace_emitter.emit_include_agent(
                     agent_id=agent.agent_id, agent_name=agent.agent_name,
                     reason=agent.reason, inputs=agent.conditions_evaluated,
                 )
+                for agent in self.selected_agents
+            ))
+        for agent in self.selected_agents:
             self._record_decision(
                 decision_type="include_agent", reasoning=agent.reason,
                 action={"agent_id": agent.agent_id, "agent_name": agent.agent_name},
@@ -660,48 +783,43 @@ class OrchestratorEngine:
             confidence_value = 0.8
 
         selectable_ids = {profile.agent_id for profile in selectable_profiles}
-        selected_ids = [
+        # Dicts as ordered sets: dedupe while keeping the planner's ordering.
+        selected_ids = dict.fromkeys(
             agent_id for agent_id in selected_ids_raw
             if isinstance(agent_id, str) and agent_id in selectable_ids
-        ]
-        execution_order = [
-            agent_id for agent_id in execution_order_raw
-            if isinstance(agent_id, str) and agent_id in selectable_ids
-        ]
+        )
         excluded_ids = {
             agent_id for agent_id in excluded_ids_raw
             if isinstance(agent_id, str) and agent_id in selectable_ids
         }
 
         if not selected_ids:
-            selected_ids = [agent.agent_id for agent in self.selected_agents if agent.agent_id in selectable_ids]
+            selected_ids = dict.fromkeys(
+                agent.agent_id for agent in self.selected_agents if agent.agent_id in selectable_ids
+            )
         if not selected_ids:
-            selected_ids = list(selectable_ids)
+            selected_ids = dict.fromkeys(selectable_ids)
 
         coordinator_id = str(llm_plan.get("coordinatorAgentId") or "").strip()
         coordinator_def = get_agent_by_id(coordinator_id) if coordinator_id else None
         if not coordinator_def or coordinator_def.category != "coordinator":
             coordinator_id = default_coordinator_id or ""
         if coordinator_id and coordinator_id not in selected_ids and coordinator_id in selectable_ids:
-            selected_ids.append(coordinator_id)
-
-        ordered_selected_ids: List[str] = []
-        for agent_id in execution_order:
-            if agent_id in selected_ids and agent_id not in ordered_selected_ids:
-                ordered_selected_ids.append(agent_id)
-        for agent_id in selected_ids:
-            if agent_id not in ordered_selected_ids:
-                ordered_selected_ids.append(agent_id)
-
-        if coordinator_id and coordinator_id in ordered_selected_ids:
-            ordered_selected_ids = [
-                *[agent_id for agent_id in ordered_selected_ids if agent_id != coordinator_id],
-                coordinator_id,
-            ]
+            selected_ids[coordinator_id] = None
+
+        # Planner execution order first, then any remaining selected agents.
+        ordered = dict.fromkeys(
+            agent_id for agent_id in execution_order_raw
+            if isinstance(agent_id, str) and agent_id in selected_ids
+        )
+        ordered.update(selected_ids)
+        if coordinator_id and coordinator_id in ordered:
+            del ordered[coordinator_id]
+            ordered[coordinator_id] = None
+        ordered_selected_ids = list(ordered)
 
         selected_profiles: List[AgentSelectionResult] = []
         excluded_profiles: List[AgentSelectionResult] = []
-        ordered_set = set(ordered_selected_ids)
 
         for agent_id in ordered_selected_ids:
             profile = profile_map.get(agent_id)
@@ -709,15 +827,15 @@ class OrchestratorEngine:
                 continue
             reason_suffix = str(agent_reasons.get(agent_id) or "").strip()
             reason = f"LLM-selected for this query. {reason_suffix}".strip()
-            selected_profiles.append(profile.model_copy(update={"included": True, "reason": reason}))
+            selected_profiles.append(dataclasses.replace(profile, included=True, reason=reason))
 
         for profile in all_profiles:
-            if profile.agent_id in ordered_set:
+            if profile.agent_id in ordered:
                 continue
             was_selected = profile.agent_id in selected_baseline
             llm_excluded = profile.agent_id in excluded_ids
             reason_prefix = "LLM-excluded for this query." if llm_excluded or was_selected else profile.reason
-            excluded_profiles.append(profile.model_copy(update={"included": False, "reason": reason_prefix}))
+            excluded_profiles.append(dataclasses.replace(profile, included=False, reason=reason_prefix))
 
         if selected_profiles:
             self.selected_agents = selected_profiles
@@ -744,54 +862,58 @@ class OrchestratorEngine:
             return None
 
         model = os.getenv("AZURE_OPENAI_ORCHESTRATOR_DEPLOYMENT", "gpt-5-mini")
-        candidate_payload = [
-            {
-                "agentId": profile.agent_id,
-                "agentName": profile.agent_name,
-                "category": profile.category,
-                "priority": profile.priority,
-                "dataSources": profile.data_sources,
-                "defaultIncluded": profile.included,
-                "defaultReason": profile.reason,
-            }
+        candidates = tuple(
+            (
+                profile.agent_id,
+                profile.agent_name,
+                profile.category,
+                profile.priority,
+                tuple(profile.data_sources),
+                profile.included,
+                profile.reason,
+            )
             for profile in selectable_profiles
-        ]
-        system_prompt = (
-            "You are an orchestration planner. Choose the best subset of agents and execution order for the query. "
-            "Return strict JSON only with keys: selectedAgentIds, excludedAgentIds, executionOrder, "
-            "coordinatorAgentId, confidence, reasoning, agentReasons. "
-            "Rules: include exactly one coordinator agent and put coordinator last in executionOrder. "
-            "IMPORTANT: Only select agents from the provided candidateAgents list. "
-            "These have been pre-filtered for the detected scenario."
         )
-        user_payload = {
-            "problem": problem,
-            "scenario": self.scenario,
-            "defaultCoordinatorId": default_coordinator_id,
-            "candidateAgents": candidate_payload,
-        }
+        plan_cache_ttl = float(os.getenv("LLM_PLAN_CACHE_TTL_SECONDS", "3600"))
+        cache_key = (" ".join(problem.lower().split()), self.scenario, candidates, default_coordinator_id)
+        cached = _PLAN_CACHE.get(cache_key)
+        if cached and time.monotonic() - cached[0] < plan_cache_ttl:
+            logger.info("llm_orchestration_plan_cache_hit", run_id=self.run_id, scenario=self.scenario)
+            return copy.deepcopy(cached[1])
+
+        # Static prefix first (system prompt, candidate catalog), per-query
+        # content last, so repeated runs share a cacheable prompt prefix.
         request_kwargs: Dict[str, Any] = {
             "model": model,
             "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(user_payload, ensure_ascii=True)},
+                {"role": "system", "content": PLANNER_SYSTEM_PROMPT},
+                {"role": "user", "content": _planner_catalog_message(candidates, default_coordinator_id)},
+                {
+                    "role": "user",
+                    "content": orjson.dumps({"problem": problem, "scenario": self.scenario}).decode(),
+                },
             ],
         }
         if supports_explicit_temperature(model):
             request_kwargs["temperature"] = 0
         timeout_seconds = float(os.getenv("LLM_PLAN_TIMEOUT_SECONDS", "30"))
 
-        try:
+        async def _request_plan():
             client, _ = await get_shared_async_client(api_version=OPENAI_API_VERSION)
-            response = await asyncio.wait_for(
-                client.chat.completions.create(**request_kwargs),
-                timeout=timeout_seconds,
-            )
+            return await client.chat.completions.create(**request_kwargs)
+
+        try:
+            # One budget for client acquisition and the completion call.
+            response = await asyncio.wait_for(_request_plan(), timeout=timeout_seconds)
             raw_content = response.choices[0].message.content or ""
             parsed = self._extract_json_object_from_text(raw_content)
             if not isinstance(parsed, dict):
                 logger.warning("llm_orchestration_plan_parse_failed", run_id=self.run_id, scenario=self.scenario)
                 return None
+            if plan_cache_ttl > 0:
+                if cache_key not in _PLAN_CACHE and len(_PLAN_CACHE) >= _PLAN_CACHE_MAX:
+                    _PLAN_CACHE.pop(next(iter(_PLAN_CACHE)))
+                _PLAN_CACHE[cache_key] = (time.monotonic(), copy.deepcopy(parsed))
             return parsed
         except asyncio.TimeoutError:
             logger.warning(
@@ -815,29 +937,39 @@ class OrchestratorEngine:
         if not self.trace_emitter:
             return
 
-        for agent in self.selected_agents:
-            await self.trace_emitter.emit_agent_activated(
-                agent_id=agent.agent_id, agent_name=agent.agent_name,
-                reason=agent.reason, data_sources=agent.data_sources,
-                icon=agent.icon, color=agent.color,
-            )
-            self._activated_agent_ids.add(agent.agent_id)
-            await self._emit_progress(f"activated:{agent.agent_id}")
-
-        for agent in self.excluded_agents:
-            await self.trace_emitter.emit_agent_excluded(
-                agent_id=agent.agent_id, agent_name=agent.agent_name,
-                reason=agent.reason,
-            )
+        # Independent per-agent emissions; tasks start in list order, so
+        # the stream keeps the canvas ordering.
+        await asyncio.gather(
+            *(
+                self.trace_emitter.emit_agent_activated(
+                    agent_id=agent.agent_id, agent_name=agent.agent_name,
+                    reason=agent.reason, data_sources=agent.data_sources,
+                    icon=agent.icon, color=agent.color,
+                )
+                for agent in self.selected_agents
+            ),
+            *(
+                self.trace_emitter.emit_agent_excluded(
+                    agent_id=agent.agent_id, agent_name=agent.agent_name,
+                    reason=agent.reason,
+                )
+                for agent in self.excluded_agents
+            ),
+        )
+        self._activated_agent_ids.update(agent.agent_id for agent in self.selected_agents)
+        # One progress update for the whole activation phase.
+        await self._emit_progress("activate_agents")
 
     def _build_workflow_input(self, problem: str) -> str:
-        specialist_list = [
-            a for a in self.selected_agents if a.category != "coordinator"
-        ]
-        specialist_summary = "\n".join(
-            f"- {a.agent_name} ({a.agent_id}) -> allowed stores: {', '.join(a.data_sources) if a.data_sources else 'none'}"
-            for a in specialist_list
-        )
+        specialist_names: List[str] = []
+        summary_lines: List[str] = []
+        for a in self.selected_agents:
+            if a.category == "coordinator":
+                continue
+            specialist_names.append(a.agent_name)
+            stores = ", ".join(a.data_sources) if a.data_sources else "none"
+            summary_lines.append(f"- {a.agent_name} ({a.agent_id}) -> allowed stores: {stores}")
+        specialist_summary = "\n".join(summary_lines)
         return f"""## Aviation Problem Analysis Task
 
 ### Scenario: {self.scenario.replace('_', ' ').title()}
@@ -861,7 +993,7 @@ Specialist output contract:
   `executive_summary`, `evidence_points[]`, `recommended_actions[]`, `risks[]`, `confidence` (0..1)
 
 ### Active Specialists
-{', '.join(a.agent_name for a in specialist_list)}
+{', '.join(specialist_names)}
 
 ### Specialist Datastore Assignments
 {specialist_summary}
@@ -1024,7 +1156,7 @@ Specialist output contract:
         if isinstance(value, str):
             lines = []
             for raw_line in value.splitlines():
-                cleaned = re.sub(r"^\s*[-*•\d\.\)]\s*", "", raw_line).strip()
+                cleaned = _LIST_MARKER_RE.sub("", raw_line).strip()
                 if cleaned:
                     lines.append(cleaned)
             if lines:
@@ -1319,7 +1451,7 @@ Specialist output contract:
         answer_segments.append(
             "Implement opt-1 immediately, then reassess every 30 minutes against safety and crew legality constraints."
         )
-        final_answer = re.sub(r"\s+", " ", " ".join(answer_segments)).strip()[:1600]
+        final_answer = " ".join(" ".join(answer_segments).split())[:1600]
         if not self._is_substantive_response_text(final_answer):
             final_answer = "Execute opt-1 immediately with safety-first constraints, then reassess in 30-minute intervals."
 
@@ -1329,7 +1461,7 @@ Specialist output contract:
             "reason": reason,
             "summary": summary,
             "answer": final_answer,
-            "criteria": DEFAULT_RECOVERY_CRITERIA.copy(),
+            "criteria": list(DEFAULT_RECOVERY_CRITERIA),
             "options": options,
             "timeline": timeline,
             "selectedOptionId": "opt-1",
@@ -1354,67 +1486,67 @@ Specialist output contract:
             parsed = float(value)
         except (TypeError, ValueError):
             return 0.0
-        return round(max(0.0, min(parsed, 100.0)), 2)
+        if parsed != parsed:  # NaN
+            return 0.0
+        return round(100.0 if parsed > 100.0 else (0.0 if parsed < 0.0 else parsed), 2)
 
     def _extract_json_object_from_text(self, text: str) -> Optional[Dict[str, Any]]:
-        fenced_blocks = re.findall(r"```(?:json)?\s*(.*?)```", text, flags=re.IGNORECASE | re.DOTALL)
-        for block in fenced_blocks:
+        # Common case: the model returned a bare JSON object.
+        stripped = text.strip()
+        if stripped.startswith("{"):
             try:
-                parsed = json.loads(block.strip())
-            except json.JSONDecodeError:
+                parsed = orjson.loads(stripped)
+            except orjson.JSONDecodeError:
+                pass
+            else:
+                if isinstance(parsed, dict):
+                    return parsed
+
+        for block in _FENCED_JSON_RE.findall(text):
+            try:
+                parsed = orjson.loads(block.strip())
+            except orjson.JSONDecodeError:
                 continue
             if isinstance(parsed, dict):
                 return parsed
 
-        decoder = json.JSONDecoder()
-        for idx, char in enumerate(text):
-            if char != "{":
-                continue
+        idx = text.find("{")
+        while idx != -1:
             try:
-                parsed, _ = decoder.raw_decode(text[idx:])
+                parsed, _ = _JSON_DECODER.raw_decode(text, idx)
             except json.JSONDecodeError:
-                continue
+                parsed = None
             if isinstance(parsed, dict):
                 return parsed
+            idx = text.find("{", idx + 1)
         return None
 
     def _extract_final_answer_from_text(self, text: str) -> str:
         """Extract an explicit user-facing final answer from free-form coordinator text."""
-        patterns = [
-            r"(?ims)^final\s*answer\s*[:\-]\s*(.+?)(?:\n\s*\n|```|$)",
-            r"(?ims)^answer\s*[:\-]\s*(.+?)(?:\n\s*\n|```|$)",
-            r"(?ims)^recommendation\s*[:\-]\s*(.+?)(?:\n\s*\n|```|$)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _FINAL_ANSWER_RES:
+            match = pattern.search(text)
             if match:
-                candidate = re.sub(r"\s+", " ", match.group(1)).strip()
+                candidate = " ".join(match.group(1).split())
                 if candidate:
                     return candidate[:1000]
 
-        without_fenced_json = re.sub(
-            r"```(?:json)?\s*.*?```",
-            "",
-            text,
-            flags=re.IGNORECASE | re.DOTALL,
-        ).strip()
+        without_fenced_json = _FENCED_JSON_RE.sub("", text).strip()
         if not without_fenced_json:
             return ""
 
-        lines = [line.strip() for line in without_fenced_json.splitlines() if line.strip()]
-        if not lines:
-            return ""
-
         generic_prefixes = (
             "coordinator synthesis complete",
             "synthesis complete",
             "analysis complete",
         )
-        filtered_lines = [line for line in lines if not line.lower().startswith(generic_prefixes)]
-        if not filtered_lines:
+        chosen_lines = [
+            line
+            for raw_line in without_fenced_json.splitlines()
+            if (line := raw_line.strip()) and not line.lower().startswith(generic_prefixes)
+        ]
+        if not chosen_lines:
             return ""
-        chosen_lines = filtered_lines
-        candidate = re.sub(r"\s+", " ", " ".join(chosen_lines)).strip()
+        candidate = " ".join(" ".join(chosen_lines).split())
         return candidate[:1000]
 
     @staticmethod
@@ -1563,7 +1695,7 @@ Specialist output contract:
             )
             return fallback
 
-        joined = re.sub(r"\s+", " ", " ".join(parts)).strip()
+        joined = " ".join(" ".join(parts).split())
         return joined[:1400]
 
     def _resolve_final_answer(
@@ -1593,7 +1725,7 @@ Specialist output contract:
         if not answer:
             answer = "Structured specialist evidence was limited; SOP-based recovery guidance is provided with assumptions."
 
-        return re.sub(r"\s+", " ", answer).strip()[:1600]
+        return " ".join(answer.split())[:1600]
 
     def _build_incomplete_result(self, reason: str) -> Dict[str, Any]:
         return self._build_concrete_fallback_result(reason=reason)
@@ -1601,59 +1733,50 @@ Specialist output contract:
     def _parse_heuristic_artifacts(self, text: str) -> Dict[str, Any]:
         options: List[Dict[str, Any]] = []
         timeline: List[Dict[str, Any]] = []
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        recommendation_match = re.search(r"(?im)^(?:recommend(?:ation)?|selected option)\s*[:\-]\s*(.+)$", text)
+        recommendation_match = _RECOMMEND_RE.search(text)
         selected_option_id = ""
 
-        for line in lines:
-            option_match = re.match(r"(?i)^option\s*(\d+)\s*[:\-)\.]\s*(.+)$", line)
-            ranked_match = re.match(r"^(\d+)[\).:\-]\s*(.+)$", line)
-            matched = option_match or ranked_match
-            if matched:
-                rank = int(matched.group(1))
-                description = matched.group(2).strip()
-                options.append(
-                    {
-                        "optionId": f"opt-{rank}",
-                        "description": description,
-                        "rank": rank,
-                        "scores": {criterion: 0.0 for criterion in DEFAULT_RECOVERY_CRITERIA},
-                    }
-                )
+        for raw_line in text.splitlines():
+            matched = _ARTIFACT_LINE_RE.match(raw_line.strip())
+            if not matched:
                 continue
-
-            timeline_match = re.match(r"(?i)^(?:[-*]\s*)?(T\+\S+)\s*[:\-]\s*(.+)$", line)
-            if timeline_match:
-                timeline.append(
-                    {
-                        "time": timeline_match.group(1),
-                        "action": timeline_match.group(2).strip(),
-                        "agent": "",
-                    }
-                )
+            option_rank, option_text, ranked_rank, ranked_text, timeline_time, timeline_action = matched.groups()
+            if timeline_time is not None:
+                timeline.append({"time": timeline_time, "action": timeline_action.strip(), "agent": ""})
+                continue
+            rank = int(option_rank if option_rank is not None else ranked_rank)
+            description = (option_text if option_rank is not None else ranked_text).strip()
+            options.append(
+                {
+                    "optionId": f"opt-{rank}",
+                    "description": description,
+                    "rank": rank,
+                    "scores": _EMPTY_CRITERIA_SCORES.copy(),
+                }
+            )
 
         if recommendation_match:
             selection_text = recommendation_match.group(1)
-            id_match = re.search(r"(?i)(opt[-_ ]?\d+)", selection_text)
+            id_match = _OPT_ID_RE.search(selection_text)
             if id_match:
                 selected_option_id = id_match.group(1).lower().replace(" ", "-").replace("_", "-")
         if not selected_option_id and options:
             selected_option_id = options[0]["optionId"]
 
-        summary_match = re.search(r"(?im)^summary\s*[:\-]\s*(.+)$", text)
+        summary_match = _SUMMARY_RE.search(text)
         if summary_match:
             summary = summary_match.group(1).strip()
         elif recommendation_match:
             summary = recommendation_match.group(1).strip()
         else:
-            summary = re.sub(r"\s+", " ", text).strip()[:280]
+            summary = " ".join(text.split())[:280]
 
         final_answer = self._extract_final_answer_from_text(text)
         if not final_answer:
             final_answer = summary
 
         return {
-            "criteria": DEFAULT_RECOVERY_CRITERIA.copy(),
+            "criteria": list(DEFAULT_RECOVERY_CRITERIA),
             "options": options,
             "timeline": timeline,
             "selectedOptionId": selected_option_id,
@@ -1710,7 +1833,7 @@ Specialist output contract:
 
         if self._is_control_handoff_payload(parsed_json):
             return {
-                "criteria": DEFAULT_RECOVERY_CRITERIA.copy(),
+                "criteria": list(DEFAULT_RECOVERY_CRITERIA),
                 "options": [],
                 "timeline": [],
                 "selectedOptionId": "",
@@ -1728,7 +1851,7 @@ Specialist output contract:
 
         criteria_raw = parsed_json.get("criteria")
         criteria = [str(item) for item in criteria_raw if isinstance(item, str)] if isinstance(criteria_raw, list) else []
-        criteria = criteria or DEFAULT_RECOVERY_CRITERIA.copy()
+        criteria = criteria or list(DEFAULT_RECOVERY_CRITERIA)
 
         options: List[Dict[str, Any]] = []
         raw_options = parsed_json.get("options")
@@ -1799,7 +1922,7 @@ Specialist output contract:
                 pass
 
         if not summary:
-            summary = re.sub(r"\s+", " ", response_text).strip()[:280]
+            summary = " ".join(response_text.split())[:280]
         if not final_answer:
             final_answer = self._extract_final_answer_from_text(response_text)
         if not selected_option_id and options:
@@ -1826,7 +1949,7 @@ Specialist output contract:
 
         artifacts = self._parse_coordinator_artifacts(response_text)
         options = artifacts.get("options", [])
-        criteria = artifacts.get("criteria", DEFAULT_RECOVERY_CRITERIA.copy())
+        criteria = artifacts.get("criteria", list(DEFAULT_RECOVERY_CRITERIA))
         timeline = artifacts.get("timeline", [])
         selected_option_id = artifacts.get("selectedOptionId", "")
         summary = artifacts.get("summary", "Coordinator synthesized specialist findings.")
@@ -1863,16 +1986,20 @@ Specialist output contract:
             return
 
         if options:
-            for option in options:
-                if self.trace_emitter:
-                    await self.trace_emitter.emit_recovery_option(
+            # Independent per-option emissions; tasks start in list order, so
+            # the stream keeps the ranking order.
+            if self.trace_emitter:
+                await asyncio.gather(*(
+                    self.trace_emitter.emit_recovery_option(
                         option_id=option["optionId"],
                         description=option["description"],
                         scores=option["scores"],
                         rank=option["rank"],
                     )
-                else:
-                    await self.emit_event("recovery.option", option)
+                    for option in options
+                ))
+            else:
+                await asyncio.gather(*(self.emit_event("recovery.option", option) for option in options))
 
             scores = {option["optionId"]: option["scores"] for option in options}
             if self.trace_emitter:
@@ -1922,16 +2049,11 @@ Specialist output contract:
         substantive output so the UI displays meaningful data-source
         activity.  Returns 0 only when there is no real response text.
         """
-        if not response_text or not response_text.strip():
-            return 0
-        text = response_text.strip()
+        text = response_text.strip() if response_text else ""
         if len(text) < 50:
             return 0
-        segments = [
-            s for s in re.split(r'\n\n+|\n\s*[-*]\s|\n\s*\d+[.)]\s', text)
-            if s.strip()
-        ]
-        return min(max(1, len(segments)), 25)
+        segment_count = sum(1 for s in _SEGMENT_SPLIT_RE.split(text) if s.strip())
+        return min(max(1, segment_count), 25)
 
     def _estimate_confidence(self, source_count: int, message_count: int, response_text: str) -> float:
         """Return 1.0 if real data sources responded, 0.0 otherwise."""
@@ -1951,7 +2073,7 @@ Specialist output contract:
             return None
 
         candidates = [text]
-        fenced = re.findall(r"```(?:json)?\s*(.*?)```", text, flags=re.IGNORECASE | re.DOTALL)
+        fenced = _FENCED_JSON_RE.findall(text)
         candidates.extend(block.strip() for block in fenced if block.strip())
         brace_start = text.find("{")
         brace_end = text.rfind("}")
@@ -1977,7 +2099,7 @@ Specialist output contract:
     def _extract_error_code(message: str) -> str:
         if not message:
             return "SOURCE_QUERY_ERROR"
-        explicit = re.match(r"^\s*([A-Z0-9_]{3,})\s*:\s*", message)
+        explicit = _LABEL_PREFIX_RE.match(message)
         if explicit:
             return explicit.group(1)
         lowered = message.lower()
@@ -1999,7 +2121,7 @@ Specialist output contract:
     def _is_explicit_error_citation_title(title: str) -> bool:
         if not title:
             return False
-        if re.match(r"^\s*([A-Z0-9_]{3,})\s*:\s*", title):
+        if _LABEL_PREFIX_RE.match(title):
             return True
         lowered = title.strip().lower()
         if lowered.startswith(
@@ -2019,6 +2141,7 @@ Specialist output contract:
         return lowered in {
             "no database connection",
             "schema insufficient for query",
+            "no entities in query",
             "kql schema insufficient",
             "kql endpoint not configured",
             "no fabric token available",
@@ -2030,6 +2153,7 @@ Specialist output contract:
             "cosmos endpoint not configured",
             "could not generate t-sql",
             "pyodbc not installed",
+            "aioodbc not installed",
             "no fabric sql connection string",
         }
 
@@ -2115,7 +2239,7 @@ Specialist output contract:
             entry["error_message"] = message[:220]
 
         for source_type, details in per_source.items():
-            query_id = f"{agent_id}-{source_type}-{uuid.uuid4().hex[:8]}"
+            query_id = f"{agent_id}-{source_type}-{os.urandom(4).hex()}"
             query_summary = details.get("query_summary") or f"{source_type} query by {agent_name}"
             await self.trace_emitter.emit_data_source_query_start(
                 agent_id=agent_id,
@@ -2182,12 +2306,11 @@ Specialist output contract:
             "queries": [],
         }
 
+        summary_prefix = f"{profile.agent_name} retrieving {self.scenario.replace('_', ' ')} evidence from "
+        summary_suffix = f" for objective: {objective[:80]}"
         for source_idx, source_type in enumerate(profile.data_sources):
-            query_id = f"{agent_id}-{source_type}-{uuid.uuid4().hex[:6]}"
-            query_summary = (
-                f"{profile.agent_name} retrieving {self.scenario.replace('_', ' ')} evidence "
-                f"from {source_type} for objective: {objective[:80]}"
-            )
+            query_id = f"{agent_id}-{source_type}-{os.urandom(3).hex()}"
+            query_summary = f"{summary_prefix}{source_type}{summary_suffix}"
             query_type = "analytical" if source_type in {"KQL", "GRAPH", "FABRIC_SQL"} else "operational"
             tool_name = f"{source_type.lower()}_query"
             await self.trace_emitter.emit_data_source_query_start(
@@ -2241,17 +2364,18 @@ Specialist output contract:
         snippet = response_text or "Agent completed domain analysis and returned evidence-backed findings."
         profile = self._get_agent_profile(agent_id)
         agent_name = profile.agent_name if profile else agent_id
+        confidence = self._estimate_confidence(len(queries), message_count, snippet)
+        # The estimate only looks at the response text, so split it once rather
+        # than once per queried source.
+        result_count = self._estimate_result_count(agent_id, "", snippet, 0)
+        evidence_excerpt = snippet[:180]
+        emissions = []
         for i, query in enumerate(queries):
             source_type = query["source_type"]
-            source_index = query["source_index"]
-            result_count = self._estimate_result_count(agent_id, source_type, snippet, source_index)
             latency_ms = max(60, min(2200, elapsed_ms + (i * 90)))
-            evidence_summary = (
-                f"{source_type} evidence used by {agent_id}: "
-                f"{snippet[:180]}"
-            )
+            evidence_summary = f"{source_type} evidence used by {agent_id}: {evidence_excerpt}"
 
-            await self.trace_emitter.emit_data_source_query_complete(
+            emissions.append(self.trace_emitter.emit_data_source_query_complete(
                 agent_id=agent_id,
                 agent_name=agent_name,
                 source_type=source_type,
@@ -2259,29 +2383,32 @@ Specialist output contract:
                 latency_ms=latency_ms,
                 query_id=query["query_id"],
                 query_summary=query["query_summary"],
-            )
-            await self.trace_emitter.emit_tool_completed(
+            ))
+            emissions.append(self.trace_emitter.emit_tool_completed(
                 agent_id=agent_id,
                 agent_name=agent_name,
                 tool_name=query["tool_name"],
                 tool_id=query["query_id"],
                 latency_ms=latency_ms,
                 result_count=result_count,
-            )
-            await self.trace_emitter.emit_agent_evidence(
+            ))
+            emissions.append(self.trace_emitter.emit_agent_evidence(
                 agent_id=agent_id,
                 agent_name=agent_name,
                 source_type=source_type,
                 summary=evidence_summary,
                 result_count=result_count,
-                confidence=self._estimate_confidence(len(queries), message_count, snippet),
-            )
+                confidence=confidence,
+            ))
+        # Tasks start in list order, so each query's complete -> tool ->
+        # evidence sequence keeps its order on the stream.
+        await asyncio.gather(*emissions)
 
         await self.trace_emitter.emit_agent_recommendation(
             agent_id=agent_id,
             agent_name=agent_name,
             recommendation=snippet[:260] or f"{agent_id} completed analysis.",
-            confidence=self._estimate_confidence(len(queries), message_count, snippet),
+            confidence=confidence,
         )
         self._active_query_contexts.pop(agent_id, None)
 
@@ -2340,9 +2467,7 @@ Specialist output contract:
                     "workflow_auth_error_retrying",
                     run_id=self.run_id, attempt=attempt, retry_in=delay,
                 )
-                self._reset_workflow_state()
-                self._rebuild_workflow(input_message)
-                await asyncio.sleep(delay)
+                await self._prepare_retry(input_message, delay)
             except RateLimitError as e:
                 if attempt >= max_retries:
                     raise
@@ -2352,9 +2477,7 @@ Specialist output contract:
                     "workflow_rate_limit_retrying",
                     run_id=self.run_id, attempt=attempt, retry_in=delay,
                 )
-                self._reset_workflow_state()
-                self._rebuild_workflow(input_message)
-                await asyncio.sleep(delay)
+                await self._prepare_retry(input_message, delay)
             except APIStatusError as e:
                 if e.status_code == 401:
                     clear_client_cache()
@@ -2365,9 +2488,7 @@ Specialist output contract:
                         run_id=self.run_id, status=e.status_code,
                         attempt=attempt, retry_in=delay,
                     )
-                    self._reset_workflow_state()
-                    self._rebuild_workflow(input_message)
-                    await asyncio.sleep(delay)
+                    await self._prepare_retry(input_message, delay)
                 else:
                     raise
             except Exception as exc:
@@ -2421,6 +2542,7 @@ Specialist output contract:
         self._agent_invocation_counts.clear()
         self._invocation_should_respond.clear()
         self._agent_execution_counts.clear()
+        self._specialist_ids_remaining = None
         self._executor_invocations_total = 0
         self._active_query_contexts.clear()
         self._last_executor_id = None
@@ -2456,8 +2578,8 @@ Specialist output contract:
         self._agent_stream_guarded_invocation_keys.add(guard_key)
         self._active_agent_ids.discard(agent_id)
         self._completed_agent_ids.add(agent_id)
-        started_at = self._agent_started_at.get(agent_id, datetime.now(timezone.utc))
         ended_at = datetime.now(timezone.utc)
+        started_at = self._agent_started_at.get(agent_id, ended_at)
         duration_ms = int((ended_at - started_at).total_seconds() * 1000)
         self._agent_progress_pct[agent_id] = 100.0
         self._agent_stream_update_counts.pop(agent_id, None)
@@ -2508,7 +2630,7 @@ Specialist output contract:
             )
         if synth_text and self._is_specialist_executor_id(agent_id):
             self.evidence.append({
-                "evidence_id": f"ev-{uuid.uuid4().hex[:8]}",
+                "evidence_id": f"ev-{os.urandom(4).hex()}",
                 "type": "agent_response",
                 "agent": agent_id,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -2579,6 +2701,19 @@ Specialist output contract:
                     reason=reason,
                 )
 
+    async def _prepare_retry(self, input_message: str, delay: float) -> None:
+        """Reset per-execution state and rebuild the workflow during the backoff.
+
+        A failed run leaves conversation state on the workflow's executors, so
+        every retry gets a fresh graph. Building it in a worker thread while the
+        backoff elapses keeps it off the retry's critical path.
+        """
+        self._reset_workflow_state()
+        await asyncio.gather(
+            asyncio.to_thread(self._rebuild_workflow, input_message),
+            asyncio.sleep(delay),
+        )
+
     def _rebuild_workflow(self, input_message: str) -> None:
         """Recreate workflow with fresh clients after a credential refresh."""
         logger.info("rebuilding_workflow", run_id=self.run_id)
@@ -2619,7 +2754,7 @@ Specialist output contract:
         superstep_has_substantive_specialist = False
         superstep_has_substantive_coordinator = False
         superstep_active = False
-        stream_started_at = datetime.now(timezone.utc)
+        stream_started_at = time.monotonic()
         required_specialists = self._required_specialist_count()
         min_contrib_for_timed_synthesis = max(1, required_specialists // 2) if required_specialists else 0
         last_coordinator_signal = self._current_substantive_coordinator_signal()
@@ -2785,20 +2920,21 @@ Specialist output contract:
                             if self._is_substantive_response_text(resp_text):
                                 findings = self._specialist_findings_map.get(comp_executor_id, {})
                                 summary_text = str(findings.get("executive_summary") or resp_text[:500]).strip()
+                                response_at = datetime.now(timezone.utc).isoformat()
                                 agent_responses.append({
                                     "agent": comp_executor_id,
                                     "messages": msg_count,
                                     "result_summary": summary_text[:500],
-                                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                                    "timestamp": response_at,
                                 })
                                 if has_structured_findings:
                                     superstep_has_substantive_specialist = True
                                     noop_invocations_since_progress = 0
                                 self.evidence.append({
-                                    "evidence_id": f"ev-{uuid.uuid4().hex[:8]}",
+                                    "evidence_id": f"ev-{os.urandom(4).hex()}",
                                     "type": "agent_response",
                                     "agent": comp_executor_id,
-                                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                                    "timestamp": response_at,
                                 })
 
                 if isinstance(event, AgentRunEvent):
@@ -2821,19 +2957,20 @@ Specialist output contract:
                         continue
                     has_structured_findings = self._upsert_specialist_findings(agent_name, result_summary)
                     findings = self._specialist_findings_map.get(agent_name, {})
+                    response_at = datetime.now(timezone.utc).isoformat()
                     agent_responses.append({
                         "agent": agent_name,
                         "messages": len(response.messages) if response.messages else 0,
                         "result_summary": str(findings.get("executive_summary") or result_summary)[:500],
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "timestamp": response_at,
                     })
                     if has_structured_findings:
                         superstep_has_substantive_specialist = True
                         noop_invocations_since_progress = 0
                     self.evidence.append({
-                        "evidence_id": f"ev-{uuid.uuid4().hex[:8]}",
+                        "evidence_id": f"ev-{os.urandom(4).hex()}",
                         "type": "agent_response", "agent": agent_name,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "timestamp": response_at,
                     })
 
                 # --- Accumulate streaming text from AgentRunUpdateEvent ---
@@ -2869,7 +3006,7 @@ Specialist output contract:
                     last_coordinator_signal = current_coordinator_signal
 
                 if self._is_llm_directed_mode() and not self._phase_lock_enabled:
-                    elapsed_seconds = (datetime.now(timezone.utc) - stream_started_at).total_seconds()
+                    elapsed_seconds = time.monotonic() - stream_started_at
                     contributed = self._specialist_contribution_count()
                     repeated_specialist_cycle = any(
                         self._agent_execution_counts.get(agent_id, 0) > max_specialist_cycles
@@ -2966,9 +3103,7 @@ Specialist output contract:
                     if not self._current_substantive_coordinator_signal():
                         self._phase_lock_enabled = True
                         self._synthesis_trigger_reason = "max_noop_invocations_without_progress"
-                        self._phase_transition_time_ms = int(
-                            (datetime.now(timezone.utc) - stream_started_at).total_seconds() * 1000
-                        )
+                        self._phase_transition_time_ms = int((time.monotonic() - stream_started_at) * 1000)
                         self._fallback_mode = "sop_concrete"
                         self._final_confidence_level = self._derive_confidence_level()
                         await self.emit_event(
@@ -3030,17 +3165,18 @@ Specialist output contract:
                 if self._is_substantive_response_text(text):
                     self._upsert_specialist_findings(agent_id, text)
                     findings = self._specialist_findings_map.get(agent_id, {})
+                    response_at = datetime.now(timezone.utc).isoformat()
                     agent_responses.append({
                         "agent": agent_id,
                         "messages": 1,
                         "result_summary": str(findings.get("executive_summary") or text)[:500],
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "timestamp": response_at,
                     })
                     self.evidence.append({
-                        "evidence_id": f"ev-{uuid.uuid4().hex[:8]}",
+                        "evidence_id": f"ev-{os.urandom(4).hex()}",
                         "type": "agent_response",
                         "agent": agent_id,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "timestamp": response_at,
                     })
 
             if self._should_fail_coordinator_no_specialist_handoff(
@@ -3071,7 +3207,7 @@ Specialist output contract:
                     fused_summary=summary,
                 )
                 fallback_artifacts = {
-                    "criteria": fallback_result.get("criteria", DEFAULT_RECOVERY_CRITERIA.copy()),
+                    "criteria": fallback_result.get("criteria", list(DEFAULT_RECOVERY_CRITERIA)),
                     "options": fallback_result.get("options", []),
                     "timeline": fallback_result.get("timeline", []),
                     "selectedOptionId": fallback_result.get("selectedOptionId", ""),
@@ -3179,9 +3315,12 @@ Specialist output contract:
             executor_id=executor_id_log or "n/a",
         )
 
+        # One clock read per event: start/end markers, stream-update times and
+        # the event timestamp all refer to this event's arrival.
+        now = datetime.now(timezone.utc)
         event_data = {
             "event_class": evt_cls,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now.isoformat(),
         }
 
         if isinstance(event, WorkflowStartedEvent):
@@ -3206,6 +3345,9 @@ Specialist output contract:
                 self._executor_invocations_total += 1
                 real_execution_count = self._agent_execution_counts.get(executor_id, 0) + 1
                 self._agent_execution_counts[executor_id] = real_execution_count
+                if self._specialist_ids_remaining is None:
+                    self._specialist_ids_remaining = self._specialist_agent_ids()
+                self._specialist_ids_remaining.discard(executor_id)
             else:
                 real_execution_count = self._agent_execution_counts.get(executor_id, 0)
 
@@ -3224,19 +3366,16 @@ Specialist output contract:
                 # For LLM-directed mode: if every specialist has been invoked
                 # at least once, treat limit breach as graceful completion
                 # rather than a hard failure.
-                specialist_ids = {
-                    a.agent_id for a in self.selected_agents
-                    if a.category != "coordinator"
-                }
-                all_heard = specialist_ids.issubset(self._agent_execution_counts.keys())
+                all_heard = not self._specialist_ids_remaining
 
                 if self._is_llm_directed_mode() and all_heard:
+                    specialist_count = len(self._specialist_agent_ids())
                     logger.warning(
                         "llm_directed_loop_capped",
                         run_id=self.run_id,
                         invocations=self._executor_invocations_total,
                         limit=self._max_executor_invocations_effective,
-                        specialists_heard=len(specialist_ids),
+                        specialists_heard=specialist_count,
                     )
                     await self.emit_event(
                         "workflow.status",
@@ -3244,7 +3383,7 @@ Specialist output contract:
                             **event_data,
                             "status": "loop_capped",
                             "message": (
-                                f"All {len(specialist_ids)} specialists consulted; "
+                                f"All {specialist_count} specialists consulted; "
                                 f"capping at {self._max_executor_invocations_effective} invocations."
                             ),
                             "executorInvocations": self._executor_invocations_total,
@@ -3296,7 +3435,6 @@ Specialist output contract:
                 await self._emit_progress(f"executor_invoked:{executor_id}")
                 return
 
-            now = datetime.now(timezone.utc)
             self._agent_started_at[executor_id] = now
             if self._is_bounded_orchestration_mode():
                 self._agent_stream_update_counts[executor_id] = 0
@@ -3398,8 +3536,8 @@ Specialist output contract:
                 return
 
             self._active_agent_ids.discard(executor_id)
-            started_at = self._agent_started_at.get(executor_id, datetime.now(timezone.utc))
-            ended_at = datetime.now(timezone.utc)
+            ended_at = now
+            started_at = self._agent_started_at.get(executor_id, now)
             duration_ms = int((ended_at - started_at).total_seconds() * 1000)
             self._agent_progress_pct[executor_id] = 100.0
             execution_count = invocation_count
@@ -3512,8 +3650,8 @@ Specialist output contract:
                 text_length=len(response_text),
             )
 
-            started_at = self._agent_started_at.get(agent_id, datetime.now(timezone.utc))
-            ended_at = datetime.now(timezone.utc)
+            ended_at = now
+            started_at = self._agent_started_at.get(agent_id, now)
             duration_ms = int((ended_at - started_at).total_seconds() * 1000)
             self._active_agent_ids.discard(agent_id)
             self._agent_progress_pct[agent_id] = 100.0
@@ -3581,7 +3719,6 @@ Specialist output contract:
             next_progress = min(92.0, self._agent_progress_pct.get(executor_id, 5.0) + 8.0)
             self._agent_progress_pct[executor_id] = next_progress
             self._active_agent_ids.add(executor_id)
-            now = datetime.now(timezone.utc)
             if self._is_bounded_orchestration_mode():
                 update_count = self._agent_stream_update_counts.get(executor_id, 0) + 1
                 self._agent_stream_update_counts[executor_id] = update_count
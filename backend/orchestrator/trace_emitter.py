@@ -9,7 +9,7 @@ from typing import Any, Callable, Dict, List, Optional
 import structlog
 
 from orchestrator.agent_registry import AgentSelectionResult
-from telemetry import get_current_trace_context
+from telemetry import get_cached_trace_context
 
 logger = structlog.get_logger()
 
@@ -59,7 +59,7 @@ class TraceEmitter:
 
     async def _emit(self, kind: str, message: str, payload: Dict[str, Any]):
         if self.event_callback:
-            otel_ctx = get_current_trace_context()
+            otel_ctx = get_cached_trace_context()
             trace_id = self.trace_id
             span_id = self._current_span_id
             parent_span_id = payload.get("parentSpanId")
@@ -6,7 +6,7 @@ Events are published to Redis Streams and consumed by the SSE endpoint.
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 import uuid
 
 
@@ -86,6 +86,10 @@ class EventKind(str, Enum):
     HEARTBEAT = "heartbeat"
 
 
+# How a not-yet-published event's stream_id appears in model_dump_json output.
+_NULL_STREAM_ID = '"stream_id":null'
+
+
 class WorkflowEvent(BaseModel):
     """Event schema for real-time workflow progress streaming."""
     event_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -120,8 +124,35 @@ class WorkflowEvent(BaseModel):
         json_encoders={datetime: lambda v: v.isoformat()},
     )
 
+    # (stream_id, serialized JSON) — one StreamHub event is written to every
+    # SSE client watching the run, so serialize it once.
+    _sse_data: Optional[tuple] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_stream_entry(cls, event_json: str, stream_id: str) -> "WorkflowEvent":
+        """Parse an event stored in a Redis stream entry and attach its ID.
+
+        Events are stored before Redis assigns their ID, so the stored JSON
+        reads ``"stream_id":null``. That token precedes every free-form field,
+        so splicing the ID into it yields the SSE payload without serializing
+        the event a second time.
+        """
+        event = cls.model_validate_json(event_json)
+        event.stream_id = stream_id
+        if _NULL_STREAM_ID in event_json:
+            event._sse_data = (
+                stream_id,
+                event_json.replace(_NULL_STREAM_ID, f'"stream_id":"{stream_id}"', 1),
+            )
+        return event
+
     def to_sse_data(self) -> str:
-        return self.model_dump_json()
+        cached = self._sse_data
+        if cached is not None and cached[0] == self.stream_id:
+            return cached[1]
+        data = self.model_dump_json()
+        self._sse_data = (self.stream_id, data)
+        return data
 
 
 def heartbeat_event(run_id: str, sequence: int = 0) -> WorkflowEvent:
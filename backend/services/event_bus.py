@@ -26,12 +26,25 @@ else:
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
 
+# Connection pools: a small fail-fast pool for publishes/health checks and a
+# large pool for blocking XREAD subscriptions that hold a connection per client.
+REDIS_GENERAL_MAX_CONNECTIONS = int(os.getenv("REDIS_GENERAL_MAX_CONNECTIONS", "50"))
+REDIS_GENERAL_POOL_TIMEOUT = float(os.getenv("REDIS_GENERAL_POOL_TIMEOUT", "0.5"))
+REDIS_BLOCKING_MAX_CONNECTIONS = int(os.getenv("REDIS_BLOCKING_MAX_CONNECTIONS", "500"))
+
 # Stream configuration
 STREAM_PREFIX = "av:events:"
 MAX_STREAM_LEN = 10000
+# Run streams self-evict this long after their start/terminal event.
+STREAM_TTL_SECONDS = int(os.getenv("EVENT_STREAM_TTL_SECONDS", str(24 * 3600)))
+_TTL_REFRESH_KINDS = frozenset({EventKind.RUN_STARTED, EventKind.RUN_COMPLETED, EventKind.RUN_FAILED})
 HEARTBEAT_INTERVAL = 15
 STREAM_ID_RE = re.compile(r"^\d+-\d+$")
 
+# Per-run publish queue between orchestrator callbacks and Redis
+EVENT_QUEUE_MAXSIZE = int(os.getenv("EVENT_QUEUE_MAXSIZE", "1024"))
+BATCH_MAX_EVENTS = int(os.getenv("EVENT_BATCH_MAX_EVENTS", "32"))
+
 
 class EventBus:
     """
@@ -41,25 +54,51 @@ class EventBus:
     - Persistent event storage in Redis Streams
     - Last-Event-ID resume capability
     - Heartbeat for SSE keepalive
+    - Separate general/blocking Redis clients so long-held subscriptions
+      cannot starve publishes and health checks
     """
 
-    def __init__(self, redis_client: Redis):
-        self.redis = redis_client
+    def __init__(self, redis_client: Redis, blocking_client: Optional[Redis] = None):
+        self.general = redis_client
+        self.blocking = blocking_client or redis_client
         self._sequence_counters: dict[str, int] = {}
 
+    @property
+    def redis(self) -> Redis:
+        """General-purpose client (publishes, range reads, health checks)."""
+        return self.general
+
     @classmethod
     async def create(cls) -> "EventBus":
-        """Factory method to create EventBus with connection."""
-        client = redis.Redis(
+        """Factory method to create EventBus with general and blocking pools."""
+        connection_kwargs = {
+            "host": REDIS_HOST,
+            "port": REDIS_PORT,
+            "password": REDIS_PASSWORD,
+            "db": REDIS_DB,
+            "decode_responses": True,
+        }
+        general_pool = redis.BlockingConnectionPool(
+            max_connections=REDIS_GENERAL_MAX_CONNECTIONS,
+            timeout=REDIS_GENERAL_POOL_TIMEOUT,
+            **connection_kwargs,
+        )
+        blocking_pool = redis.ConnectionPool(
+            max_connections=REDIS_BLOCKING_MAX_CONNECTIONS,
+            socket_timeout=None,
+            **connection_kwargs,
+        )
+        general = redis.Redis(connection_pool=general_pool)
+        blocking = redis.Redis(connection_pool=blocking_pool)
+        await general.ping()
+        logger.info(
+            "event_bus_connected",
             host=REDIS_HOST,
             port=REDIS_PORT,
-            password=REDIS_PASSWORD,
-            db=REDIS_DB,
-            decode_responses=True,
+            general_max_connections=REDIS_GENERAL_MAX_CONNECTIONS,
+            blocking_max_connections=REDIS_BLOCKING_MAX_CONNECTIONS,
         )
-        await client.ping()
-        logger.info("event_bus_connected", host=REDIS_HOST, port=REDIS_PORT)
-        return cls(client)
+        return cls(general, blocking)
 
     def _stream_key(self, run_id: str) -> str:
         """Get Redis Stream key for a run."""
@@ -72,6 +111,15 @@ class EventBus:
         self._sequence_counters[run_id] += 1
         return self._sequence_counters[run_id]
 
+    @staticmethod
+    def _event_fields(event: WorkflowEvent) -> dict[str, str]:
+        return {
+            "data": event.model_dump_json(),
+            "event_id": event.event_id,
+            "kind": event.kind.value,
+            "ts": event.ts.isoformat(),
+        }
+
     async def publish(self, event: WorkflowEvent) -> str:
         """Publish an event to the run's event stream."""
         if event.sequence == 0:
@@ -79,18 +127,19 @@ class EventBus:
 
         stream_key = self._stream_key(event.run_id)
 
-        event_data = {
-            "data": event.model_dump_json(),
-            "event_id": event.event_id,
-            "kind": event.kind.value,
-            "ts": event.ts.isoformat(),
-        }
-
-        message_id = await self.redis.xadd(
-            stream_key,
-            event_data,
-            maxlen=MAX_STREAM_LEN,
-        )
+        if event.kind in _TTL_REFRESH_KINDS and STREAM_TTL_SECONDS > 0:
+            # Lifecycle events also (re)arm the stream TTL in the same round-trip.
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.xadd(stream_key, self._event_fields(event), maxlen=MAX_STREAM_LEN, approximate=True)
+                pipe.expire(stream_key, STREAM_TTL_SECONDS)
+                message_id, _ = await pipe.execute()
+        else:
+            message_id = await self.redis.xadd(
+                stream_key,
+                self._event_fields(event),
+                maxlen=MAX_STREAM_LEN,
+                approximate=True,
+            )
 
         event.stream_id = message_id
 
@@ -104,6 +153,25 @@ class EventBus:
 
         return message_id
 
+    async def publish_many(self, events: list[WorkflowEvent]) -> None:
+        """XADD several events in one pipeline round-trip, preserving order."""
+        if not events:
+            return
+        async with self.general.pipeline(transaction=False) as pipe:
+            for event in events:
+                if event.sequence == 0:
+                    event.sequence = self._get_next_sequence(event.run_id)
+                stream_key = self._stream_key(event.run_id)
+                pipe.xadd(stream_key, self._event_fields(event), maxlen=MAX_STREAM_LEN, approximate=True)
+                if event.kind in _TTL_REFRESH_KINDS and STREAM_TTL_SECONDS > 0:
+                    pipe.expire(stream_key, STREAM_TTL_SECONDS)
+            results = iter(await pipe.execute())
+        for event in events:
+            event.stream_id = next(results)
+            if event.kind in _TTL_REFRESH_KINDS and STREAM_TTL_SECONDS > 0:
+                next(results)
+        logger.debug("event_batch_published", count=len(events))
+
     async def _lookup_stream_id_by_event_id(self, stream_key: str, event_id: str) -> Optional[str]:
         """
         Resolve legacy UUID event IDs to Redis stream IDs.
@@ -121,35 +189,49 @@ class EventBus:
             if len(rows) < 250:
                 return None
 
+    async def resolve_start_id(self, run_id: str, last_event_id: Optional[str] = None) -> str:
+        """Map a Last-Event-ID (stream ID or legacy event UUID) to a stream cursor."""
+        if not last_event_id:
+            return "0"
+        if STREAM_ID_RE.match(last_event_id):
+            return last_event_id
+        resolved = await self._lookup_stream_id_by_event_id(self._stream_key(run_id), last_event_id)
+        if resolved:
+            logger.info(
+                "event_resume_legacy_event_id_resolved",
+                run_id=run_id,
+                legacy_event_id=last_event_id,
+                stream_id=resolved,
+            )
+            return resolved
+        logger.warning(
+            "event_resume_legacy_event_id_not_found",
+            run_id=run_id,
+            legacy_event_id=last_event_id,
+        )
+        return "0"
+
+    async def latest_stream_id(self, run_id: str) -> str:
+        """Return the newest stream ID for a run, or "0" when the stream is empty."""
+        rows = await self.general.xrevrange(self._stream_key(run_id), "+", "-", count=1)
+        return rows[0][0] if rows else "0"
+
     async def subscribe(
         self,
         run_id: str,
         last_event_id: Optional[str] = None,
         include_heartbeats: bool = True,
         max_retries: int = 10,
+        use_blocking: bool = True,
     ) -> AsyncGenerator[WorkflowEvent, None]:
-        """Subscribe to events for a run using Redis Streams."""
+        """Subscribe to events for a run using Redis Streams.
+
+        Blocking XREADs run on the dedicated blocking pool unless
+        ``use_blocking`` is False.
+        """
+        reader = self.blocking if use_blocking else self.general
         stream_key = self._stream_key(run_id)
-        start_id = "0"
-        if last_event_id:
-            if STREAM_ID_RE.match(last_event_id):
-                start_id = last_event_id
-            else:
-                resolved = await self._lookup_stream_id_by_event_id(stream_key, last_event_id)
-                if resolved:
-                    start_id = resolved
-                    logger.info(
-                        "event_resume_legacy_event_id_resolved",
-                        run_id=run_id,
-                        legacy_event_id=last_event_id,
-                        stream_id=resolved,
-                    )
-                else:
-                    logger.warning(
-                        "event_resume_legacy_event_id_not_found",
-                        run_id=run_id,
-                        legacy_event_id=last_event_id,
-                    )
+        start_id = await self.resolve_start_id(run_id, last_event_id)
 
         logger.info(
             "event_subscribe_started",
@@ -165,7 +247,7 @@ class EventBus:
 
         while True:
             try:
-                messages = await self.redis.xread(
+                messages = await reader.xread(
                     {stream_key: start_id},
                     count=100,
                     block=5000,
@@ -178,8 +260,7 @@ class EventBus:
 
                             try:
                                 event_json = message_data.get("data", "{}")
-                                event = WorkflowEvent.model_validate_json(event_json)
-                                event.stream_id = _message_id
+                                event = WorkflowEvent.from_stream_entry(event_json, _message_id)
 
                                 if event.sequence and event.sequence <= last_sequence:
                                     logger.warning(
@@ -239,8 +320,7 @@ class EventBus:
         for message_id, message_data in messages:
             try:
                 event_json = message_data.get("data", "{}")
-                event = WorkflowEvent.model_validate_json(event_json)
-                event.stream_id = message_id
+                event = WorkflowEvent.from_stream_entry(event_json, message_id)
                 events.append(event)
             except Exception as e:
                 logger.error("event_parse_error", error=str(e))
@@ -248,9 +328,95 @@ class EventBus:
 
         return events
 
+    async def get_events_after(self, run_id: str, cursor: str, count: int = 1000) -> list[WorkflowEvent]:
+        """Get up to ``count`` events strictly after stream cursor ``cursor``."""
+        start_id = f"({cursor}" if cursor and cursor != "0" else "-"
+        return await self.get_events(run_id, start_id=start_id, count=count)
+
     async def close(self):
-        """Close Redis connection."""
-        await self.redis.close()
+        """Close Redis connections."""
+        if self.blocking is not self.general:
+            await self.blocking.aclose(close_connection_pool=True)
+        await self.general.aclose(close_connection_pool=True)
+
+
+class RunEventPublisher:
+    """
+    Bounded per-run queue in front of EventBus.
+
+    Orchestrator callbacks enqueue and return; one consumer task drains the
+    queue and XADDs up to BATCH_MAX_EVENTS per pipeline round-trip. When the
+    queue is full, droppable (token streaming) events are discarded and
+    everything else waits for room, so a slow Redis backpressures the run
+    instead of silently losing lifecycle events. A progress_update arriving
+    while an earlier one is still queued is merged into it, since the UI only
+    renders the latest progress fields.
+    """
+
+    def __init__(self, event_bus: EventBus, run_id: str, maxsize: int = EVENT_QUEUE_MAXSIZE):
+        self._event_bus = event_bus
+        self.run_id = run_id
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._consumer: Optional[asyncio.Task] = None
+        self._pending_progress: Optional[WorkflowEvent] = None
+        self.dropped = 0
+        self.coalesced = 0
+
+    async def submit(self, event: WorkflowEvent, droppable: bool = False) -> None:
+        """Queue an event for publishing."""
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+        if event.kind is EventKind.PROGRESS_UPDATE:
+            pending = self._pending_progress
+            if pending is not None:
+                pending.payload.update(event.payload)
+                pending.ts = event.ts
+                pending.message = event.message
+                self.coalesced += 1
+                return
+            self._pending_progress = event
+        if droppable:
+            if self._queue.full():
+                self.dropped += 1
+                if self.dropped == 1:
+                    logger.warning("event_queue_full_dropping", run_id=self.run_id, kind=event.kind.value)
+                return
+            self._queue.put_nowait(event)
+        else:
+            await self._queue.put(event)
+
+    async def _consume(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < BATCH_MAX_EVENTS:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            if self._pending_progress is not None and any(e is self._pending_progress for e in batch):
+                self._pending_progress = None
+            try:
+                await self._event_bus.publish_many(batch)
+            except Exception as e:
+                logger.error("event_batch_publish_failed", run_id=self.run_id, count=len(batch), error=str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been written."""
+        if self._consumer is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Drain the queue and stop the consumer task."""
+        await self.drain()
+        if self._consumer is not None:
+            self._consumer.cancel()
+            await asyncio.gather(self._consumer, return_exceptions=True)
+            self._consumer = None
+        if self.dropped:
+            logger.warning("event_queue_dropped_events", run_id=self.run_id, dropped=self.dropped)
 
 
 # Singleton instance with async-safe lock
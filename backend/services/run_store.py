@@ -28,6 +28,9 @@ PGDATABASE = os.getenv("PGDATABASE", "postgres")
 PGUSER = os.getenv("PGUSER", "postgres")
 PGPASSWORD = os.getenv("PGPASSWORD", "")
 PG_SCHEMA = os.getenv("PG_SCHEMA", "aviation_solver")
+# Per-connection prepared statement LRU; the pool is shared with the retriever,
+# whose LLM-written SQL and graph BFS queries repeat across runs.
+PG_STATEMENT_CACHE_SIZE = int(os.getenv("PG_STATEMENT_CACHE_SIZE", "1024"))
 
 
 class RunStore:
@@ -67,6 +70,7 @@ class RunStore:
             ssl=ssl_param,
             timeout=20,
             command_timeout=15,
+            statement_cache_size=PG_STATEMENT_CACHE_SIZE,
         )
 
         store = cls(pool)
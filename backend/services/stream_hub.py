@@ -0,0 +1,224 @@
+"""
+Per-run SSE fan-out over a single Redis Streams reader.
+Multiple clients watching the same run share one upstream XREAD loop
+instead of each holding its own blocking Redis connection.
+"""
+
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Tuple
+
+import structlog
+
+from schemas.events import WorkflowEvent, EventKind, heartbeat_event
+from services.event_bus import EventBus, HEARTBEAT_INTERVAL, get_event_bus
+
+logger = structlog.get_logger()
+
+SUBSCRIBER_QUEUE_SIZE = 256
+REPLAY_PAGE_SIZE = 1000
+# Live events already queued together are handed to the SSE writer as one
+# batch (one HTTP chunk) up to this many.
+SSE_BATCH_MAX_EVENTS = 64
+TERMINAL_KINDS = (EventKind.RUN_COMPLETED, EventKind.RUN_FAILED)
+
+# Queue sentinels: upstream finished, or subscriber dropped for falling behind.
+_END = object()
+_DROPPED = object()
+
+
+def _stream_id_key(stream_id: Optional[str]) -> Tuple[int, int]:
+    """Order Redis stream IDs ("<ms>-<seq>") numerically."""
+    if not stream_id or "-" not in stream_id:
+        return (0, 0)
+    ms, _, seq = stream_id.partition("-")
+    try:
+        return (int(ms), int(seq))
+    except ValueError:
+        return (0, 0)
+
+
+@dataclass
+class _RunFanout:
+    subscribers: set = field(default_factory=set)
+    task: Optional[asyncio.Task] = None
+
+
+class StreamHub:
+    """
+    Fans out one upstream Redis stream reader per run_id to many SSE clients.
+
+    Each subscriber gets a bounded queue. A subscriber whose queue fills up is
+    disconnected rather than stalling the others; the browser reconnects with
+    Last-Event-ID and resumes from the stream.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._event_bus = event_bus
+        self._queue_size = queue_size
+        self._runs: dict[str, _RunFanout] = {}
+
+    async def _bus(self) -> EventBus:
+        if self._event_bus is None:
+            self._event_bus = await get_event_bus()
+        return self._event_bus
+
+    async def _pump(self, run_id: str, start_id: str) -> None:
+        """Read the run's stream once and push each event to every subscriber."""
+        bus = await self._bus()
+        try:
+            async for event in bus.subscribe(run_id, start_id, include_heartbeats=False):
+                fanout = self._runs.get(run_id)
+                if fanout is None:
+                    return
+                for queue in list(fanout.subscribers):
+                    try:
+                        queue.put_nowait(event)
+                    except asyncio.QueueFull:
+                        fanout.subscribers.discard(queue)
+                        while not queue.empty():
+                            queue.get_nowait()
+                        queue.put_nowait(_DROPPED)
+                        logger.warning("sse_slow_client_dropped", run_id=run_id, queue_size=self._queue_size)
+        except Exception as e:
+            logger.error("stream_hub_upstream_error", run_id=run_id, error=str(e))
+        finally:
+            fanout = self._runs.get(run_id)
+            if fanout is not None and fanout.task is asyncio.current_task():
+                del self._runs[run_id]
+                for queue in fanout.subscribers:
+                    try:
+                        queue.put_nowait(_END)
+                    except asyncio.QueueFull:
+                        queue.get_nowait()
+                        queue.put_nowait(_END)
+
+    async def _attach(self, run_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        fanout = self._runs.get(run_id)
+        if fanout is None:
+            bus = await self._bus()
+            # Tail from the current end of the stream; subscribers catch up on
+            # anything older themselves, so nothing between the two is lost.
+            start_id = await bus.latest_stream_id(run_id)
+            fanout = self._runs.get(run_id)
+            if fanout is None:
+                fanout = _RunFanout()
+                self._runs[run_id] = fanout
+                fanout.task = asyncio.create_task(self._pump(run_id, start_id))
+        fanout.subscribers.add(queue)
+        return queue
+
+    def _detach(self, run_id: str, queue: asyncio.Queue) -> None:
+        fanout = self._runs.get(run_id)
+        if fanout is None:
+            return
+        fanout.subscribers.discard(queue)
+        if not fanout.subscribers:
+            del self._runs[run_id]
+            if fanout.task and not fanout.task.done():
+                fanout.task.cancel()
+
+    async def subscribe(
+        self,
+        run_id: str,
+        last_event_id: Optional[str] = None,
+        include_heartbeats: bool = True,
+    ) -> AsyncIterator[WorkflowEvent]:
+        """Yield a run's events after ``last_event_id`` followed by live events.
+
+        Callers that already replayed history should pass the last stream ID
+        they delivered so only the gap before the live tail is re-read.
+        """
+        async with aclosing(self.subscribe_batches(run_id, last_event_id, include_heartbeats)) as batches:
+            async for batch in batches:
+                for event in batch:
+                    yield event
+
+    async def subscribe_batches(
+        self,
+        run_id: str,
+        last_event_id: Optional[str] = None,
+        include_heartbeats: bool = True,
+    ) -> AsyncIterator[List[WorkflowEvent]]:
+        """Like ``subscribe`` but yields every already-available event at once.
+
+        Backlog pages and runs of queued live events (e.g. the burst the
+        orchestrator publishes at each phase boundary) arrive as one list so
+        the SSE writer can send them in a single chunk.
+        """
+        bus = await self._bus()
+        cursor = await bus.resolve_start_id(run_id, last_event_id)
+        queue = await self._attach(run_id)
+        try:
+            # Catch up from the stream while the queue buffers live events.
+            while True:
+                backlog = await bus.get_events_after(run_id, cursor, count=REPLAY_PAGE_SIZE)
+                for start in range(0, len(backlog), SSE_BATCH_MAX_EVENTS):
+                    batch = backlog[start:start + SSE_BATCH_MAX_EVENTS]
+                    for index, event in enumerate(batch):
+                        if event.kind in TERMINAL_KINDS:
+                            yield batch[:index + 1]
+                            return
+                    cursor = batch[-1].stream_id or cursor
+                    yield batch
+                if len(backlog) < REPLAY_PAGE_SIZE:
+                    break
+
+            heartbeat_sequence = 0
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    if include_heartbeats:
+                        heartbeat_sequence += 1
+                        yield [heartbeat_event(run_id, sequence=heartbeat_sequence)]
+                    continue
+                batch: List[WorkflowEvent] = []
+                while True:
+                    if item is _END or item is _DROPPED:
+                        if batch:
+                            yield batch
+                        return
+                    if _stream_id_key(item.stream_id) > _stream_id_key(cursor):
+                        cursor = item.stream_id or cursor
+                        batch.append(item)
+                        if item.kind in TERMINAL_KINDS:
+                            yield batch
+                            return
+                    if len(batch) >= SSE_BATCH_MAX_EVENTS or queue.empty():
+                        break
+                    item = queue.get_nowait()
+                if batch:
+                    yield batch
+        finally:
+            self._detach(run_id, queue)
+
+    async def close(self) -> None:
+        """Stop all upstream readers."""
+        runs, self._runs = self._runs, {}
+        tasks = [fanout.task for fanout in runs.values() if fanout.task and not fanout.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_stream_hub: Optional[StreamHub] = None
+
+
+def get_stream_hub() -> StreamHub:
+    """Get or create the singleton StreamHub."""
+    global _stream_hub
+    if _stream_hub is None:
+        _stream_hub = StreamHub()
+    return _stream_hub
+
+
+async def close_stream_hub() -> None:
+    """Stop the singleton StreamHub's upstream readers."""
+    global _stream_hub
+    if _stream_hub is not None:
+        await _stream_hub.close()
+        _stream_hub = None
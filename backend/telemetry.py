@@ -4,11 +4,20 @@ Configures TracerProvider, FastAPIInstrumentor, Azure Monitor + OTLP exporters.
 Includes structlog integration for trace/span correlation.
 """
 
+import contextlib
 import os
+from contextvars import ContextVar
+from typing import Any
+
 import structlog
 
 logger = structlog.get_logger()
 
+_UNSET: Any = object()
+# Trace context captured when a traced_span is entered, so hot paths (per-token
+# event emission) can read it without walking the OTel context stack.
+_span_trace_context: ContextVar[Any] = ContextVar("span_trace_context", default=_UNSET)
+
 # Service metadata
 SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "aviation-multi-agent")
 SERVICE_VERSION = "1.0.0"
@@ -87,15 +96,22 @@ def get_tracer(name: str = SERVICE_NAME):
         return None
 
 
+@contextlib.contextmanager
 def traced_span(tracer, span_name: str):
     """
     Create a traced span context manager.
-    Returns a no-op context manager if tracer is None.
+    No-op if tracer is None. While the span is open its trace context is
+    cached for get_cached_trace_context().
     """
     if tracer is None:
-        import contextlib
-        return contextlib.nullcontext()
-    return tracer.start_as_current_span(span_name)
+        yield None
+        return
+    with tracer.start_as_current_span(span_name) as span:
+        token = _span_trace_context.set(get_current_trace_context())
+        try:
+            yield span
+        finally:
+            _span_trace_context.reset(token)
 
 
 def get_current_trace_context() -> dict | None:
@@ -131,3 +147,14 @@ def get_current_trace_context() -> dict | None:
     except Exception as e:
         logger.warning("otel_context_lookup_failed", error=str(e))
         return None
+
+
+def get_cached_trace_context() -> dict | None:
+    """
+    Return the trace context of the innermost open traced_span.
+    Falls back to get_current_trace_context() outside of any traced_span.
+    """
+    cached = _span_trace_context.get()
+    if cached is _UNSET:
+        return get_current_trace_context()
+    return cached
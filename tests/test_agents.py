@@ -9,6 +9,9 @@ from orchestrator.agent_registry import (
     get_agent_by_id,
     select_agents_for_problem,
     AgentDefinition,
+    SCENARIO_KEYWORDS,
+    detect_scenario,
+    _detect_scenario_normalized,
 )
 
 
@@ -73,6 +76,64 @@ class TestAgentSelection:
         included, excluded = select_agents_for_problem("")
         assert len(included) >= 3
 
+    def test_selection_carries_agent_data_sources(self):
+        included, _ = select_agents_for_problem("", scenario="hub_disruption")
+        for result in included:
+            assert result.data_sources == get_agent_by_id(result.agent_id).data_sources
+
+    def test_cached_selection_returns_fresh_lists(self):
+        first, _ = select_agents_for_problem("", scenario="diversion")
+        first.clear()
+        second, _ = select_agents_for_problem("", scenario="diversion")
+        assert second and second[0].reason == "Required for diversion scenario"
+
+    def test_included_only_selection(self):
+        included, excluded = select_agents_for_problem("", scenario="crew_fatigue", include_excluded=False)
+        full, _ = select_agents_for_problem("", scenario="crew_fatigue")
+        assert excluded == []
+        assert [a.agent_id for a in included] == [a.agent_id for a in full]
+
+    def test_unknown_scenario_falls_back_to_hub_agents(self):
+        included, _ = select_agents_for_problem("", scenario="unmapped")
+        hub, _ = select_agents_for_problem("", scenario="hub_disruption")
+        assert [a.agent_id for a in included] == [a.agent_id for a in hub]
+        assert included[0].reason == "Required for unmapped scenario"
+
+
+class TestScenarioDetection:
+    @staticmethod
+    def _substring_scores(problem):
+        lowered = problem.lower()
+        scores = {}
+        for scenario, keywords in SCENARIO_KEYWORDS.items():
+            score = sum(1 for kw in keywords if kw in lowered)
+            if score:
+                scores[scenario] = score
+        return max(scores, key=lambda k: scores[k]) if scores else "hub_disruption"
+
+    def test_matches_substring_scoring(self):
+        problems = [
+            "",
+            "Medical emergency on board, need to divert to an alternate",
+            "Ground stop at ORD hub after thunderstorm; multiple flights grounded",
+            "MEL deferred item on A320, predictive maintenance for component failure",
+            "Crew fatigue: FAR 117 duty limit and crew rest after a red-eye",
+            "Smell of smoke in cabin",
+            "Emergency diversion with fatigue concerns",
+        ]
+        for problem in problems:
+            assert detect_scenario(problem) == self._substring_scores(problem), problem
+
+    def test_detection_is_cached_on_normalized_text(self):
+        assert detect_scenario("  Divert to ALTERNATE ") == "diversion"
+        hits = _detect_scenario_normalized.cache_info().hits
+        assert detect_scenario("divert to alternate") == "diversion"
+        assert _detect_scenario_normalized.cache_info().hits == hits + 1
+
+    def test_overlapping_keywords_each_count(self):
+        # "medical emergency" contains "emergency": both keywords score.
+        assert detect_scenario("medical emergency, fatigue, crew rest") == "diversion"
+
 
 class TestAgentDefinition:
     def test_agent_definition_model(self):
@@ -3,14 +3,27 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 
+import orjson
 import pytest
 
 from agents.tools import retriever_query, retriever_query_multi, source_errors_from_citations
 from agents.tools.coordinator_tools import generate_plan, rank_options
-from data_sources.unified_retriever import AsyncUnifiedRetriever, _is_safe_read_only_sql
+from data_sources.unified_retriever import (
+    AsyncUnifiedRetriever,
+    _extract_airports_from_query,
+    _records_to_dicts,
+    _SQLTemplateCache,
+    _airport_agnostic_signature,
+    _lacks_required_entities,
+    _is_safe_read_only_sql,
+)
+from data_sources.embedding_cache import EmbeddingDiskCache
+from data_sources.schema_provider import AsyncSchemaProvider
 from orchestrator.agent_registry import AgentSelectionResult
+from schemas.events import EventKind, WorkflowEvent
 from orchestrator.engine import OrchestratorEngine
 from orchestrator.trace_emitter import TraceEmitter
 import main as backend_main
@@ -38,6 +51,12 @@ def test_sql_read_only_validator_blocks_mutation_and_multi_statement():
     assert code_multi == "SQL_MULTI_STATEMENT"
 
 
+def test_extract_airports_dedupes_codes_and_cities_in_stable_order():
+    codes = _extract_airports_from_query("Delays at ORD and KORD from Chicago to new york, then JFK")
+    assert codes == ["KORD", "ORD", "KJFK", "JFK", "KLGA", "KEWR", "KMDW"]
+    assert _extract_airports_from_query("What time does the gate open?") == []
+
+
 @pytest.mark.asyncio
 async def test_graph_relation_resolution_uses_visible_schema_order():
     class _FakeConn:
@@ -59,6 +78,471 @@ async def test_graph_relation_resolution_uses_visible_schema_order():
     assert relation == "demo.ops_graph_edges"
 
 
+def test_parse_kusto_response_uses_first_frame_with_rows():
+    payload = {
+        "Tables": [
+            {"Columns": [{"ColumnName": "x"}], "Rows": []},
+            {
+                "Columns": [{"ColumnName": "callsign"}, {"ColumnName": "velocity"}],
+                "Rows": [["UAL1", 240.5], {"callsign": "DAL2", "velocity": 0}, "junk"],
+            },
+        ]
+    }
+    rows = AsyncUnifiedRetriever()._parse_kusto_response(payload)
+    assert rows == [
+        {"callsign": "UAL1", "velocity": 240.5},
+        {"callsign": "DAL2", "velocity": 0},
+    ]
+
+
+def test_airport_agnostic_signature_masks_codes_and_cities():
+    assert _airport_agnostic_signature("Average delay at ORD") == _airport_agnostic_signature("average delay at  dfw")
+    assert _airport_agnostic_signature("Average delay at ORD") == "average delay at <iata>"
+    assert _airport_agnostic_signature("Average delay at Chicago") == "average delay at <city>"
+    assert _airport_agnostic_signature("Show DATA for KORD") == "show data for <icao>"
+
+
+def test_lacks_required_entities_only_for_unanchored_questions():
+    assert _lacks_required_entities("show me the flight schedule", [], "FlightSchedule")
+    assert not _lacks_required_entities("show me the flight schedule", ["ORD"], "FlightSchedule")
+    assert not _lacks_required_entities("status of UA123", [], "FlightSchedule")
+    assert not _lacks_required_entities("flights in the last 2 hours", [], "LivePositions")
+    assert not _lacks_required_entities("how many delayed flights", [], "HistoricalDelays")
+    assert not _lacks_required_entities("show me the flight schedule", [], "NOTAM")
+
+
+@pytest.mark.asyncio
+async def test_query_sql_skips_writer_for_entity_free_query():
+    class _Writer:
+        async def generate(self, **kwargs):
+            raise AssertionError("writer should not be called")
+
+    retriever = AsyncUnifiedRetriever()
+    retriever._pg_pool = object()
+    retriever._sql_writer = _Writer()
+
+    rows, citations = await retriever.query_sql("show me the flight schedule")
+    assert rows == []
+    assert citations[0].title == "No entities in query"
+
+
+def test_sql_template_cache_rebinds_quoted_airport_literals_only():
+    cache = _SQLTemplateCache()
+    cache.store("average delay at ORD", ["KORD", "ORD"], "SELECT AVG(dep_delay) FROM bts_ontime_reporting WHERE origin = 'ORD'")
+
+    assert cache.lookup("average delay at ORD", ["KORD", "ORD"]).endswith("origin = 'ORD'")
+    assert cache.lookup("average delay at DFW", ["KDFW", "DFW"]).endswith("origin = 'DFW'")
+    assert cache.lookup("average delay at JFK and LGA", ["KJFK", "JFK", "KLGA", "LGA"]) is None
+    assert cache.lookup("total delay at ORD", ["KORD", "ORD"]) is None
+
+    cache.store("average delay at ORD", ["KORD", "ORD"], "SELECT * FROM bts_ontime_reporting WHERE origin LIKE '%ORD%'")
+    assert cache.lookup("average delay at DFW", ["KDFW", "DFW"]) is None
+
+
+def test_sql_template_cache_never_rebinds_city_names_onto_codes():
+    cache = _SQLTemplateCache()
+    cache.store("average delay at ORD", ["KORD", "ORD"], "SELECT AVG(dep_delay) FROM bts_ontime_reporting WHERE origin = 'ORD'")
+    city_query = "average delay at chicago"
+    assert cache.lookup(city_query, _extract_airports_from_query(city_query)) is None
+
+    cache.store(city_query, _extract_airports_from_query(city_query), "SELECT 1 WHERE origin IN ('ORD', 'MDW')")
+    assert cache.lookup(city_query, _extract_airports_from_query(city_query)).endswith("('ORD', 'MDW')")
+    other_city = "average delay at dallas"
+    assert cache.lookup(other_city, _extract_airports_from_query(other_city)) is None
+
+
+def test_sql_template_cache_rebinds_codes_by_position_in_text():
+    cache = _SQLTemplateCache()
+    sql = "SELECT AVG(arr_delay) FROM bts_ontime_reporting WHERE origin = 'ORD' AND dest = 'DFW'"
+    stored = "average delay from ORD to DFW"
+    cache.store(stored, _extract_airports_from_query(stored), sql)
+
+    swapped = "average delay from DFW to ORD"
+    assert cache.lookup(swapped, _extract_airports_from_query(swapped)).endswith("origin = 'DFW' AND dest = 'ORD'")
+    fresh = "average delay from ATL to JFK"
+    assert cache.lookup(fresh, _extract_airports_from_query(fresh)).endswith("origin = 'ATL' AND dest = 'JFK'")
+
+    mixed_city = "average delay from chicago to DFW"
+    assert cache.lookup(mixed_city, _extract_airports_from_query(mixed_city)) is None
+    icao = "average delay from KATL to DFW"
+    assert cache.lookup(icao, _extract_airports_from_query(icao)) is None
+
+
+@pytest.mark.asyncio
+async def test_query_fabric_sql_reuses_template_for_new_airport():
+    retriever = AsyncUnifiedRetriever()
+    retriever._fabric_sql_endpoint = "https://fabric.example/sql"
+    generated: list[str] = []
+    posted: list[str] = []
+
+    async def _token():
+        return "token"
+
+    async def _generate(**kwargs):
+        generated.append(kwargs["user_query"])
+        return "SELECT TOP 10 * FROM bts_ontime_reporting WHERE origin = 'ORD'"
+
+    class _Resp:
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"results": [{"origin": "x"}]}
+
+    class _Http:
+        async def post(self, url, json=None, headers=None):
+            posted.append(json["query"])
+            return _Resp()
+
+    async def _http():
+        return _Http()
+
+    retriever._get_fabric_token = _token
+    retriever._sql_writer.generate = _generate
+    retriever._get_http = _http
+
+    await retriever.query_fabric_sql("historical delays at ORD")
+    await retriever.query_fabric_sql("historical delays at DFW")
+
+    assert generated == ["historical delays at ORD"]
+    assert posted[1].endswith("origin = 'DFW'")
+
+
+@pytest.mark.asyncio
+async def test_records_to_dicts_offloads_large_results(monkeypatch):
+    offloaded: list[bool] = []
+    real_to_thread = asyncio.to_thread
+
+    async def _spy_to_thread(func, *args, **kwargs):
+        offloaded.append(True)
+        return await real_to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", _spy_to_thread)
+    small = [{"a": 1, "b": 2}]
+    large = [{"a": i, "b": i} for i in range(5000)]
+
+    assert await _records_to_dicts([]) == []
+    assert await _records_to_dicts(small) == small
+    assert offloaded == []
+    assert await _records_to_dicts(large) == large
+    assert offloaded == [True]
+
+
+@pytest.mark.asyncio
+async def test_query_nosql_fans_out_per_partition_when_partitioned_by_location(monkeypatch):
+    monkeypatch.setenv("AZURE_COSMOS_ENDPOINT", "https://cosmos.example")
+    monkeypatch.setenv("AZURE_COSMOS_PARTITION_KEY", "/location")
+    calls: list[dict] = []
+
+    class _FakeContainer:
+        def query_items(self, query, parameters=None, partition_key=None, **kwargs):
+            calls.append({"query": query, "partition_key": partition_key, **kwargs})
+
+            async def _iter():
+                yield {"id": "shared", "location": partition_key}
+                yield {"id": f"notam-{partition_key}", "location": partition_key}
+
+            return _iter()
+
+    retriever = AsyncUnifiedRetriever()
+    retriever._cosmos_container = _FakeContainer()
+    rows, citations = await retriever.query_nosql("NOTAMs for ORD and DFW")
+
+    assert sorted(c["partition_key"] for c in calls) == ["DFW", "KDFW", "KORD", "ORD"]
+    assert all("enable_cross_partition_query" not in c for c in calls)
+    ids = [row["id"] for row in rows]
+    assert ids.count("shared") == 1
+    assert len(ids) == len(set(ids)) == 5
+    assert citations[0].dataset == "cosmos_notams"
+
+
+@pytest.mark.asyncio
+async def test_query_semantic_projects_out_vector_after_first_search(monkeypatch):
+    monkeypatch.setenv("AZURE_SEARCH_ENDPOINT", "https://search.example")
+    monkeypatch.setenv("AZURE_SEARCH_ADMIN_KEY", "key")
+    selects: list = []
+
+    class _FakeResults:
+        def __init__(self, docs):
+            self._docs = docs
+
+        def __aiter__(self):
+            return self._iter()
+
+        async def _iter(self):
+            for doc in self._docs:
+                yield doc
+
+    class _FakeSearchClient:
+        async def search(self, search_text, vector_queries=None, top=5, select=None):
+            selects.append(select)
+            doc = {"id": "1", "title": "T", "content": "body", "@search.score": 1.2}
+            if select is None:
+                doc["content_vector"] = [0.1] * 4
+            return _FakeResults([doc])
+
+    retriever = AsyncUnifiedRetriever()
+
+    async def _client(*args):
+        return _FakeSearchClient()
+
+    async def _no_embedding(text):
+        return []
+
+    retriever._get_search_client = _client
+    retriever.get_embedding = _no_embedding
+
+    first_rows, _ = await retriever.query_semantic("deicing", source="VECTOR_AIRPORT")
+    second_rows, _ = await retriever.query_semantic("deicing", source="VECTOR_AIRPORT")
+    await retriever.query_semantic("deicing", source="VECTOR_AIRPORT", include_vector=True)
+
+    assert selects == [None, ["id", "title", "content"], None]
+    assert first_rows == second_rows
+    assert "content_vector" not in first_rows[0]
+
+
+@pytest.mark.asyncio
+async def test_iter_nosql_stops_paging_when_caller_breaks(monkeypatch):
+    monkeypatch.delenv("AZURE_COSMOS_PARTITION_KEY", raising=False)
+    pulled: list[int] = []
+
+    class _FakeContainer:
+        def query_items(self, query, parameters=None, **kwargs):
+            assert "LIMIT 5" in query
+            assert kwargs["max_item_count"] == 5
+
+            async def _iter():
+                for i in range(100):
+                    pulled.append(i)
+                    yield {"id": str(i)}
+
+            return _iter()
+
+    retriever = AsyncUnifiedRetriever()
+    retriever._cosmos_partition_key = ""
+    retriever._cosmos_container = _FakeContainer()
+
+    first = None
+    async for item in retriever.iter_nosql("NOTAMs at ORD", limit=5):
+        first = item
+        break
+    assert first == {"id": "0"}
+    assert pulled == [0]
+
+    rows = [item async for item in retriever.iter_nosql("NOTAMs", limit=5)]
+    assert len(rows) == 5
+
+
+@pytest.mark.asyncio
+async def test_graph_pg_fallback_resolves_relation_once_and_reuses_statement():
+    class _FakeConn:
+        def __init__(self):
+            self.resolutions = 0
+            self.fetched_sql: list[str] = []
+
+        async def fetchval(self, query, *args):
+            self.resolutions += 1
+            return "demo.ops_graph_edges"
+
+        async def fetch(self, query, *args):
+            if "information_schema.columns" in query:
+                return [{"column_name": "source_id"}, {"column_name": "target_id"}]
+            self.fetched_sql.append(query)
+            return [{"source_id": args[0], "target_id": "KDFW", "edge_type": "link", "depth": 1}]
+
+    class _FakeAcquire:
+        def __init__(self, conn):
+            self._conn = conn
+
+        async def __aenter__(self):
+            return self._conn
+
+        async def __aexit__(self, *exc):
+            return False
+
+    conn = _FakeConn()
+
+    class _FakePool:
+        def acquire(self):
+            return _FakeAcquire(conn)
+
+    retriever = AsyncUnifiedRetriever(pg_pool=_FakePool())
+    rows_first, _ = await retriever._query_graph_pg_fallback("ORD connections", 2)
+    rows_second, _ = await retriever._query_graph_pg_fallback("DFW connections", 2)
+
+    assert rows_first and rows_second
+    assert conn.resolutions == 1
+    assert len(conn.fetched_sql) == 2
+    assert conn.fetched_sql[0] is conn.fetched_sql[1]
+    assert "demo.ops_graph_edges" in conn.fetched_sql[0]
+
+
+@pytest.mark.asyncio
+async def test_fabric_token_is_cached_and_refreshed_once(monkeypatch):
+    monkeypatch.delenv("FABRIC_BEARER_TOKEN", raising=False)
+    retriever = AsyncUnifiedRetriever()
+    calls = 0
+
+    async def _acquire():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return f"token-{calls}", time.time() + 3600
+
+    retriever._acquire_fabric_token = _acquire
+    tokens = await asyncio.gather(*(retriever._get_fabric_token() for _ in range(3)))
+    assert tokens == ["token-1"] * 3
+    assert await retriever._get_fabric_token() == "token-1"
+    assert calls == 1
+
+    # Near expiry the token is re-acquired.
+    retriever._fabric_token = ("token-1", time.time() + 5)
+    assert await retriever._get_fabric_token() == "token-2"
+
+
+@pytest.mark.asyncio
+async def test_embedding_disk_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "embed.sqlite3")
+    cache = EmbeddingDiskCache(path)
+    await cache.put("text-embedding-3-small", "ORD thunderstorm", [0.25, -0.5, 1.0])
+    cache.close()
+
+    reopened = EmbeddingDiskCache(path)
+    cached = await reopened.get("text-embedding-3-small", "ORD thunderstorm")
+    assert cached.typecode == "f"
+    assert cached.tolist() == [0.25, -0.5, 1.0]
+    assert await reopened.get("text-embedding-3-large", "ORD thunderstorm") is None
+    assert await reopened.get("text-embedding-3-small", "DFW thunderstorm") is None
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_get_embedding_single_flights_and_caches_packed_float32(monkeypatch):
+    import data_sources.azure_client as azure_client
+
+    calls = 0
+
+    class _Embeddings:
+        async def create(self, model, input):
+            nonlocal calls
+            calls += 1
+
+            class _Item:
+                embedding = [0.5, 0.25, -1.0]
+
+            class _Response:
+                data = [_Item()]
+
+            return _Response()
+
+    class _Client:
+        embeddings = _Embeddings()
+
+    async def _shared_client(**kwargs):
+        return _Client(), "api-key"
+
+    monkeypatch.setattr(azure_client, "get_shared_async_client", _shared_client)
+    retriever = AsyncUnifiedRetriever()
+    retriever._embedding_disk_cache = None
+
+    first = await asyncio.gather(*(retriever.get_embedding("ORD ground stop") for _ in range(3)))
+    assert first == [[0.5, 0.25, -1.0]] * 3
+    assert await retriever.get_embedding("ORD ground stop") == [0.5, 0.25, -1.0]
+    assert calls == 1
+    assert retriever._embedding_cache["ORD ground stop"].typecode == "f"
+    assert retriever._embedding_inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_sql_writer_puts_schema_first_and_reuses_recent_results(monkeypatch):
+    import json
+
+    from data_sources import query_writers
+
+    sent = []
+
+    class _Completions:
+        async def create(self, **kwargs):
+            sent.append(kwargs["messages"])
+
+            class _Message:
+                content = "```sql\nSELECT 1\n```"
+
+            class _Choice:
+                message = _Message()
+
+            class _Response:
+                choices = [_Choice()]
+
+            return _Response()
+
+    class _Chat:
+        completions = _Completions()
+
+    class _Client:
+        chat = _Chat()
+
+    async def _shared_client(**kwargs):
+        return _Client(), "api-key"
+
+    monkeypatch.setattr(query_writers, "get_shared_async_client", _shared_client)
+    writer = query_writers.AsyncSQLWriter(model="gpt-5-mini")
+    schema = {"tables": {"ops_flight_legs": {"columns": {"leg_id": "text"}}}}
+    args = ("delays at ORD", "flight_schedule", schema, {"airports": ["ORD"]}, {"horizon_min": 120})
+
+    assert await writer.generate(*args) == "SELECT 1"
+    assert await writer.generate(*args) == "SELECT 1"
+    assert len(sent) == 1
+
+    system, user = sent[0]
+    assert system["content"] is query_writers.SQL_WRITER_SYSTEM_PROMPT
+    payload = json.loads(user["content"])
+    assert list(payload)[0] == "sql_schema"
+    assert list(payload)[-1] == "user_query"
+    assert payload["sql_schema"] == schema
+
+    await writer.generate("delays at ATL", *args[1:])
+    assert len(sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_snapshot_coalesces_concurrent_refreshes():
+    calls = 0
+
+    class _Provider(AsyncSchemaProvider):
+        async def _introspect_sql_schema(self):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"tables": {"ops_flight_legs": {"columns": {"leg_id": "text"}}}}
+
+    provider = _Provider(pg_pool=object())
+    snapshots = await asyncio.gather(*(provider.snapshot() for _ in range(3)))
+    assert calls == 1
+    assert all(snap is snapshots[0] for snap in snapshots)
+
+
+@pytest.mark.asyncio
+async def test_query_multiple_collects_successes_alongside_failures():
+    retriever = AsyncUnifiedRetriever()
+
+    async def _ok(query, **kwargs):
+        return [{"id": 1}], []
+
+    async def _boom(query, **kwargs):
+        raise RuntimeError("kusto down")
+
+    retriever.query_sql = _ok
+    retriever.query_kql = _boom
+    results = await retriever.query_multiple("q", ["SQL", "KQL", "UNKNOWN"])
+
+    assert set(results) == {"SQL", "KQL"}
+    assert results["SQL"] == ([{"id": 1}], [])
+    rows, citations = results["KQL"]
+    assert rows == []
+    assert citations[0].title == "Error: kusto down"
+
+
 @pytest.mark.asyncio
 async def test_retriever_query_timeout_returns_explicit_error_citation():
     async def _slow():
@@ -231,6 +715,125 @@ def test_readiness_data_source_checks_include_all_sources(monkeypatch):
     assert checks["SQL"]["reachable"] is False
 
 
+@pytest.mark.asyncio
+async def test_readiness_serves_cached_probe_and_reprobes_when_stale(monkeypatch):
+    import json
+
+    probes = 0
+
+    async def _probe():
+        nonlocal probes
+        probes += 1
+        backend_main._health.update(
+            redis=True, postgres=True, checked_at="now", checked_monotonic=time.monotonic(),
+        )
+
+    monkeypatch.setattr(backend_main, "_probe_dependencies", _probe)
+    monkeypatch.setattr(backend_main, "_health", {"redis": False, "postgres": False, "checked_at": None, "checked_monotonic": 0.0})
+    monkeypatch.delenv("STRICT_DATA_SOURCE_READINESS", raising=False)
+
+    first = await backend_main.readiness_check()
+    second = await backend_main.readiness_check()
+    assert probes == 1
+    assert first.status_code == second.status_code == 200
+    assert json.loads(second.body)["checks"]["redis"] is True
+
+    backend_main._health["checked_monotonic"] -= 10 * backend_main.HEALTH_PROBE_INTERVAL_SECONDS
+    await backend_main.readiness_check()
+    assert probes == 2
+
+
+@pytest.mark.asyncio
+async def test_list_workflows_serves_prebuilt_catalog():
+    import json
+
+    response = await backend_main.list_workflows()
+    body = json.loads(response.body)
+    assert response.media_type == "application/json"
+    assert body["count"] == len(backend_main.WORKFLOW_SMOKE_CASES)
+    assert body["workflows"] == backend_main.WORKFLOW_SMOKE_CASES
+
+
+def test_parse_solve_request_matches_model_defaults_and_rejects_bad_shapes():
+    from fastapi.exceptions import RequestValidationError
+
+    parsed = backend_main._parse_solve_request(
+        b'{"problem": "ORD ground stop", "autonomous_turn_limits": {"weather": 3, "crew": "2"}}'
+    )
+    assert parsed.problem == "ORD ground stop"
+    assert parsed.workflow_type == "sequential"
+    assert parsed.orchestration_mode is None
+    assert parsed.autonomous_turn_limits == {"weather": 3, "crew": 2}
+
+    # Integer fields coerce exactly as SolveRequest's lax validation does.
+    for raw in (5, "5", 5.0, "5.0"):
+        body = orjson.dumps({"problem": "x", "max_executor_invocations": raw})
+        assert backend_main._parse_solve_request(body).max_executor_invocations == 5
+        assert backend_main.SolveRequest.model_validate_json(body).max_executor_invocations == 5
+
+    for body in (
+        b"[]", b"{}", b'{"problem": 1}', b'{"problem": "x", "max_executor_invocations": "five"}',
+        b'{"problem": "x", "max_executor_invocations": 2.5}', b'{"problem": "x", "config": []}', b"{",
+        b'{"problem": "x", "autonomous_turn_limits": {"a": "zz"}}',
+        b'{"problem": "x", "autonomous_turn_limits": {"a": 1.5}}',
+    ):
+        with pytest.raises(RequestValidationError) as exc:
+            backend_main._parse_solve_request(body)
+        errors = exc.value.errors()
+        assert errors and all(error["loc"][0] == "body" for error in errors)
+
+    with pytest.raises(RequestValidationError) as exc:
+        backend_main._parse_solve_request(b'{"problem": "x", "autonomous_turn_limits": {"a": "zz"}}')
+    assert exc.value.errors()[0]["loc"] == ("body", "autonomous_turn_limits", "a")
+
+
+def test_select_run_agents_lists_included_before_excluded():
+    scenario, selected, agent_roster = backend_main._select_run_agents("Aircraft must divert, fuel critical")
+    assert scenario == "diversion"
+    agent_infos = [backend_main.AgentInfo.model_validate(info) for info in orjson.loads(agent_roster)]
+    assert len(agent_infos) == 20
+    assert [info.id for info in agent_infos[: len(selected)]] == [a.agent_id for a in selected]
+    assert all(info.included for info in agent_infos[: len(selected)])
+    assert not any(info.included for info in agent_infos[len(selected):])
+    assert agent_infos[0].dataSources
+    assert backend_main._select_run_agents("divert to alternate")[2] is agent_roster
+
+
+@pytest.mark.asyncio
+async def test_list_runs_serializes_rows_in_one_pass(monkeypatch):
+    import json
+
+    from schemas.runs import RunMetadata
+
+    runs = [RunMetadata(problem_description="ORD ground stop"), RunMetadata(problem_description="JFK diversion")]
+
+    class _Store:
+        async def list_runs(self, status, limit, offset):
+            return runs
+
+    async def _get_store():
+        return _Store()
+
+    monkeypatch.setattr(backend_main, "get_run_store", _get_store)
+    response = await backend_main.list_runs(limit=10, offset=5)
+    body = json.loads(response.body)
+    assert body["count"] == 2 and body["limit"] == 10 and body["offset"] == 5
+    assert [r["problem_description"] for r in body["runs"]] == ["ORD ground stop", "JFK diversion"]
+    assert body["runs"][0]["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_app_state_run_store_skips_singleton_lookup(monkeypatch):
+    bound = object()
+
+    async def _get_store():
+        raise AssertionError("bound run store should be used")
+
+    monkeypatch.setattr(backend_main, "get_run_store", _get_store)
+    monkeypatch.setattr(backend_main.app.state, "run_store", bound, raising=False)
+    assert await backend_main._app_run_store() is bound
+
+
 def test_normalize_workflow_event_payload_handles_non_dict():
     payload = backend_main._normalize_workflow_event_payload(["unexpected", "payload"])
     assert payload["payload_type"] == "list"
@@ -267,3 +870,35 @@ async def test_generate_plan_returns_structured_error_for_invalid_shape():
     result = await generate_plan(["bad", ["still_bad"]], timeline_entries=[{"time": "T+0", "action": "noop", "agent": "coordinator"}])
     assert result["status"] == "invalid_selected_option_shape"
     assert result["errorCode"] == "coordinator_options_invalid_shape"
+
+
+def test_resolve_event_kind_prefers_enum_values_then_aliases():
+    assert backend_main.resolve_event_kind("run_failed") is EventKind.RUN_FAILED
+    assert backend_main.resolve_event_kind("agent.started") is EventKind.AGENT_STARTED_DOT
+    assert backend_main.resolve_event_kind("workflow.failed") is EventKind.RUN_FAILED
+    assert backend_main.resolve_event_kind("orchestrator.run_started") is EventKind.WORKFLOW_STATUS
+    assert backend_main.resolve_event_kind("orchestrator.run_failed") is EventKind.WORKFLOW_STATUS
+    assert backend_main.resolve_event_kind("executor.failed") is EventKind.PROGRESS_UPDATE
+    assert backend_main.resolve_event_kind("workflow.anything") is EventKind.WORKFLOW_STATUS
+    assert backend_main.resolve_event_kind("something.else") is EventKind.PROGRESS_UPDATE
+
+
+@pytest.mark.asyncio
+async def test_emit_event_publishes_serializable_workflow_event():
+    published = []
+
+    class _Publisher:
+        async def submit(self, event, droppable=False):
+            published.append((event, droppable))
+
+    await backend_main._emit_event(
+        _Publisher(), "run-1", "handoff", "llm_directed", "agent.streaming",
+        {"agentName": "weather", "message": "token", "stage_id": "execute_workflow"},
+    )
+    event, droppable = published[0]
+    assert droppable is True
+    assert event.kind is EventKind.AGENT_STREAMING
+    assert event.sequence == 0 and event.event_id
+    restored = WorkflowEvent.model_validate_json(event.model_dump_json())
+    assert restored.agent_name == "weather"
+    assert restored.payload["workflow_type"] == "handoff"
@@ -0,0 +1,137 @@
+"""Tests for the Redis Streams event bus, per-run event publisher and span tracing."""
+
+from __future__ import annotations
+
+import pytest
+
+from schemas.events import EventKind, WorkflowEvent
+from services.event_bus import EventBus, RunEventPublisher
+
+
+@pytest.mark.asyncio
+async def test_event_bus_subscribe_reads_from_blocking_client():
+    event = WorkflowEvent(run_id="run-1", kind=EventKind.RUN_COMPLETED, message="done")
+
+    class _Blocking:
+        async def xread(self, streams, count, block):
+            return [("av:events:run-1", [("1-0", {"data": event.model_dump_json()})])]
+
+    class _General:
+        async def xread(self, *args, **kwargs):
+            raise AssertionError("subscriptions must not hold general pool connections")
+
+    bus = EventBus(_General(), _Blocking())
+    received = [e async for e in bus.subscribe("run-1", include_heartbeats=False)]
+    assert [e.kind for e in received] == [EventKind.RUN_COMPLETED]
+    assert bus.redis is bus.general
+
+
+def test_traced_span_caches_trace_context_per_span(monkeypatch):
+    from opentelemetry.sdk.trace import TracerProvider
+
+    import telemetry
+
+    tracer = TracerProvider().get_tracer("test")
+    with telemetry.traced_span(tracer, "outer"):
+        outer = telemetry.get_cached_trace_context()
+        assert outer == telemetry.get_current_trace_context()
+        with telemetry.traced_span(tracer, "inner"):
+            inner = telemetry.get_cached_trace_context()
+            assert inner["trace_id"] == outer["trace_id"]
+            assert inner["span_id"] != outer["span_id"]
+            monkeypatch.setattr(telemetry, "get_current_trace_context", lambda: pytest.fail("re-read"))
+            assert telemetry.get_cached_trace_context() is inner
+            monkeypatch.undo()
+        assert telemetry.get_cached_trace_context() is outer
+
+
+class _FakePipeline:
+    def __init__(self, calls):
+        self.calls = calls
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.queued.append(fields["kind"])
+
+    def expire(self, key, seconds):
+        self.queued.append("expire")
+
+    async def execute(self):
+        self.calls.append(list(self.queued))
+        return [f"{len(self.calls)}-{i}" for i in range(len(self.queued))]
+
+
+class _PipelineRedis:
+    def __init__(self):
+        self.calls = []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.calls)
+
+
+@pytest.mark.asyncio
+async def test_event_bus_publish_many_pipelines_in_order():
+    redis_client = _PipelineRedis()
+    bus = EventBus(redis_client)
+    events = [
+        WorkflowEvent(run_id="run-1", kind=EventKind.AGENT_STREAMING, message="t"),
+        WorkflowEvent(run_id="run-1", kind=EventKind.RUN_FAILED, message="boom"),
+        WorkflowEvent(run_id="run-1", kind=EventKind.PROGRESS_UPDATE, message="step"),
+    ]
+    await bus.publish_many(events)
+    assert redis_client.calls == [["agent.streaming", "run_failed", "expire", "progress_update"]]
+    assert [e.stream_id for e in events] == ["1-0", "1-1", "1-3"]
+    assert [e.sequence for e in events] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_run_event_publisher_batches_and_sheds_streaming_when_full():
+    redis_client = _PipelineRedis()
+    publisher = RunEventPublisher(EventBus(redis_client), "run-1", maxsize=2)
+
+    # The consumer has not run yet, so the queue fills synchronously.
+    for _ in range(3):
+        await publisher.submit(
+            WorkflowEvent(run_id="run-1", kind=EventKind.AGENT_STREAMING, message="t"), droppable=True,
+        )
+    assert publisher.dropped == 1
+
+    await publisher.submit(WorkflowEvent(run_id="run-1", kind=EventKind.PROGRESS_UPDATE, message="step"))
+    await publisher.close()
+
+    published = [kind for batch in redis_client.calls for kind in batch]
+    assert published == ["agent.streaming", "agent.streaming", "progress_update"]
+    assert len(redis_client.calls) <= 2
+
+
+@pytest.mark.asyncio
+async def test_run_event_publisher_coalesces_queued_progress_updates():
+    redis_client = _PipelineRedis()
+    publisher = RunEventPublisher(EventBus(redis_client), "run-1")
+
+    await publisher.submit(WorkflowEvent(
+        run_id="run-1", kind=EventKind.PROGRESS_UPDATE, message="a",
+        payload={"currentStep": "select_agents", "runProgressPct": 0.0},
+    ))
+    await publisher.submit(WorkflowEvent(run_id="run-1", kind=EventKind.STAGE_STARTED, message="s"))
+    await publisher.submit(WorkflowEvent(
+        run_id="run-1", kind=EventKind.PROGRESS_UPDATE, message="b", payload={"currentStep": "activate_agents"},
+    ))
+    assert publisher.coalesced == 1
+    await publisher.drain()
+
+    # Once the merged update has been written, the next one is queued afresh.
+    await publisher.submit(WorkflowEvent(
+        run_id="run-1", kind=EventKind.PROGRESS_UPDATE, message="c", payload={"currentStep": "execute_workflow"},
+    ))
+    await publisher.close()
+
+    published = [kind for batch in redis_client.calls for kind in batch]
+    assert published == ["progress_update", "stage_started", "progress_update"]
+    assert publisher.coalesced == 1
@@ -109,6 +109,27 @@ class TestWorkflowEvent:
         assert data["trace_id"] == "abc"
         assert data["stream_id"] == "1740000000000-1"
 
+    def test_sse_data_serialized_once_per_stream_id(self):
+        event = WorkflowEvent(run_id="test-run", kind=EventKind.AGENT_STREAMING, message="tok")
+        event.stream_id = "1-0"
+        first = event.to_sse_data()
+        assert event.to_sse_data() is first
+        event.stream_id = "2-0"
+        assert json.loads(event.to_sse_data())["stream_id"] == "2-0"
+
+    def test_stream_entry_sse_data_matches_reserialization(self):
+        stored = WorkflowEvent(
+            run_id="test-run",
+            kind=EventKind.AGENT_STREAMING,
+            message='quoted "stream_id":null text',
+            payload={"stream_id": None, "score": 1.5},
+        ).model_dump_json()
+        event = WorkflowEvent.from_stream_entry(stored, "7-0")
+        spliced = event.to_sse_data()
+        assert event.stream_id == "7-0"
+        assert spliced == event.model_dump_json()
+        assert json.loads(spliced)["payload"]["stream_id"] is None
+
 
 class TestEventFactories:
     def test_heartbeat_event(self):
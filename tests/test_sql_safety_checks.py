@@ -1,6 +1,6 @@
 """Regression tests for SQL read-only safety checks."""
 
-from data_sources.unified_retriever import _is_safe_read_only_sql
+from data_sources.unified_retriever import _is_safe_read_only_sql, _stable_query_id
 
 
 def test_read_only_sql_allows_semicolon_in_string_literal():
@@ -19,3 +19,12 @@ def test_read_only_sql_blocks_real_multi_statement():
     is_safe, reason = _is_safe_read_only_sql("SELECT 1; DROP TABLE flights")
     assert is_safe is False
     assert reason == "SQL_MULTI_STATEMENT"
+
+
+def test_stable_query_id_is_deterministic_fixed_length_hex():
+    sql = "SELECT * FROM demo.ops_flight_legs LIMIT 5"
+    first = _stable_query_id(sql)
+    assert first == _stable_query_id(sql)
+    assert len(first) == 12
+    int(first, 16)
+    assert first != _stable_query_id(sql + " ")
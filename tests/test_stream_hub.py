@@ -0,0 +1,134 @@
+"""Tests for the per-run SSE fan-out hub."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from schemas.events import EventKind, WorkflowEvent
+from services.stream_hub import StreamHub
+
+
+def _event(stream_id: str, kind: EventKind = EventKind.AGENT_STREAMING) -> WorkflowEvent:
+    event = WorkflowEvent(run_id="run-1", kind=kind, message=stream_id)
+    event.stream_id = stream_id
+    return event
+
+
+class _FakeBus:
+    def __init__(self, history):
+        self.history = list(history)
+        self.live: asyncio.Queue = asyncio.Queue()
+        self.upstream_reads = 0
+
+    async def resolve_start_id(self, run_id, last_event_id=None):
+        return last_event_id or "0"
+
+    async def latest_stream_id(self, run_id):
+        return self.history[-1].stream_id if self.history else "0"
+
+    async def get_events_after(self, run_id, cursor, count=1000):
+        return [e for e in self.history if cursor == "0" or e.stream_id > cursor][:count]
+
+    async def subscribe(self, run_id, last_event_id=None, include_heartbeats=True):
+        self.upstream_reads += 1
+        while True:
+            event = await self.live.get()
+            await asyncio.sleep(0.001)
+            self.history.append(event)
+            yield event
+            if event.kind == EventKind.RUN_COMPLETED:
+                return
+
+
+async def _collect(hub, **kwargs):
+    return [e.stream_id async for e in hub.subscribe("run-1", include_heartbeats=False, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_stream_hub_shares_one_upstream_and_replays_backlog():
+    bus = _FakeBus([_event("1-0"), _event("2-0")])
+    hub = StreamHub(event_bus=bus)
+
+    first = asyncio.create_task(_collect(hub))
+    second = asyncio.create_task(_collect(hub, last_event_id="1-0"))
+    await asyncio.sleep(0.01)
+    bus.live.put_nowait(_event("3-0"))
+    bus.live.put_nowait(_event("4-0", EventKind.RUN_COMPLETED))
+
+    assert await first == ["1-0", "2-0", "3-0", "4-0"]
+    assert await second == ["2-0", "3-0", "4-0"]
+    assert bus.upstream_reads == 1
+    assert hub._runs == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_hub_drops_slow_subscriber_without_blocking_others():
+    bus = _FakeBus([])
+    hub = StreamHub(event_bus=bus, queue_size=2)
+
+    slow = hub.subscribe("run-1", include_heartbeats=False)
+    slow_first = asyncio.create_task(slow.__anext__())
+    fast = asyncio.create_task(_collect(hub))
+    await asyncio.sleep(0.01)
+
+    bus.live.put_nowait(_event("1-0"))
+    await asyncio.sleep(0.01)
+    assert (await slow_first).stream_id == "1-0"
+    for i in range(2, 6):
+        bus.live.put_nowait(_event(f"{i}-0"))
+    bus.live.put_nowait(_event("6-0", EventKind.RUN_COMPLETED))
+
+    assert await fast == ["1-0", "2-0", "3-0", "4-0", "5-0", "6-0"]
+    assert [e.stream_id async for e in slow] == []
+
+
+@pytest.mark.asyncio
+async def test_stream_events_serves_finished_run_from_replay_only(monkeypatch):
+    import main as backend_main
+
+    bus = _FakeBus([_event("1-0"), _event("2-0"), _event("3-0", EventKind.RUN_COMPLETED)])
+
+    async def _get_bus():
+        return bus
+
+    def _no_hub():
+        raise AssertionError("finished runs must not start a live tail")
+
+    class _Request:
+        headers = {"Last-Event-ID": "1-0"}
+
+        async def is_disconnected(self):
+            return False
+
+    monkeypatch.setattr(backend_main, "get_event_bus", _get_bus)
+    monkeypatch.setattr(backend_main, "get_stream_hub", _no_hub)
+
+    response = await backend_main.stream_events(_Request(), "run-1")
+    frames = [frame async for frame in response.body_iterator]
+    assert len(frames) == 1
+    ids = [line[len(b"id: "):] for line in frames[0].split(b"\r\n") if line.startswith(b"id: ")]
+    assert ids == [b"2-0", b"3-0"]
+
+
+@pytest.mark.asyncio
+async def test_stream_hub_batches_live_events_that_are_already_queued():
+    bus = _FakeBus([_event("1-0")])
+    hub = StreamHub(event_bus=bus)
+
+    async def _collect_batches():
+        return [
+            [e.stream_id for e in batch]
+            async for batch in hub.subscribe_batches("run-1", include_heartbeats=False)
+        ]
+
+    task = asyncio.create_task(_collect_batches())
+    await asyncio.sleep(0.01)
+    fanout = hub._runs["run-1"]
+    (queue,) = fanout.subscribers
+    for event in (_event("2-0"), _event("3-0"), _event("4-0", EventKind.RUN_COMPLETED), _event("5-0")):
+        queue.put_nowait(event)
+
+    assert await task == [["1-0"], ["2-0", "3-0", "4-0"]]
+    assert hub._runs == {}
@@ -5,6 +5,8 @@ Targeted regression tests for workflow progression safeguards.
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import time
 import pytest
 
 from agent_framework import AgentExecutorResponse, AgentResponse, AgentResponseUpdate, AgentRunEvent, AgentRunUpdateEvent, ChatMessage, Content, ExecutorCompletedEvent, ExecutorInvokedEvent, WorkflowOutputEvent, WorkflowRunState, WorkflowStatusEvent
@@ -1762,3 +1764,359 @@ def test_specialist_turn_limits_are_four():
             f"{specialist_id} should have turn limit 4, got "
             f"{getattr(specialist_executor, '_autonomous_mode_turn_limit')}"
         )
+
+
+def _fake_planner_client(content: str, calls: list[dict]):
+    """Stand-in for get_shared_async_client whose completions return ``content`` and record kwargs."""
+
+    class _Completions:
+        async def create(self, **kwargs):
+            calls.append(kwargs)
+            message = type("Message", (), {"content": content})()
+            return type("Response", (), {"choices": [type("Choice", (), {"message": message})()]})()
+
+    class _Client:
+        chat = type("Chat", (), {"completions": _Completions()})()
+
+    async def fake_client(**kwargs):
+        return _Client(), None
+
+    return fake_client
+
+
+@pytest.mark.asyncio
+async def test_llm_plan_prompt_keeps_catalog_prefix_stable(monkeypatch):
+    import orchestrator.engine as engine_module
+
+    requests: list[dict] = []
+    monkeypatch.setattr(
+        engine_module, "get_shared_async_client", _fake_planner_client('{"selectedAgentIds": []}', requests),
+    )
+    monkeypatch.setattr(engine_module, "_PLAN_CACHE", {})
+    profiles = [_agent("weather_safety", "Weather"), _agent("decision_coordinator", "Coordinator", "coordinator")]
+    for run_id, problem in (("run-a", "Divert to DTW"), ("run-b", "Divert to CLE")):
+        engine = OrchestratorEngine(run_id=run_id, enable_checkpointing=False)
+        engine.scenario = "diversion"
+        plan = await engine._llm_plan_agent_selection(problem, profiles, "decision_coordinator")
+        assert plan == {"selectedAgentIds": []}
+
+    first, second = (r["messages"] for r in requests)
+    assert first[:2] == second[:2]
+    assert first[1]["content"] is second[1]["content"]
+    assert first[-1]["content"] != second[-1]["content"]
+    assert '"problem":"Divert to DTW"' in first[-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_llm_plan_reuses_cached_plan_for_same_normalized_problem(monkeypatch):
+    import orchestrator.engine as engine_module
+
+    calls: list[dict] = []
+    monkeypatch.setattr(
+        engine_module,
+        "get_shared_async_client",
+        _fake_planner_client('{"selectedAgentIds": ["weather_safety"]}', calls),
+    )
+    monkeypatch.setattr(engine_module, "_PLAN_CACHE", {})
+    profiles = [_agent("weather_safety", "Weather"), _agent("decision_coordinator", "Coordinator", "coordinator")]
+    engine = OrchestratorEngine(run_id="run-cache", enable_checkpointing=False)
+    engine.scenario = "diversion"
+
+    first = await engine._llm_plan_agent_selection("Divert  to DTW", profiles, "decision_coordinator")
+    first["selectedAgentIds"].append("mutated")
+    second = await engine._llm_plan_agent_selection("divert to dtw ", profiles, "decision_coordinator")
+
+    assert len(calls) == 1
+    assert second == {"selectedAgentIds": ["weather_safety"]}
+
+
+@pytest.mark.asyncio
+async def test_agent_activations_emit_in_order_with_one_progress_update():
+    captured: list[tuple[str, dict]] = []
+
+    async def emit(event_type: str, payload: dict):
+        captured.append((event_type, payload))
+
+    engine = OrchestratorEngine(run_id="test-activations", event_emitter=emit, enable_checkpointing=False)
+    engine.trace_emitter = TraceEmitter(run_id="test-activations", event_callback=emit)
+    engine.selected_agents = [_agent("a1", "A1"), _agent("a2", "A2")]
+    engine.excluded_agents = [_agent("x1", "X1")]
+
+    await engine._emit_agent_activations()
+
+    kinds = [event_type for event_type, _ in captured]
+    assert kinds == ["agent.activated", "agent.activated", "agent.excluded", "progress_update"]
+    assert [p.get("agentId") or p.get("agent_id") for _, p in captured[:3]] == ["a1", "a2", "x1"]
+    assert engine._activated_agent_ids == {"a1", "a2"}
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_send_only_changed_fields_after_first():
+    captured: list[tuple[str, dict]] = []
+
+    async def emit(event_type: str, payload: dict):
+        captured.append((event_type, payload))
+
+    engine = OrchestratorEngine(run_id="test-progress-delta", event_emitter=emit, enable_checkpointing=False)
+    engine.selected_agents = [_agent("a1", "A1"), _agent("a2", "A2")]
+
+    await engine._emit_progress("select_agents")
+    engine._mark_phase_completed("select_agents")
+    await engine._emit_progress("activate_agents")
+    await engine._emit_progress("create_workflow")
+
+    envelope = {"actor", "run_id", "timestamp"}
+    payloads = [
+        {key: value for key, value in payload.items() if key not in envelope}
+        for event_type, payload in captured
+        if event_type == "progress_update"
+    ]
+    assert payloads[0]["agentsTotal"] == 2 and payloads[0]["runProgressPct"] == 0.0
+    assert payloads[1] == {"runProgressPct": 10.0, "currentStep": "activate_agents"}
+    assert payloads[2] == {"currentStep": "create_workflow"}
+
+
+def test_extract_json_object_from_text_handles_bare_fenced_and_embedded():
+    engine = OrchestratorEngine(run_id="test-json-extract", enable_checkpointing=False)
+    assert engine._extract_json_object_from_text(' {"a": 1} ') == {"a": 1}
+    assert engine._extract_json_object_from_text('Plan:\n```json\n{"b": 2}\n```') == {"b": 2}
+    assert engine._extract_json_object_from_text('noise {bad} then {"c": [3]} tail') == {"c": [3]}
+    assert engine._extract_json_object_from_text("no json here") is None
+
+
+def test_cached_clients_fresh_tracks_cache_and_ttl(monkeypatch):
+    import agents.client as client_module
+
+    monkeypatch.setattr(client_module, "_client_cache", {})
+    assert client_module.cached_clients_fresh("agent") is False
+
+    now = client_module.time.monotonic()
+    client_module._client_cache["agent"] = (object(), now)
+    client_module._client_cache["orchestrator"] = (object(), now - client_module._CLIENT_TTL_SECONDS - 1)
+    assert client_module.cached_clients_fresh("agent") is True
+    assert client_module.cached_clients_fresh("agent", "orchestrator") is False
+
+
+@pytest.mark.asyncio
+async def test_progress_helpers_without_emitter_still_track_state():
+    engine = OrchestratorEngine(run_id="test-no-emitter", enable_checkpointing=False)
+    engine.selected_agents = [_agent("a1", "A1")]
+
+    await engine._emit_stage_started("select_agents", "Select Agents")
+    await engine._emit_stage_completed("select_agents", "Select Agents", time.monotonic())
+    await engine._emit_progress("activate_agents")
+
+    assert engine._current_step == "activate_agents"
+    assert engine._progress_payload("activate_agents")["runProgressPct"] == 10.0
+    assert engine._last_progress_payload is None
+
+
+def test_build_workflow_input_lists_specialists_and_stores():
+    engine = OrchestratorEngine(run_id="test-workflow-input", enable_checkpointing=False)
+    engine.scenario = "hub_disruption"
+    engine.selected_agents = [
+        dataclasses.replace(_agent("a1", "Analyst"), data_sources=("SQL", "KQL")),
+        _agent("a2", "Router"),
+        _agent("coord", "Coordinator", category="coordinator"),
+    ]
+
+    message = engine._build_workflow_input("Storm at ORD")
+
+    assert "### Scenario: Hub Disruption" in message
+    assert "### Active Specialists\nAnalyst, Router\n" in message
+    assert "- Analyst (a1) -> allowed stores: SQL, KQL\n- Router (a2) -> allowed stores: none" in message
+    assert "Coordinator" not in message.split("### Active Specialists", 1)[1]
+
+
+def test_warm_chat_clients_populates_cache_and_swallows_failures(monkeypatch):
+    import agents.client as client_module
+
+    monkeypatch.setattr(client_module, "_client_cache", {})
+
+    def fake_get_chat_client(role="agent", **kwargs):
+        if role == "orchestrator":
+            raise ValueError("no credential")
+        return object()
+
+    monkeypatch.setattr(client_module, "get_chat_client", fake_get_chat_client)
+    client_module.warm_chat_clients()
+
+    assert client_module.cached_clients_fresh("agent") is True
+    assert client_module.cached_clients_fresh("orchestrator") is False
+
+
+def test_phase_spans_follow_trace_phase_sample_rate(monkeypatch):
+    import orchestrator.engine as engine_module
+
+    monkeypatch.setenv("TRACE_PHASE_SAMPLE_RATE", "0")
+    assert OrchestratorEngine(run_id="test-unsampled", enable_checkpointing=False)._phase_tracer is None
+
+    monkeypatch.setenv("TRACE_PHASE_SAMPLE_RATE", "1")
+    sampled = OrchestratorEngine(run_id="test-sampled", enable_checkpointing=False)
+    assert sampled._phase_tracer is engine_module._tracer
+
+
+@pytest.mark.asyncio
+async def test_llm_directed_selection_orders_dedupes_and_puts_coordinator_last(monkeypatch):
+    engine = OrchestratorEngine(run_id="test-llm-selection", enable_checkpointing=False)
+    engine.scenario = "hub_disruption"
+    engine.selected_agents = [
+        _agent("situation_assessment", "Situation"),
+        _agent("fleet_recovery", "Fleet"),
+        _agent("crew_recovery", "Crew"),
+        _agent("recovery_coordinator", "Coordinator", category="coordinator"),
+    ]
+    engine.excluded_agents = [dataclasses.replace(_agent("weather_safety", "Weather"), included=False)]
+
+    async def fake_plan(**kwargs):
+        return {
+            "selectedAgentIds": ["crew_recovery", "situation_assessment", "crew_recovery", "unknown", 7],
+            "executionOrder": ["recovery_coordinator", "situation_assessment", "fleet_recovery", "situation_assessment"],
+            "excludedAgentIds": ["fleet_recovery"],
+            "coordinatorAgentId": "recovery_coordinator",
+        }
+
+    monkeypatch.setattr(engine, "_llm_plan_agent_selection", fake_plan)
+    await engine._apply_llm_directed_selection("Storm at ORD")
+
+    assert [a.agent_id for a in engine.selected_agents] == [
+        "situation_assessment", "crew_recovery", "recovery_coordinator",
+    ]
+    assert {a.agent_id: a.reason for a in engine.excluded_agents} == {
+        "fleet_recovery": "LLM-excluded for this query.",
+        "weather_safety": "test",
+    }
+
+
+@pytest.mark.asyncio
+async def test_llm_plan_timeout_covers_client_acquisition(monkeypatch):
+    import orchestrator.engine as engine_module
+
+    async def slow_client(**kwargs):
+        await asyncio.sleep(1)
+        raise AssertionError("client acquisition should have been timed out")
+
+    monkeypatch.setattr(engine_module, "get_shared_async_client", slow_client)
+    monkeypatch.setattr(engine_module, "_PLAN_CACHE", {})
+    monkeypatch.setenv("LLM_PLAN_TIMEOUT_SECONDS", "0.01")
+    engine = OrchestratorEngine(run_id="test-plan-timeout", enable_checkpointing=False)
+    engine.scenario = "diversion"
+
+    plan = await engine._llm_plan_agent_selection(
+        "Divert to DTW", [_agent("weather_safety", "Weather")], "decision_coordinator",
+    )
+    assert plan is None
+
+
+def test_autonomous_turn_limits_are_a_read_only_snapshot():
+    limits = {"recovery_coordinator": 8}
+    engine = OrchestratorEngine(run_id="test-turn-limits", enable_checkpointing=False, autonomous_turn_limits=limits)
+    limits["recovery_coordinator"] = 1
+
+    assert engine._autonomous_turn_limits.get("recovery_coordinator") == 8
+    with pytest.raises(TypeError):
+        engine._autonomous_turn_limits["fleet_recovery"] = 2
+
+
+def test_parse_heuristic_artifacts_reads_options_timeline_and_recommendation():
+    engine = OrchestratorEngine(run_id="test-heuristic-artifacts", enable_checkpointing=False)
+    text = (
+        "Option 1: Swap to A321 from the spare pool\n"
+        "2) Cancel and rebook on partner flights\n"
+        "- T+30m: Notify crew scheduling\n"
+        "Recommendation: OPT_2 keeps the network intact\n"
+        "Summary:   Rebook   via partners\n"
+    )
+
+    artifacts = engine._parse_heuristic_artifacts(text)
+
+    assert [(o["optionId"], o["description"]) for o in artifacts["options"]] == [
+        ("opt-1", "Swap to A321 from the spare pool"),
+        ("opt-2", "Cancel and rebook on partner flights"),
+    ]
+    assert artifacts["timeline"] == [{"time": "T+30m", "action": "Notify crew scheduling", "agent": ""}]
+    assert artifacts["selectedOptionId"] == "opt-2"
+    assert artifacts["summary"] == "Rebook   via partners"
+    assert artifacts["finalAnswer"] == "OPT_2 keeps the network intact"
+
+
+def test_extract_json_object_falls_back_for_non_strict_fenced_json():
+    engine = OrchestratorEngine(run_id="test-json-nan", enable_checkpointing=False)
+    # orjson rejects NaN; the stdlib scan still recovers the object.
+    parsed = engine._extract_json_object_from_text('```json\n{"score": NaN, "ok": true}\n```')
+    assert parsed["ok"] is True
+
+
+def test_extract_final_answer_fallback_skips_generic_lines_and_fenced_json():
+    engine = OrchestratorEngine(run_id="test-final-answer", enable_checkpointing=False)
+    text = 'Synthesis complete.\n\n  Reroute   via DTW\n```json\n{"a": 1}\n```\n  \nHold crews at ORD  '
+    assert engine._extract_final_answer_from_text(text) == "Reroute via DTW Hold crews at ORD"
+    assert engine._extract_final_answer_from_text("Analysis complete\n```json\n{}\n```") == ""
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(72.456, 72.46), ("88.1", 88.1), (150, 100.0), (-3, 0.0), (float("nan"), 0.0), (float("inf"), 100.0), (None, 0.0), ("x", 0.0)],
+)
+def test_normalize_score_clamps_and_coerces(value, expected):
+    assert OrchestratorEngine._normalize_score(value) == expected
+
+
+@pytest.mark.asyncio
+async def test_coordinator_recovery_options_emit_in_rank_order():
+    captured: list[tuple[str, dict]] = []
+
+    async def emit(event_type: str, payload: dict):
+        captured.append((event_type, payload))
+
+    engine = OrchestratorEngine(run_id="test-recovery-options", event_emitter=emit, enable_checkpointing=False)
+    engine.trace_emitter = TraceEmitter(run_id="test-recovery-options", event_callback=emit)
+
+    await engine._emit_coordinator_artifacts(
+        "Option 1: Swap aircraft\nOption 2: Delay departure\nOption 3: Cancel and rebook\n"
+        "Recommendation: opt-1 keeps the schedule"
+    )
+
+    options = [p for event_type, p in captured if event_type == "recovery.option"]
+    assert [p.get("optionId") or p.get("option_id") for p in options] == ["opt-1", "opt-2", "opt-3"]
+    kinds = [event_type for event_type, _ in captured]
+    assert kinds.index("coordinator.scoring") > max(i for i, k in enumerate(kinds) if k == "recovery.option")
+
+
+@pytest.mark.asyncio
+async def test_prepare_retry_resets_state_and_rebuilds_off_loop(monkeypatch):
+    import threading
+
+    engine = OrchestratorEngine(run_id="test-prepare-retry", enable_checkpointing=False)
+    engine._executor_invocations_total = 5
+    engine._agent_execution_counts["specialist_a"] = 2
+    rebuilds: list[tuple[str, bool]] = []
+    monkeypatch.setattr(
+        engine,
+        "_rebuild_workflow",
+        lambda message: rebuilds.append((message, threading.current_thread() is threading.main_thread())),
+    )
+
+    await engine._prepare_retry("retry input", 0)
+
+    assert rebuilds == [("retry input", False)]
+    assert engine._executor_invocations_total == 0
+    assert engine._agent_execution_counts == {}
+
+
+@pytest.mark.asyncio
+async def test_emit_event_keeps_handler_timestamp_and_stamps_missing_ones():
+    captured: list[tuple[str, dict]] = []
+
+    async def emit(event_type: str, payload: dict):
+        captured.append((event_type, payload))
+
+    engine = OrchestratorEngine(run_id="test-emit-timestamp", event_emitter=emit, enable_checkpointing=False)
+
+    await engine.emit_event("executor.invoked", {"timestamp": "2024-01-01T00:00:00+00:00", "executor_id": "a"})
+    await engine.emit_event("workflow.status", {"status": "running"})
+
+    assert captured[0][1]["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert captured[0][1]["actor"]["id"] == "a"
+    assert captured[1][1]["timestamp"] > "2024"
+    assert captured[1][1]["run_id"] == "test-emit-timestamp"